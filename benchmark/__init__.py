@@ -0,0 +1,6 @@
+"""
+TrendRadar 离线基准测试
+
+本地 mock 上游（newsnow JSON + RSS XML）与抓取 / 全流程基准测试脚本，
+不访问任何真实站点。
+"""
@@ -0,0 +1,165 @@
+# coding=utf-8
+"""
+频率词匹配基准测试
+
+对比逐词扫描（逐组检查过滤词、必须词与普通词）与 KeywordMatcher 自动机
+在大规模标题 × 频率词下的耗时，并校验两者每个标题的匹配结果一致。
+标题与词组均为确定性的合成数据:
+
+    python -m benchmark.keyword_benchmark
+    python -m benchmark.keyword_benchmark --titles 10000 --keywords 5000 --filters 200
+    python -m benchmark.keyword_benchmark --skip-naive --repeat 5
+"""
+
+import argparse
+import random
+import string
+import time
+from typing import Dict, List, Optional, Tuple
+
+from trendradar.keyword_matcher import KeywordMatcher
+
+from .mock_upstream import _SYNTHETIC_WORDS
+from .run_benchmark import percentile
+
+# 用于拼接合成词语与标题的汉字（取 CJK 基本区前 3000 个字，减少随机文字碰巧命中词语）
+_HANZI = "".join(chr(code) for code in range(0x4E00, 0x4E00 + 3000))
+
+
+def synthetic_vocabulary(count: int, rng: random.Random) -> List[str]:
+    """生成 count 个互不相同的词语（2~4 个汉字或 3~6 个字母）"""
+    words = set(_SYNTHETIC_WORDS)
+    while len(words) < count:
+        if rng.random() < 0.8:
+            words.add("".join(rng.choices(_HANZI, k=rng.randint(2, 4))))
+        else:
+            words.add("".join(rng.choices(string.ascii_letters, k=rng.randint(3, 6))))
+    return sorted(words)[:count]
+
+
+def synthetic_rules(
+    keyword_count: int,
+    filter_count: int,
+    rng: random.Random,
+) -> Tuple[List[Dict], List[str]]:
+    """生成 keyword_count 个频率词：每组 3~8 个普通词，约三分之一的词组带 1 个必须词"""
+    vocabulary = synthetic_vocabulary(keyword_count + filter_count, rng)
+    filter_words = vocabulary[keyword_count:]
+    keywords = vocabulary[:keyword_count]
+    rng.shuffle(keywords)
+
+    word_groups = []
+    position = 0
+    while position < len(keywords):
+        size = rng.randint(3, 8)
+        chunk = keywords[position:position + size]
+        position += size
+        required = chunk[:1] if rng.random() < 0.33 and len(chunk) > 1 else []
+        normal = chunk[len(required):]
+        word_groups.append({
+            "required": required,
+            "normal": normal,
+            "group_key": " ".join(normal) if normal else " ".join(required),
+        })
+    return word_groups, filter_words
+
+
+def synthetic_titles(count: int, word_groups: List[Dict], filter_words: List[str], rng: random.Random) -> List[str]:
+    """生成标题：约 30% 含一个词组的词语，5% 含过滤词，其余为随机文字"""
+    titles = []
+    for index in range(count):
+        parts = ["".join(rng.choices(_HANZI, k=rng.randint(4, 12)))]
+        roll = rng.random()
+        if roll < 0.3 and word_groups:
+            group = rng.choice(word_groups)
+            parts.extend(group["required"])
+            parts.append(rng.choice(group["normal"] or group["required"]))
+        elif roll < 0.35 and filter_words:
+            parts.append(rng.choice(filter_words))
+        parts.append("".join(rng.choices(_HANZI, k=rng.randint(4, 12))))
+        parts.append(f"#{index}")
+        rng.shuffle(parts)
+        titles.append("".join(parts))
+    return titles
+
+
+def naive_match(title: str, word_groups: List[Dict], filter_words: List[str]) -> Optional[Dict]:
+    """逐词扫描的参考实现（与改造前 count_word_frequency 的两次遍历等价）"""
+    title_lower = title.lower()
+    if not title.strip():
+        return None
+    if any(word.lower() in title_lower for word in filter_words):
+        return None
+    for group in word_groups:
+        if group["required"] and not all(word.lower() in title_lower for word in group["required"]):
+            continue
+        if group["normal"] and not any(word.lower() in title_lower for word in group["normal"]):
+            continue
+        return group
+    return None
+
+
+def run(args) -> Dict:
+    rng = random.Random(args.seed)
+    word_groups, filter_words = synthetic_rules(args.keywords, args.filters, rng)
+    titles = synthetic_titles(args.titles, word_groups, filter_words, rng)
+
+    start = time.perf_counter()
+    matcher = KeywordMatcher(word_groups, filter_words)
+    compile_seconds = time.perf_counter() - start
+
+    samples: Dict[str, List[float]] = {"matcher": []}
+    matched = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        matched = [matcher.match(title) for title in titles]
+        samples["matcher"].append(time.perf_counter() - start)
+
+    if not args.skip_naive:
+        samples["naive"] = []
+        for _ in range(args.naive_repeat):
+            start = time.perf_counter()
+            expected = [naive_match(title, word_groups, filter_words) for title in titles]
+            samples["naive"].append(time.perf_counter() - start)
+        mismatches = sum(1 for left, right in zip(matched, expected) if left is not right)
+        if mismatches:
+            raise SystemExit(f"❌ 匹配结果不一致: {mismatches} 个标题")
+
+    return {
+        "titles": len(titles),
+        "keywords": sum(len(g["required"]) + len(g["normal"]) for g in word_groups),
+        "groups": len(word_groups),
+        "filters": len(filter_words),
+        "matched": sum(1 for group in matched if group is not None),
+        "compile_ms": compile_seconds * 1000,
+        "stages": {
+            name: {"p50_ms": percentile(values, 50) * 1000, "p95_ms": percentile(values, 95) * 1000}
+            for name, values in samples.items()
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TrendRadar 频率词匹配基准测试")
+    parser.add_argument("--titles", type=int, default=10000, help="标题数量")
+    parser.add_argument("--keywords", type=int, default=5000, help="频率词数量（必须词 + 普通词）")
+    parser.add_argument("--filters", type=int, default=100, help="过滤词数量")
+    parser.add_argument("--repeat", type=int, default=3, help="自动机重复次数")
+    parser.add_argument("--naive-repeat", type=int, default=1, help="逐词扫描重复次数（较慢）")
+    parser.add_argument("--skip-naive", action="store_true", help="不运行逐词扫描对比")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    result = run(args)
+    print(f"🧪 {result['titles']} 个标题 × {result['keywords']} 个频率词"
+          f"（{result['groups']} 组，过滤词 {result['filters']} 个），命中 {result['matched']} 个标题")
+    print(f"   自动机编译: {result['compile_ms']:.1f} ms")
+    for name, stat in result["stages"].items():
+        print(f"   {name:<8} p50 {stat['p50_ms']:>10.1f} ms   p95 {stat['p95_ms']:>10.1f} ms")
+    stages = result["stages"]
+    if "naive" in stages and stages["matcher"]["p50_ms"] > 0:
+        print(f"   加速比: {stages['naive']['p50_ms'] / stages['matcher']['p50_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+# coding=utf-8
+"""
+本地 mock 上游
+
+模拟 newsnow 接口 (/api/s?id=xxx&latest) 与 RSS 源 (/rss/<name>.xml)，
+数据来自 output/ 下的 txt 快照录制，没有快照时生成合成标题。
+可配置响应延迟、错误率与单次响应大小，RSS 支持 ETag 条件请求。
+
+单独启动:
+    python -m benchmark.mock_upstream --port 8800 --latency-ms 50
+    NEWSNOW_API_URL=http://127.0.0.1:8800 python main.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+# (title, url, mobile_url)
+RecordedItem = Tuple[str, str, str]
+
+_TITLE_LINE = re.compile(r"^\d+\.\s+(.*?)(?:\s+\[URL:(.*?)\])?(?:\s+\[MOBILE:(.*?)\])?$")
+
+_SYNTHETIC_WORDS = [
+    "人工智能", "芯片", "新能源", "汽车", "华为", "小米", "苹果", "特斯拉", "比亚迪", "股市",
+    "A股", "央行", "降息", "房价", "世界杯", "奥运", "台风", "地震", "航天", "大模型",
+    "发布会", "财报", "裁员", "高考", "医保", "疫苗", "油价", "黄金", "美联储", "关税",
+]
+
+
+def load_recordings(output_dir: str = "output", max_files: int = 20) -> List[List[RecordedItem]]:
+    """从 txt 快照中读取各平台的标题列表（每个平台一组），最多读取最近 max_files 个文件"""
+    files = sorted(Path(output_dir).glob("*/txt/*.txt"), reverse=True)[:max_files]
+    recordings = []
+    for file_path in files:
+        content = file_path.read_text(encoding="utf-8")
+        content = content.split("==== 以下ID请求失败 ====")[0]
+        for block in content.strip().split("\n\n"):
+            lines = [line.strip() for line in block.strip().split("\n") if line.strip()]
+            items = []
+            for line in lines[1:]:
+                match = _TITLE_LINE.match(line)
+                if match:
+                    items.append((match.group(1), match.group(2) or "", match.group(3) or ""))
+            if items:
+                recordings.append(items)
+    return recordings
+
+
+def synthetic_recordings(count: int = 50, items_per_source: int = 30, seed: int = 0) -> List[List[RecordedItem]]:
+    """生成合成标题，标题中混入常见热点词，便于频率词匹配有命中"""
+    rng = random.Random(seed)
+    recordings = []
+    for source in range(count):
+        items = []
+        for index in range(items_per_source):
+            words = rng.sample(_SYNTHETIC_WORDS, 3)
+            title = f"{words[0]}{words[1]}最新消息：{words[2]}相关话题 #{source}-{index}"
+            url = f"https://example.com/{source}/{index}"
+            items.append((title, url, url))
+        recordings.append(items)
+    return recordings
+
+
+class MockUpstream:
+    """线程化的本地 HTTP 服务，模拟 newsnow 与 RSS 上游"""
+
+    def __init__(
+        self,
+        recordings: Optional[List[List[RecordedItem]]] = None,
+        latency_ms: float = 20.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        payload_bytes: int = 0,
+        etag: bool = True,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Args:
+            recordings: 各平台的标题录制，为空时使用合成数据
+            latency_ms: 每个响应的固定延迟（毫秒）
+            jitter_ms: 在固定延迟上额外叠加的随机延迟上限（毫秒）
+            error_rate: 返回 500 错误的概率 (0-1)
+            payload_bytes: 单个响应的目标大小（字节），不足时用填充字段补齐，0 为不填充
+            etag: RSS 响应是否携带 ETag 并支持 304
+        """
+        self.recordings = recordings or synthetic_recordings(seed=seed)
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.payload_bytes = payload_bytes
+        self.etag = etag
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._bodies: Dict[Tuple[str, str], bytes] = {}
+        self._bodies_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "not_modified": 0}
+
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def rss_url(self, name: str) -> str:
+        return f"{self.base_url}/rss/{name}.xml"
+
+    def start(self) -> "MockUpstream":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """在当前线程阻塞运行（独立启动时使用）"""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockUpstream":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.stats = {"requests": 0, "errors": 0, "not_modified": 0}
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _items_for(self, source_id: str) -> List[RecordedItem]:
+        # 同一个源固定映射到同一份录制，保证多次请求内容一致（可命中 ETag / 内容哈希）
+        return self.recordings[zlib.crc32(source_id.encode("utf-8")) % len(self.recordings)]
+
+    def _padding(self, body_size: int, item_count: int) -> str:
+        if self.payload_bytes <= body_size or item_count == 0:
+            return ""
+        return "x" * ((self.payload_bytes - body_size) // item_count)
+
+    def _render_json(self, source_id: str) -> bytes:
+        items = self._items_for(source_id)
+        payload = [{"title": title, "url": url, "mobileUrl": mobile} for title, url, mobile in items]
+        body = json.dumps({"status": "success", "id": source_id, "items": payload}, ensure_ascii=False)
+        padding = self._padding(len(body.encode("utf-8")), len(payload))
+        if padding:
+            for item in payload:
+                item["extra"] = padding
+            body = json.dumps({"status": "success", "id": source_id, "items": payload}, ensure_ascii=False)
+        return body.encode("utf-8")
+
+    def _render_rss(self, name: str) -> bytes:
+        items = self._items_for(name)
+
+        def render(padding: str) -> str:
+            entries = "".join(
+                f"<item><title>{escape(title)}</title><link>{escape(url)}</link>"
+                f"<description>{padding}</description></item>"
+                for title, url, _ in items
+            )
+            return (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                f'<rss version="2.0"><channel><title>{escape(name)}</title>'
+                f"<link>https://example.com/</link><description>mock</description>{entries}</channel></rss>"
+            )
+
+        body = render("")
+        padding = self._padding(len(body.encode("utf-8")), len(items))
+        return render(padding).encode("utf-8") if padding else body.encode("utf-8")
+
+    def _body(self, kind: str, key: str) -> bytes:
+        with self._bodies_lock:
+            body = self._bodies.get((kind, key))
+            if body is None:
+                body = self._render_json(key) if kind == "json" else self._render_rss(key)
+                self._bodies[(kind, key)] = body
+            return body
+
+    def _sleep_and_roll(self) -> bool:
+        """模拟网络延迟，返回本次是否应当返回错误"""
+        with self._rng_lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+            failed = self._rng.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        return failed
+
+    def _make_handler(self):
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # 支持 keep-alive，便于测量连接复用
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes = b"", content_type: str = "text/plain", headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                upstream._count("requests")
+                parsed = urlparse(self.path)
+                failed = upstream._sleep_and_roll()
+                if failed:
+                    upstream._count("errors")
+                    self._send(500, b"mock upstream error")
+                    return
+
+                if parsed.path == "/api/s":
+                    source_id = parse_qs(parsed.query).get("id", [""])[0]
+                    if not source_id:
+                        self._send(400, b"missing id")
+                        return
+                    self._send(200, upstream._body("json", source_id), "application/json; charset=utf-8")
+                    return
+
+                if parsed.path.startswith("/rss/") and parsed.path.endswith(".xml"):
+                    name = parsed.path[len("/rss/"):-len(".xml")]
+                    body = upstream._body("rss", name)
+                    headers = {}
+                    if upstream.etag:
+                        etag = f'"{zlib.crc32(body):08x}"'
+                        headers["ETag"] = etag
+                        if self.headers.get("If-None-Match") == etag:
+                            upstream._count("not_modified")
+                            self._send(304, headers=headers)
+                            return
+                    self._send(200, body, "application/rss+xml; charset=utf-8", headers)
+                    return
+
+                self._send(404, b"not found")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TrendRadar 本地 mock 上游")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="固定响应延迟（毫秒）")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="随机附加延迟上限（毫秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 500 的概率 (0-1)")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="单个响应目标大小（字节）")
+    parser.add_argument("--recordings", default="output", help="txt 快照目录，找不到时使用合成数据")
+    parser.add_argument("--no-etag", action="store_true", help="RSS 不返回 ETag")
+    args = parser.parse_args()
+
+    recordings = load_recordings(args.recordings)
+    upstream = MockUpstream(
+        recordings,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        payload_bytes=args.payload_bytes,
+        etag=not args.no_etag,
+        host=args.host,
+        port=args.port,
+    )
+    print(f"🧪 mock 上游已启动: {upstream.base_url}（录制平台 {len(upstream.recordings)} 组）")
+    print(f"   newsnow: {upstream.base_url}/api/s?id=<平台ID>&latest")
+    print(f"   RSS:     {upstream.rss_url('<名称>')}")
+    try:
+        upstream.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 mock 上游已停止")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+# coding=utf-8
+"""
+抓取与全流程基准测试
+
+在本地 mock 上游上运行 DataFetcher.crawl_websites 与完整的 NewsAnalyzer.run，
+按不同并发线程数与数据源数量统计各阶段耗时的 p50/p95 以及吞吐量（源/秒）。
+需在项目根目录执行（main.py 导入时读取 config/config.yaml）:
+
+    python -m benchmark.run_benchmark
+    python -m benchmark.run_benchmark --sources 10,100 --workers 1,8 --repeat 5 --mode crawl
+    python -m benchmark.run_benchmark --latency-ms 80 --jitter-ms 40 --json bench.json
+
+注意：error-rate > 0 时会触发抓取器真实的重试退避（3~5 秒），耗时会明显上升。
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from trendradar.http_client import HttpSessionPool
+from trendradar.rate_limiter import HostRateLimiter
+
+from .mock_upstream import MockUpstream, load_recordings
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """最近秩百分位数"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def make_sources(upstream: MockUpstream, count: int, rss_ratio: float) -> List[Tuple[str, str]]:
+    """生成 count 个数据源，其中 rss_ratio 比例为 RSS，其余为 newsnow 平台"""
+    rss_count = int(round(count * rss_ratio))
+    sources = []
+    for index in range(count):
+        if index < rss_count:
+            sources.append((upstream.rss_url(f"feed{index}"), f"RSS源{index}"))
+        else:
+            sources.append((f"source{index}", f"平台{index}"))
+    return sources
+
+
+@contextmanager
+def quiet(enabled: bool = True):
+    """屏蔽被测代码的逐条打印"""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def summarize(stage_samples: Dict[str, List[float]], source_count: int) -> Dict[str, Dict]:
+    summary = {}
+    for stage, samples in stage_samples.items():
+        summary[stage] = {
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p95_ms": percentile(samples, 95) * 1000,
+            "runs": len(samples),
+        }
+    total = stage_samples.get("total") or stage_samples.get("crawl") or []
+    median = percentile(total, 50)
+    summary["throughput"] = source_count / median if median > 0 else 0.0
+    return summary
+
+
+def bench_crawl(main_module, upstream: MockUpstream, sources, workers: int, repeat: int, verbose: bool) -> Dict:
+    """仅测抓取阶段：每轮使用新的连接池，不启用 RSS 缓存与熔断"""
+    samples = {"crawl": []}
+    failures = 0
+    for _ in range(repeat):
+        pool = HttpSessionPool(pool_connections=4, pool_maxsize=max(1, workers))
+        fetcher = main_module.DataFetcher(
+            None,
+            workers,
+            HostRateLimiter(),
+            http_pool=pool,
+            api_base_url=upstream.base_url,
+        )
+        start = time.perf_counter()
+        with quiet(not verbose):
+            _, _, failed_ids = fetcher.crawl_websites(sources, 0)
+        samples["crawl"].append(time.perf_counter() - start)
+        failures += len(failed_ids)
+        pool.close()
+    summary = summarize(samples, len(sources))
+    summary["failed_sources"] = failures
+    return summary
+
+
+@contextmanager
+def instrument_pipeline(main_module, samples: Dict[str, List[float]]):
+    """包装 NewsAnalyzer.run 用到的各阶段函数，记录每个阶段的耗时"""
+    targets = [
+        (main_module.DataFetcher, "crawl_websites", "crawl"),
+        (main_module, "save_titles_to_file", "save"),
+        (main_module.NewsAnalyzer, "_load_frequency_words", "keywords"),
+        (main_module, "count_word_frequency", "analyze"),
+        (main_module, "generate_simple_html_report", "html"),
+        (main_module, "send_notifications", "notify"),
+    ]
+    originals = []
+
+    def timed(func: Callable, stage: str) -> Callable:
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                samples.setdefault(stage, []).append(time.perf_counter() - start)
+        return wrapper
+
+    for owner, attr, stage in targets:
+        original = getattr(owner, attr)
+        originals.append((owner, attr, original))
+        setattr(owner, attr, timed(original, stage))
+    try:
+        yield
+    finally:
+        for owner, attr, original in originals:
+            setattr(owner, attr, original)
+
+
+def bench_pipeline(main_module, upstream: MockUpstream, sources, workers: int, repeat: int, verbose: bool) -> Dict:
+    """完整流程：抓取 → 保存 → 频率词 → 统计 → HTML → 通知（通知关闭），在临时目录中运行"""
+    config = main_module.CONFIG
+    overrides = {
+        "PLATFORMS": [{"id": source_id, "name": name} for source_id, name in sources],
+        "MAX_WORKERS": workers,
+        "RATE_LIMIT": {"default_rate": 0, "hosts": {}},
+        "HTTP_POOL": {"pool_connections": 4, "pool_maxsize": max(1, workers)},
+        "API_BASE_URL": upstream.base_url,
+        "USE_PROXY": False,
+        "ENABLE_CRAWLER": True,
+        "ENABLE_NOTIFICATION": False,
+        "PUSH_WINDOW": dict(config["PUSH_WINDOW"], ENABLED=False),
+        "CIRCUIT_BREAKER": {"enabled": False},
+    }
+    saved = {key: config[key] for key in overrides}
+    original_cwd = os.getcwd()
+    frequency_file = os.environ.get("FREQUENCY_WORDS_PATH", "config/frequency_words.txt")
+    os.environ["FREQUENCY_WORDS_PATH"] = str(Path(frequency_file).resolve())
+    work_dir = tempfile.mkdtemp(prefix="trendradar-bench-")
+
+    samples: Dict[str, List[float]] = {"total": []}
+    try:
+        config.update(overrides)
+        os.chdir(work_dir)
+        with instrument_pipeline(main_module, samples):
+            for round_index in range(repeat):
+                # 每轮使用独立的状态目录与连接池，测的是冷启动的单次运行
+                config["STATE_DIR"] = os.path.join(work_dir, f"state{round_index}")
+                if main_module._http_pool is not None:
+                    main_module._http_pool.close()
+                    main_module._http_pool = None
+                with quiet(not verbose):
+                    analyzer = main_module.NewsAnalyzer()
+                    analyzer.open_browser = False
+                    start = time.perf_counter()
+                    analyzer.run()
+                samples["total"].append(time.perf_counter() - start)
+    finally:
+        os.chdir(original_cwd)
+        config.update(saved)
+        os.environ["FREQUENCY_WORDS_PATH"] = frequency_file
+        if main_module._http_pool is not None:
+            main_module._http_pool.close()
+            main_module._http_pool = None
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return summarize(samples, len(sources))
+
+
+def print_report(rows: List[Dict]):
+    print(f"\n{'模式':<10}{'源数':>6}{'线程':>6}  {'阶段':<10}{'p50(ms)':>10}{'p95(ms)':>10}{'吞吐(源/秒)':>14}")
+    print("-" * 70)
+    for row in rows:
+        summary = row["summary"]
+        stages = [key for key in summary if isinstance(summary[key], dict)]
+        for position, stage in enumerate(stages):
+            stat = summary[stage]
+            throughput = f"{summary['throughput']:.1f}" if position == 0 else ""
+            head = (row["mode"], str(row["sources"]), str(row["workers"])) if position == 0 else ("", "", "")
+            print(
+                f"{head[0]:<10}{head[1]:>6}{head[2]:>6}  {stage:<10}"
+                f"{stat['p50_ms']:>10.1f}{stat['p95_ms']:>10.1f}{throughput:>14}"
+            )
+        if summary.get("failed_sources"):
+            print(f"{'':<22}  失败源累计: {summary['failed_sources']}")
+
+
+def parse_int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TrendRadar 抓取与全流程基准测试（本地 mock 上游）")
+    parser.add_argument("--mode", choices=["crawl", "pipeline", "all"], default="all")
+    parser.add_argument("--sources", default="10,100,1000", help="数据源数量列表，逗号分隔")
+    parser.add_argument("--workers", default="1,8,32", help="并发线程数列表，逗号分隔")
+    parser.add_argument("--repeat", type=int, default=3, help="每个组合重复次数")
+    parser.add_argument("--rss-ratio", type=float, default=0.2, help="RSS 源占比 (0-1)")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--payload-bytes", type=int, default=0)
+    parser.add_argument("--recordings", default="output", help="txt 快照目录，找不到时使用合成数据")
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    parser.add_argument("--verbose", action="store_true", help="保留被测代码的输出")
+    args = parser.parse_args()
+
+    with quiet(not args.verbose):
+        import main as main_module
+
+    recordings = load_recordings(args.recordings)
+    upstream = MockUpstream(
+        recordings,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        payload_bytes=args.payload_bytes,
+    )
+    modes = ["crawl", "pipeline"] if args.mode == "all" else [args.mode]
+    benches = {"crawl": bench_crawl, "pipeline": bench_pipeline}
+
+    print(f"🧪 mock 上游: {upstream.base_url}（录制平台 {len(upstream.recordings)} 组，"
+          f"延迟 {args.latency_ms:.0f}+{args.jitter_ms:.0f}ms，错误率 {args.error_rate:.0%}）")
+
+    rows = []
+    with upstream:
+        for mode in modes:
+            for source_count in parse_int_list(args.sources):
+                sources = make_sources(upstream, source_count, args.rss_ratio)
+                for workers in parse_int_list(args.workers):
+                    print(f"⏱️ {mode}: {source_count} 个源，{workers} 线程，重复 {args.repeat} 次...", file=sys.stderr)
+                    upstream.reset_stats()
+                    summary = benches[mode](main_module, upstream, sources, workers, args.repeat, args.verbose)
+                    rows.append({
+                        "mode": mode,
+                        "sources": source_count,
+                        "workers": workers,
+                        "summary": summary,
+                        "upstream": dict(upstream.stats),
+                    })
+
+    print_report(rows)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": rows}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 结果已写入: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
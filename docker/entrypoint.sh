@@ -15,6 +15,11 @@ case "${RUN_MODE:-cron}" in
     echo "🔄 单次执行"
     exec /usr/local/bin/python main.py
     ;;
+"daemon")
+    # 常驻进程，由 main.py 按 CRON_SCHEDULE 自行调度（IMMEDIATE_RUN 同样生效）
+    echo "👻 daemon 模式: ${CRON_SCHEDULE:-*/30 * * * *}"
+    exec /usr/local/bin/python main.py
+    ;;
 "cron")
     # 生成 crontab
     echo "${CRON_SCHEDULE:-*/30 * * * *} cd /app && /usr/local/bin/python main.py" > /tmp/crontab
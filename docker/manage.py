@@ -4,6 +4,7 @@
 新闻爬虫容器管理工具 - supercronic
 """
 
+import math
 import os
 import sys
 import subprocess
@@ -26,8 +27,10 @@ def manual_run():
     """手动执行一次爬虫"""
     print("🔄 手动执行爬虫...")
     try:
+        # daemon 模式下 RUN_MODE=daemon 会被继承，这里强制单次执行
+        env = dict(os.environ, RUN_MODE="once")
         result = subprocess.run(
-            ["python", "main.py"], cwd="/app", capture_output=False, text=True
+            ["python", "main.py"], cwd="/app", capture_output=False, text=True, env=env
         )
         if result.returncode == 0:
             print("✅ 执行完成")
@@ -124,6 +127,7 @@ def show_status():
 
     # 检查 PID 1 状态
     supercronic_is_pid1 = False
+    daemon_is_pid1 = False
     pid1_cmdline = ""
     try:
         with open('/proc/1/cmdline', 'r') as f:
@@ -133,6 +137,9 @@ def show_status():
         if "supercronic" in pid1_cmdline.lower():
             print("  ✅ supercronic 正确运行为 PID 1")
             supercronic_is_pid1 = True
+        elif "main.py" in pid1_cmdline and os.environ.get("RUN_MODE") == "daemon":
+            print("  ✅ daemon 模式: main.py 常驻运行为 PID 1")
+            daemon_is_pid1 = True
         else:
             print("  ❌ PID 1 不是 supercronic")
             print(f"  📋 实际的 PID 1: {pid1_cmdline}")
@@ -228,7 +235,12 @@ def show_status():
 
     # 状态总结和建议
     print("  📊 状态总结:")
-    if supercronic_is_pid1:
+    if daemon_is_pid1:
+        print("    ✅ daemon 进程正常运行，由 main.py 自行按 CRON_SCHEDULE 调度")
+        if cron_schedule != "未设置":
+            print(f"    ⏰ 当前调度: {cron_description}")
+        print("    💡 停止时会等待当前任务结束，如单次运行较久可调大 stop_grace_period")
+    elif supercronic_is_pid1:
         print("    ✅ supercronic 正确运行为 PID 1")
         print("    ✅ 定时任务应该正常工作")
         
@@ -394,6 +406,95 @@ def restart_supercronic():
         print("  💡 建议重启容器: docker restart trend-radar")
 
 
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(len(ordered) * pct / 100) - 1))
+    return ordered[index]
+
+
+def show_metrics():
+    """汇总最近 N 次运行的耗时记录"""
+    from trendradar.timing import RunMetricsLog
+
+    limit = 20
+    if len(sys.argv) > 2:
+        try:
+            limit = max(1, int(sys.argv[2]))
+        except ValueError:
+            print(f"❌ 无效的运行次数: {sys.argv[2]}")
+            return
+
+    metrics_dir = "/app/output/.metrics" if Path("/app/output").exists() else "output/.metrics"
+    records = RunMetricsLog(metrics_dir).read_recent(limit)
+    if not records:
+        print(f"ℹ️ 暂无运行耗时记录: {Path(metrics_dir) / RunMetricsLog.FILE_NAME}")
+        return
+
+    completed = [r for r in records if r.get("stages")]
+    status_counts = {}
+    for record in records:
+        status_counts[record.get("status", "unknown")] = status_counts.get(record.get("status", "unknown"), 0) + 1
+
+    print(f"⏱️ 最近 {len(records)} 次运行耗时汇总:")
+    print(f"  时间范围: {records[0].get('started_at', '?')} ~ {records[-1].get('started_at', '?')}")
+    print("  运行状态: " + "，".join(f"{status} {count} 次" for status, count in status_counts.items()))
+    if not completed:
+        return
+
+    totals = [r["total_seconds"] for r in completed]
+    print(f"  总耗时: 平均 {sum(totals) / len(totals):.2f}s，p95 {_percentile(totals, 95):.2f}s，最大 {max(totals):.2f}s")
+
+    # 回归提示：最近一次明显慢于此前的中位数
+    if len(totals) >= 5:
+        baseline = _percentile(totals[:-1], 50)
+        if baseline > 0 and totals[-1] > baseline * 1.5:
+            print(f"  ⚠️ 最近一次运行 {totals[-1]:.2f}s，比此前中位数 {baseline:.2f}s 慢 {totals[-1] / baseline:.1f} 倍")
+
+    stage_samples = {}
+    for record in completed:
+        for stage, seconds in record["stages"].items():
+            stage_samples.setdefault(stage, []).append(seconds)
+    print("  📊 阶段耗时（按平均值排序）:")
+    for stage, samples in sorted(stage_samples.items(), key=lambda item: sum(item[1]) / len(item[1]), reverse=True):
+        print(f"    {stage:<24} 平均 {sum(samples) / len(samples):>7.2f}s  p95 {_percentile(samples, 95):>7.2f}s  最大 {max(samples):>7.2f}s")
+
+    source_samples = {}
+    for record in completed:
+        for source_id, info in record.get("sources", {}).items():
+            entry = source_samples.setdefault(source_id, {"seconds": [], "failed": 0, "skipped": 0})
+            if info.get("skipped"):
+                entry["skipped"] += 1
+                continue
+            entry["seconds"].append(info.get("seconds", 0.0))
+            if not info.get("ok"):
+                entry["failed"] += 1
+    fetched = {sid: e for sid, e in source_samples.items() if e["seconds"]}
+    if fetched:
+        print("  🐢 最慢数据源 Top 10（按平均耗时）:")
+        slowest = sorted(fetched.items(), key=lambda item: sum(item[1]["seconds"]) / len(item[1]["seconds"]), reverse=True)
+        for source_id, entry in slowest[:10]:
+            samples = entry["seconds"]
+            extra = f"，失败 {entry['failed']} 次" if entry["failed"] else ""
+            extra += f"，熔断跳过 {entry['skipped']} 次" if entry["skipped"] else ""
+            print(f"    {source_id:<24} 平均 {sum(samples) / len(samples):>6.2f}s  最大 {max(samples):>6.2f}s{extra}")
+
+    channel_samples = {}
+    for record in completed:
+        for channel, info in record.get("channels", {}).items():
+            entry = channel_samples.setdefault(channel, {"seconds": [], "failed": 0})
+            entry["seconds"].append(info.get("seconds", 0.0))
+            if not info.get("ok", True):
+                entry["failed"] += 1
+    if channel_samples:
+        print("  📬 通知渠道:")
+        for channel, entry in channel_samples.items():
+            samples = entry["seconds"]
+            extra = f"，失败 {entry['failed']} 次" if entry["failed"] else ""
+            print(f"    {channel:<24} 平均 {sum(samples) / len(samples):>6.2f}s  最大 {max(samples):>6.2f}s{extra}")
+
+
 def show_help():
     """显示帮助信息"""
     help_text = """
@@ -405,6 +506,7 @@ def show_help():
   config      - 显示当前配置
   files       - 显示输出文件
   logs        - 实时查看日志
+  metrics [N] - 汇总最近 N 次运行的耗时（默认 20）
   restart     - 重启说明
   help        - 显示此帮助
 
@@ -413,6 +515,7 @@ def show_help():
   python manage.py run
   python manage.py status
   python manage.py logs
+  python manage.py metrics 50
   
   # 在宿主机执行
   docker exec -it trend-radar python manage.py run
@@ -452,6 +555,7 @@ def main():
         "config": show_config,
         "files": show_files,
         "logs": show_logs,
+        "metrics": show_metrics,
         "restart": restart_supercronic,
         "help": show_help,
     }
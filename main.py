@@ -2,8 +2,8 @@
 
 import json
 import os
-import random
-import re
+import signal
+import threading
 import time
 import webbrowser
 import smtplib
@@ -16,9 +16,21 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Union
 
 import pytz
-import requests
 import yaml
-import feedparser  # 确保 requirements.txt 里加了 feedparser
+
+from trendradar.crawler import Crawler, write_snapshot
+from trendradar.daily_aggregate import DailyAggregateStore
+from trendradar.feed_cache import FeedStateStore
+from trendradar.frequency_rules import FrequencyRules, load_frequency_rules
+from trendradar.http_client import HttpSessionPool
+from trendradar.keyword_matcher import KeywordMatcher
+from trendradar.rate_limiter import HostRateLimiter
+from trendradar.scheduler import CronSchedule
+from trendradar.seen_titles import SeenTitleStore
+from trendradar.snapshot_store import DEFAULT_DB_PATH, SnapshotStore
+from trendradar.source_health import SourceHealthStore
+from trendradar.timing import RunMetricsLog, StageTimer
+from trendradar.weight import WeightScorer
 
 
 VERSION = "3.0.5"
@@ -41,6 +53,18 @@ SMTP_CONFIGS = {
 
 
 # === 配置管理 ===
+def _env_int(name: str) -> int:
+    """读取整数环境变量，未设置或不是整数时返回 0（使用配置文件中的值）"""
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return 0
+    try:
+        return int(value)
+    except ValueError:
+        print(f"⚠️ 环境变量 {name}={value!r} 不是整数，已忽略")
+        return 0
+
+
 def load_config():
     config_path = os.environ.get("CONFIG_PATH", "config/config.yaml")
     if not Path(config_path).exists():
@@ -55,6 +79,15 @@ def load_config():
         "VERSION_CHECK_URL": config_data["app"]["version_check_url"],
         "SHOW_VERSION_UPDATE": config_data["app"]["show_version_update"],
         "REQUEST_INTERVAL": config_data["crawler"]["request_interval"],
+        "API_BASE_URL": (os.environ.get("NEWSNOW_API_URL", "").strip()
+            or config_data["crawler"].get("api_base_url", "https://newsnow.busiyi.world")).rstrip("/"),
+        "MAX_WORKERS": _env_int("CRAWLER_MAX_WORKERS")
+            or config_data["crawler"].get("max_workers", 1),
+        "RATE_LIMIT": config_data["crawler"].get("rate_limit"),
+        "HTTP_POOL": config_data["crawler"].get("http_pool"),
+        "STATE_DIR": config_data["crawler"].get("state_dir", "output/.crawler_state"),
+        "RSS_CONDITIONAL_GET": config_data["crawler"].get("rss_conditional_get", True),
+        "CIRCUIT_BREAKER": config_data["crawler"].get("circuit_breaker"),
         "REPORT_MODE": os.environ.get("REPORT_MODE", "").strip() or config_data["report"]["mode"],
         "RANK_THRESHOLD": config_data["report"]["rank_threshold"],
         "USE_PROXY": config_data["crawler"]["use_proxy"],
@@ -86,6 +119,18 @@ def load_config():
             "RECORD_RETENTION_DAYS": int(os.environ.get("PUSH_WINDOW_RETENTION_DAYS", "").strip() or "0") 
                 or config_data["notification"].get("push_window", {}).get("push_record_retention_days", 7),
         },
+        "STORAGE": {
+            "SQLITE_ENABLED": os.environ.get("STORAGE_SQLITE_ENABLED", "").strip().lower() in ("true", "1")
+                if os.environ.get("STORAGE_SQLITE_ENABLED", "").strip()
+                else config_data.get("storage", {}).get("sqlite_enabled", True),
+            "DB_PATH": config_data.get("storage", {}).get("db_path", DEFAULT_DB_PATH),
+            "TXT_EXPORT": config_data.get("storage", {}).get("txt_export", True),
+        },
+        "METRICS": {
+            "ENABLED": config_data.get("metrics", {}).get("enabled", True),
+            "DIR": config_data.get("metrics", {}).get("dir", "output/.metrics"),
+            "MAX_RECORDS": config_data.get("metrics", {}).get("max_records", 2000),
+        },
         "WEIGHT_CONFIG": config_data["weight"],
         "PLATFORMS": config_data["platforms"],
     }
@@ -142,12 +187,15 @@ def format_time_filename():
     return get_beijing_time().strftime("%H时%M分")
 
 
-def clean_title(title: str) -> str:
-    if not isinstance(title, str):
-        title = str(title)
-    cleaned_title = title.replace("\n", " ").replace("\r", " ")
-    cleaned_title = re.sub(r"\s+", " ", cleaned_title)
-    return cleaned_title.strip()
+_http_pool = None
+
+
+def get_http_pool() -> HttpSessionPool:
+    """获取全局共享的 HTTP 连接池（抓取、版本检查、webhook 推送共用）"""
+    global _http_pool
+    if _http_pool is None:
+        _http_pool = HttpSessionPool.from_config(CONFIG["HTTP_POOL"])
+    return _http_pool
 
 
 def ensure_directory_exists(directory: str):
@@ -165,7 +213,7 @@ def check_version_update(current_version: str, version_url: str, proxy_url: Opti
     try:
         proxies = {"http": proxy_url, "https": proxy_url} if proxy_url else None
         headers = {"User-Agent": "Mozilla/5.0", "Cache-Control": "no-cache"}
-        response = requests.get(version_url, proxies=proxies, headers=headers, timeout=10)
+        response = get_http_pool().get(version_url, proxies=proxies, headers=headers, timeout=10)
         response.raise_for_status()
         remote_version = response.text.strip()
         
@@ -255,291 +303,106 @@ class PushRecordManager:
 
 
 # === 数据获取 ===
-class DataFetcher:
-    def __init__(self, proxy_url: Optional[str] = None):
-        self.proxy_url = proxy_url
-
-    def fetch_data(self, id_info, max_retries=2):
-        id_value = id_info[0] if isinstance(id_info, tuple) else id_info
-        alias = id_info[1] if isinstance(id_info, tuple) else id_value
-        url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
-        
-        proxies = {"http": self.proxy_url, "https": self.proxy_url} if self.proxy_url else None
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-            "Accept": "application/json, text/plain, */*",
-            "Cache-Control": "no-cache",
-        }
-        
-        for i in range(max_retries + 1):
-            try:
-                resp = requests.get(url, proxies=proxies, headers=headers, timeout=10)
-                resp.raise_for_status()
-                data = resp.json()
-                if data.get("status") in ["success", "cache"]:
-                    print(f"✅ 获取 {alias} 成功")
-                    return resp.text, id_value, alias
-            except Exception as e:
-                if i < max_retries:
-                    wait_time = random.uniform(3, 5) + i
-                    print(f"⚠️ 请求 {alias} 失败: {e}. {wait_time:.1f}秒后重试...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"❌ 请求 {alias} 最终失败")
-        
-        return None, id_value, alias
-
-    def crawl_websites(self, ids_list, request_interval):
-        results, id_to_name, failed_ids = {}, {}, []
-        
-        for i, id_info in enumerate(ids_list):
-            id_value = id_info[0] if isinstance(id_info, tuple) else id_info
-            name = id_info[1] if isinstance(id_info, tuple) else id_value
-            id_to_name[id_value] = name
-
-            # === RSS 抓取逻辑 ===
-            if id_value.startswith("http://") or id_value.startswith("https://"):
-                print(f"📡 正在抓取 RSS: {name}")
-                try:
-                    feed = feedparser.parse(id_value)
-                    if feed.bozo:  # RSS 解析错误
-                        print(f"⚠️ RSS 解析警告 [{name}]: {feed.bozo_exception}")
-                    
-                    results[id_value] = {}
-                    for index, entry in enumerate(feed.entries[:15], 1):  # 取前15条
-                        title = entry.get("title", "无标题")
-                        url = entry.get("link", "")
-                        
-                        if title in results[id_value]:
-                            results[id_value][title]["ranks"].append(index)
-                        else:
-                            results[id_value][title] = {
-                                "ranks": [index],
-                                "url": url,
-                                "mobileUrl": url
-                            }
-                    
-                    print(f"✅ RSS [{name}] 抓取成功，获取 {len(results[id_value])} 条")
-                    
-                    # RSS 抓取后也需要间隔
-                    if i < len(ids_list) - 1:
-                        time.sleep(max(50, request_interval + random.randint(-10, 20)) / 1000)
-                    
-                    continue  # 跳过后续的 API 抓取逻辑
-                    
-                except Exception as e:
-                    print(f"❌ RSS 抓取失败 [{name}]: {e}")
-                    failed_ids.append(id_value)
-                    continue
-            # === RSS 逻辑结束 ===
-
-            # 普通 API 抓取
-            response, _, _ = self.fetch_data(id_info)
-            if response:
-                try:
-                    data = json.loads(response)
-                    results[id_value] = {}
-                    for index, item in enumerate(data.get("items", []), 1):
-                        title = item.get("title")
-                        if not title or not str(title).strip():
-                            continue
-                        
-                        title = str(title).strip()
-                        url = item.get("url", "")
-                        mobile_url = item.get("mobileUrl", "")
-                        
-                        if title in results[id_value]:
-                            results[id_value][title]["ranks"].append(index)
-                        else:
-                            results[id_value][title] = {
-                                "ranks": [index],
-                                "url": url,
-                                "mobileUrl": mobile_url
-                            }
-                except Exception as e:
-                    print(f"❌ 解析 {name} 数据失败: {e}")
-                    failed_ids.append(id_value)
-            else:
-                failed_ids.append(id_value)
-            
-            # 请求间隔
-            if i < len(ids_list) - 1:
-                interval = max(50, request_interval + random.randint(-10, 20))
-                time.sleep(interval / 1000)
-        
-        print(f"\n📊 抓取完成: 成功 {len(results)} 个，失败 {len(failed_ids)} 个")
-        return results, id_to_name, failed_ids
+class DataFetcher(Crawler):
+    """main.py 使用的抓取器，默认使用全局配置的 newsnow 地址与共享连接池"""
+
+    def __init__(
+        self,
+        proxy_url: Optional[str] = None,
+        max_workers: int = 1,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        http_pool: Optional[HttpSessionPool] = None,
+        feed_store: Optional[FeedStateStore] = None,
+        health_store: Optional[SourceHealthStore] = None,
+        api_base_url: Optional[str] = None,
+    ):
+        super().__init__(
+            proxy_url,
+            max_workers,
+            rate_limiter,
+            http_pool=http_pool or get_http_pool(),
+            feed_store=feed_store,
+            health_store=health_store,
+            api_base_url=api_base_url or CONFIG["API_BASE_URL"],
+        )
 
 
 # === 数据处理 ===
 def save_titles_to_file(results, id_to_name, failed_ids):
-    file_path = get_output_path("txt", f"{format_time_filename()}.txt")
-    
-    with open(file_path, "w", encoding="utf-8") as f:
-        for id_val, titles in results.items():
-            name = id_to_name.get(id_val, id_val)
-            if name != id_val:
-                f.write(f"{id_val} | {name}\n")
-            else:
-                f.write(f"{id_val}\n")
-            
-            # 按排名排序
-            sorted_titles = []
-            for title, info in titles.items():
-                cleaned_title = clean_title(title)
-                ranks = info.get("ranks", [])
-                url = info.get("url", "")
-                mobile_url = info.get("mobileUrl", "")
-                rank = ranks[0] if ranks else 1
-                sorted_titles.append((rank, cleaned_title, url, mobile_url))
-            
-            sorted_titles.sort(key=lambda x: x[0])
-            
-            for rank, cleaned_title, url, mobile_url in sorted_titles:
-                line = f"{rank}. {cleaned_title}"
-                if url:
-                    line += f" [URL:{url}]"
-                if mobile_url:
-                    line += f" [MOBILE:{mobile_url}]"
-                f.write(line + "\n")
-            
-            f.write("\n")
-        
-        if failed_ids:
-            f.write("==== 以下ID请求失败 ====\n")
-            for id_value in failed_ids:
-                f.write(f"{id_value}\n")
-    
-    return file_path
+    """保存本次抓取结果：写入 SQLite，按配置同时导出 txt 快照，返回保存位置"""
+    storage = CONFIG["STORAGE"]
+    saved_to = []
+    if storage["SQLITE_ENABLED"]:
+        SnapshotStore(storage["DB_PATH"]).save_snapshot(results, id_to_name, failed_ids, get_beijing_time())
+        saved_to.append(storage["DB_PATH"])
+    if storage["TXT_EXPORT"] or not saved_to:
+        file_path = get_output_path("txt", f"{format_time_filename()}.txt")
+        saved_to.append(write_snapshot(file_path, results, id_to_name, failed_ids))
+    return ", ".join(saved_to)
 
 
 def load_frequency_words(frequency_file: Optional[str] = None):
-    if frequency_file is None:
-        frequency_file = os.environ.get("FREQUENCY_WORDS_PATH", "config/frequency_words.txt")
-    
-    path = Path(frequency_file)
-    if not path.exists():
-        raise FileNotFoundError(f"频率词文件 {frequency_file} 不存在")
-    
-    with open(path, "r", encoding="utf-8") as f:
-        content = f.read()
-    
-    word_groups = [group.strip() for group in content.split("\n\n") if group.strip()]
-    processed_groups = []
-    filter_words = []
-    
-    for group in word_groups:
-        words = [word.strip() for word in group.split("\n") if word.strip()]
-        group_required_words = []
-        group_normal_words = []
-        
-        for word in words:
-            if word.startswith("!"):
-                filter_words.append(word[1:])
-            elif word.startswith("+"):
-                group_required_words.append(word[1:])
-            else:
-                group_normal_words.append(word)
-        
-        if group_required_words or group_normal_words:
-            group_key = " ".join(group_normal_words) if group_normal_words else " ".join(group_required_words)
-            processed_groups.append({
-                "required": group_required_words,
-                "normal": group_normal_words,
-                "group_key": group_key
-            })
-    
-    return processed_groups, filter_words
-
-
-def matches_word_groups(title: str, word_groups: List[Dict], filter_words: List[str]) -> bool:
-    if not isinstance(title, str):
-        title = str(title) if title is not None else ""
-    if not title.strip():
-        return False
-    
-    if not word_groups:
-        return True
-    
-    title_lower = title.lower()
-    
-    # 过滤词检查
-    if any(filter_word.lower() in title_lower for filter_word in filter_words):
-        return False
-    
-    # 词组匹配
-    for group in word_groups:
-        required_words = group["required"]
-        normal_words = group["normal"]
-        
-        # 必须词检查
-        if required_words:
-            all_required_present = all(req_word.lower() in title_lower for req_word in required_words)
-            if not all_required_present:
-                continue
-        
-        # 普通词检查
-        if normal_words:
-            any_normal_present = any(normal_word.lower() in title_lower for normal_word in normal_words)
-            if not any_normal_present:
-                continue
-        
-        return True
-    
-    return False
-
-
-def count_word_frequency(results: Dict, word_groups: List[Dict], filter_words: List[str], id_to_name: Dict):
-    """统计词频"""
-    if not word_groups:
+    rules = load_frequency_rules(frequency_file)
+    return rules.word_groups, rules.filter_words
+
+
+def count_word_frequency(
+    results: Dict,
+    word_groups: List[Dict],
+    filter_words: List[str],
+    id_to_name: Dict,
+    matcher: Optional[KeywordMatcher] = None,
+):
+    """统计词频（matcher 为已编译的频率词匹配器，未传入时按 word_groups 现场编译）"""
+    catch_all = not word_groups
+    if catch_all:
         print("⚠️ 频率词配置为空，将显示所有新闻")
         word_groups = [{"required": [], "normal": [], "group_key": "全部新闻"}]
         filter_words = []
+        matcher = None
     
     word_stats = {group["group_key"]: {"count": 0, "titles": []} for group in word_groups}
     total_titles = sum(len(titles) for titles in results.values())
     
+    # 词组与过滤词编译为多模式自动机，每个标题只扫描一遍
+    if matcher is None:
+        matcher = KeywordMatcher(word_groups, filter_words)
+    
     for source_id, titles_data in results.items():
         for title, title_data in titles_data.items():
-            if not matches_word_groups(title, word_groups, filter_words):
-                continue
-            
-            source_ranks = title_data.get("ranks", [])
-            source_url = title_data.get("url", "")
-            source_mobile_url = title_data.get("mobileUrl", "")
+            if "group" in title_data and not catch_all:
+                # 当日累计数据中已记录命中的词组，无需再次匹配
+                group_key = title_data["group"]
+                if group_key not in word_stats:
+                    continue
+            else:
+                group = matcher.match(title)
+                if group is None:
+                    continue
+                group_key = group["group_key"]
             
-            # 找到匹配的词组
-            title_lower = str(title).lower() if not isinstance(title, str) else title.lower()
-            for group in word_groups:
-                required_words = group["required"]
-                normal_words = group["normal"]
-                
-                # 全部新闻模式
-                if len(word_groups) == 1 and word_groups[0]["group_key"] == "全部新闻":
-                    group_key = group["group_key"]
-                else:
-                    # 原有匹配逻辑
-                    if required_words:
-                        all_required_present = all(req_word.lower() in title_lower for req_word in required_words)
-                        if not all_required_present:
-                            continue
-                    
-                    if normal_words:
-                        any_normal_present = any(normal_word.lower() in title_lower for normal_word in normal_words)
-                        if not any_normal_present:
-                            continue
-                    
-                    group_key = group["group_key"]
-                
-                word_stats[group_key]["count"] += 1
-                word_stats[group_key]["titles"].append({
-                    "title": title,
-                    "source_name": id_to_name.get(source_id, source_id),
-                    "ranks": source_ranks,
-                    "url": source_url,
-                    "mobile_url": source_mobile_url
+            title_entry = {
+                "title": title,
+                "source_name": id_to_name.get(source_id, source_id),
+                "ranks": title_data.get("ranks", []),
+                "url": title_data.get("url", ""),
+                "mobile_url": title_data.get("mobileUrl", "")
+            }
+            if "count" in title_data:
+                title_entry.update({
+                    "count": title_data["count"],
+                    "first_time": title_data["first_time"],
+                    "last_time": title_data["last_time"],
                 })
-                break
+            word_stats[group_key]["count"] += 1
+            word_stats[group_key]["titles"].append(title_entry)
+    
+    # 词组内按权重排序（所有匹配新闻一次批量打分）
+    matched_titles = [entry for data in word_stats.values() for entry in data["titles"]]
+    scores = WeightScorer.from_config(CONFIG["WEIGHT_CONFIG"], CONFIG["RANK_THRESHOLD"]).score(matched_titles)
+    weight_of = {id(entry): score for entry, score in zip(matched_titles, scores.tolist())}
+    for data in word_stats.values():
+        data["titles"].sort(key=lambda entry: weight_of[id(entry)], reverse=True)
     
     # 排序
     stats = [
@@ -557,7 +420,7 @@ def count_word_frequency(results: Dict, word_groups: List[Dict], filter_words: L
 
 
 # === 生成简单的 HTML 报告 ===
-def generate_simple_html_report(stats: List[Dict], total_titles: int, failed_ids: List = None) -> str:
+def generate_simple_html_report(stats: List[Dict], total_titles: int, failed_ids: List = None, skipped_ids: List = None) -> str:
     """生成简化的 HTML 报告（用于邮件）"""
     file_path = get_output_path("html", f"{format_time_filename()}.html")
     now = get_beijing_time()
@@ -609,6 +472,8 @@ def generate_simple_html_report(stats: List[Dict], total_titles: int, failed_ids
             source = html_escape(title_data["source_name"])
             ranks = title_data.get("ranks", [])
             rank_display = f"[{min(ranks)}]" if ranks else ""
+            if title_data.get("count", 1) > 1:
+                rank_display += f" {title_data['first_time']}~{title_data['last_time']} ({title_data['count']}次)"
             url = title_data.get("url", "")
             
             if url:
@@ -637,8 +502,10 @@ def generate_simple_html_report(stats: List[Dict], total_titles: int, failed_ids
         <div class="error">
             <strong>⚠️ 以下平台数据获取失败:</strong><br>
 """
+        skipped_ids = skipped_ids or []
         for fid in failed_ids:
-            html_content += f"            • {html_escape(fid)}<br>\n"
+            reason = "熔断跳过" if fid in skipped_ids else "本次失败"
+            html_content += f"            • {html_escape(fid)}（{reason}）<br>\n"
         html_content += """
         </div>
 """
@@ -791,8 +658,10 @@ TrendRadar 热点分析报告
 
 
 # === 通知发送（简化版，包含邮件）===
-def send_notifications(stats: List[Dict], failed_ids: List, html_file_path: str = None):
+def send_notifications(stats: List[Dict], failed_ids: List, html_file_path: str = None, skipped_ids: List = None,
+                       stage_timer: Optional[StageTimer] = None):
     """发送通知到各个渠道"""
+    timer = stage_timer or StageTimer()
     if not CONFIG["ENABLE_NOTIFICATION"]:
         print("⚠️ 通知功能已禁用")
         return
@@ -816,66 +685,84 @@ def send_notifications(stats: List[Dict], failed_ids: List, html_file_path: str
         for i, t in enumerate(item["titles"][:5], 1):
             ranks = t.get("ranks", [])
             rank_str = f"[{min(ranks)}]" if ranks else ""
+            if t.get("count", 1) > 1:
+                rank_str += f" {t['first_time']}~{t['last_time']} ({t['count']}次)"
             content += f"  {i}. [{t['source_name']}] {t['title']} {rank_str}\n"
         content += "\n"
     
-    if failed_ids:
-        content += f"\n⚠️ 失败源: {', '.join(failed_ids)}"
+    skipped_ids = skipped_ids or []
+    failed_this_run = [fid for fid in failed_ids if fid not in skipped_ids]
+    if failed_this_run:
+        content += f"\n⚠️ 本次失败: {', '.join(failed_this_run)}"
+    if skipped_ids:
+        content += f"\n⛔ 熔断跳过: {', '.join(skipped_ids)}"
     
     # 飞书
     if CONFIG["FEISHU_WEBHOOK_URL"]:
-        try:
-            print("📤 发送飞书通知...")
-            requests.post(
-                CONFIG["FEISHU_WEBHOOK_URL"],
-                json={"msg_type": "text", "content": {"text": content}},
-                timeout=10
-            )
-            print("✅ 飞书通知发送成功")
-        except Exception as e:
-            print(f"❌ 飞书通知失败: {e}")
+        with timer.channel("feishu") as result:
+            try:
+                print("📤 发送飞书通知...")
+                get_http_pool().post(
+                    CONFIG["FEISHU_WEBHOOK_URL"],
+                    json={"msg_type": "text", "content": {"text": content}},
+                    timeout=10
+                )
+                print("✅ 飞书通知发送成功")
+            except Exception as e:
+                result["ok"] = False
+                print(f"❌ 飞书通知失败: {e}")
     
     # 钉钉
     if CONFIG["DINGTALK_WEBHOOK_URL"]:
-        try:
-            print("📤 发送钉钉通知...")
-            requests.post(
-                CONFIG["DINGTALK_WEBHOOK_URL"],
-                json={
-                    "msgtype": "markdown",
-                    "markdown": {
-                        "title": f"TrendRadar 热点报告",
-                        "text": content
-                    }
-                },
-                timeout=10
-            )
-            print("✅ 钉钉通知发送成功")
-        except Exception as e:
-            print(f"❌ 钉钉通知失败: {e}")
+        with timer.channel("dingtalk") as result:
+            try:
+                print("📤 发送钉钉通知...")
+                get_http_pool().post(
+                    CONFIG["DINGTALK_WEBHOOK_URL"],
+                    json={
+                        "msgtype": "markdown",
+                        "markdown": {
+                            "title": f"TrendRadar 热点报告",
+                            "text": content
+                        }
+                    },
+                    timeout=10
+                )
+                print("✅ 钉钉通知发送成功")
+            except Exception as e:
+                result["ok"] = False
+                print(f"❌ 钉钉通知失败: {e}")
     
     # 邮件（关键修复）
     if CONFIG["EMAIL_FROM"] and CONFIG["EMAIL_PASSWORD"] and CONFIG["EMAIL_TO"]:
         if not html_file_path:
             print("⚠️ 未提供HTML文件，跳过邮件发送")
         else:
-            send_to_email(
-                CONFIG["EMAIL_FROM"],
-                CONFIG["EMAIL_PASSWORD"],
-                CONFIG["EMAIL_TO"],
-                report_type,
-                html_file_path,
-                CONFIG["EMAIL_SMTP_SERVER"],
-                CONFIG["EMAIL_SMTP_PORT"]
-            )
+            with timer.channel("email") as result:
+                result["ok"] = send_to_email(
+                    CONFIG["EMAIL_FROM"],
+                    CONFIG["EMAIL_PASSWORD"],
+                    CONFIG["EMAIL_TO"],
+                    report_type,
+                    html_file_path,
+                    CONFIG["EMAIL_SMTP_SERVER"],
+                    CONFIG["EMAIL_SMTP_PORT"]
+                )
 
 
 # === 主分析器 ===
 class NewsAnalyzer:
-    def __init__(self):
+    def __init__(self, daemon: bool = False):
         self.proxy_url = CONFIG["DEFAULT_PROXY"] if CONFIG["USE_PROXY"] else None
         self.is_github_actions = os.environ.get("GITHUB_ACTIONS") == "true"
         self.is_docker = os.path.exists("/.dockerenv") or os.environ.get("DOCKER_CONTAINER") == "true"
+        self.daemon = daemon
+        self.open_browser = not self.is_github_actions and not self.is_docker and not daemon
+
+        # daemon 模式下跨多次运行复用的状态
+        self.fetcher = None
+        self.seen_store = None
+        self.daily_store = None
         
         if self.is_github_actions:
             print("🤖 运行环境: GitHub Actions")
@@ -884,8 +771,51 @@ class NewsAnalyzer:
         else:
             print("💻 运行环境: 本地")
 
+    def _get_fetcher(self) -> DataFetcher:
+        """创建抓取器（限速器、RSS 缓存、健康状态只在首次运行时从磁盘加载）"""
+        if self.fetcher is None:
+            rate_limiter = HostRateLimiter.from_config(CONFIG["RATE_LIMIT"], CONFIG["REQUEST_INTERVAL"])
+            feed_store = FeedStateStore(CONFIG["STATE_DIR"]) if CONFIG["RSS_CONDITIONAL_GET"] else None
+            health_store = SourceHealthStore.from_config(CONFIG["STATE_DIR"], CONFIG["CIRCUIT_BREAKER"])
+            self.fetcher = DataFetcher(
+                self.proxy_url,
+                CONFIG["MAX_WORKERS"],
+                rate_limiter,
+                feed_store=feed_store,
+                health_store=health_store,
+            )
+        return self.fetcher
+
+    def _get_seen_store(self) -> SeenTitleStore:
+        """当日已出现标题记录（增量模式使用，daemon 模式下常驻内存，每次只读入新追加的部分）"""
+        if self.seen_store is None:
+            self.seen_store = SeenTitleStore(CONFIG["STATE_DIR"])
+        return self.seen_store
+
+    def _get_daily_store(self) -> DailyAggregateStore:
+        """当日累计数据（daily 模式使用，每次运行只合并本次抓取的标题）"""
+        if self.daily_store is None:
+            self.daily_store = DailyAggregateStore(CONFIG["STATE_DIR"])
+        return self.daily_store
+
+    def _load_frequency_words(self) -> FrequencyRules:
+        """加载频率词规则，文件未修改时直接复用上次编译的结果"""
+        return load_frequency_rules()
+
+    def _write_metrics(self, timer: StageTimer):
+        """追加本次运行的耗时记录（写入失败不影响主流程）"""
+        if not CONFIG["METRICS"]["ENABLED"]:
+            return
+        try:
+            RunMetricsLog(CONFIG["METRICS"]["DIR"], CONFIG["METRICS"]["MAX_RECORDS"]).append(
+                timer.to_record(version=VERSION, report_mode=CONFIG["REPORT_MODE"])
+            )
+        except Exception as e:
+            print(f"⚠️ 写入运行耗时记录失败: {e}")
+
     def run(self):
         """执行分析流程"""
+        timer = StageTimer()
         try:
             now = get_beijing_time()
             print(f"\n{'='*60}")
@@ -896,6 +826,7 @@ class NewsAnalyzer:
             
             if not CONFIG["ENABLE_CRAWLER"]:
                 print("⚠️ 爬虫功能已禁用，程序退出")
+                timer.status = "disabled"
                 return
             
             # 检查推送窗口
@@ -906,32 +837,65 @@ class NewsAnalyzer:
                 
                 if not push_mgr.is_in_time_range(start_time, end_time):
                     print(f"⏰ 当前时间不在推送窗口 {start_time}-{end_time} 内，跳过")
+                    timer.status = "skipped"
                     return
                 
                 if CONFIG["PUSH_WINDOW"]["ONCE_PER_DAY"] and push_mgr.has_pushed_today():
                     print(f"✅ 今天已推送过，跳过")
+                    timer.status = "skipped"
                     return
             
+            connection_baseline = get_http_pool().connection_stats()
+
             # 数据抓取
             print("📡 开始抓取数据...\n")
-            fetcher = DataFetcher(self.proxy_url)
+            fetcher = self._get_fetcher()
             ids = [(p["id"], p.get("name", p["id"])) for p in CONFIG["PLATFORMS"]]
             
-            results, id_to_name, failed = fetcher.crawl_websites(ids, CONFIG["REQUEST_INTERVAL"])
+            with timer.stage("crawl"):
+                results, id_to_name, failed = fetcher.crawl_websites(ids, CONFIG["REQUEST_INTERVAL"], timer)
             
             # 保存数据
             print("\n💾 保存数据...")
-            txt_file = save_titles_to_file(results, id_to_name, failed)
+            with timer.stage("save_titles"):
+                txt_file = save_titles_to_file(results, id_to_name, failed)
             print(f"✅ 数据已保存: {txt_file}")
             
             # 加载频率词
             print("\n🔍 加载频率词配置...")
-            groups, filters = load_frequency_words()
+            with timer.stage("load_frequency_words"):
+                rules = self._load_frequency_words()
+                groups, filters = rules.word_groups, rules.filter_words
             print(f"✅ 加载了 {len(groups)} 个词组，{len(filters)} 个过滤词")
             
+            # 增量模式：只统计今天之前的运行中没有出现过的标题
+            # 当日汇总模式：统计当日累计数据（出现次数、首末出现时间、排名历史）
+            report_results, report_names = results, id_to_name
+            incremental = CONFIG["REPORT_MODE"] == "incremental"
+            if CONFIG["REPORT_MODE"] == "daily":
+                with timer.stage("daily_aggregate"):
+                    report_results, report_names = self._get_daily_store().update(
+                        results, id_to_name, now.strftime("%H:%M"), now.strftime("%Y%m%d"), rules
+                    )
+                print(f"📚 当日累计标题: {sum(len(titles) for titles in report_results.values())} 条")
+            elif incremental:
+                with timer.stage("filter_new_titles"):
+                    report_results = self._get_seen_store().filter_new(results, now.strftime("%Y%m%d"))
+                new_titles = sum(len(titles) for titles in report_results.values())
+                timer.counts["new_titles"] = new_titles
+                print(f"🆕 本次新增标题: {new_titles} 条")
+            
             # 统计分析
             print("\n📊 开始统计分析...")
-            stats, total = count_word_frequency(results, groups, filters, id_to_name)
+            with timer.stage("count_word_frequency"):
+                stats, total = count_word_frequency(report_results, groups, filters, report_names, rules.matcher)
+            timer.counts.update({
+                "sources": len(ids),
+                "succeeded": len(results),
+                "failed": len(failed) - len(fetcher.skipped_ids),
+                "skipped": len(fetcher.skipped_ids),
+                "titles": sum(len(titles) for titles in results.values()),
+            })
             
             print(f"\n📈 统计结果:")
             print(f"   总新闻数: {total}")
@@ -941,38 +905,113 @@ class NewsAnalyzer:
                 if s['count'] > 0:
                     print(f"   • {s['word']}: {s['count']} 条")
             
+            if incremental and not any(s["count"] > 0 for s in stats):
+                self._get_seen_store().mark_seen(results, now.strftime("%Y%m%d"))
+                print("\nℹ️ 增量模式: 没有新增的匹配新闻，跳过报告与推送")
+                return
+            
             # 生成 HTML 报告
             print("\n📄 生成HTML报告...")
-            html_file = generate_simple_html_report(stats, total, failed)
+            with timer.stage("generate_html_report"):
+                html_file = generate_simple_html_report(stats, total, failed, fetcher.skipped_ids)
             print(f"✅ HTML报告已生成: {html_file}")
             
             # 发送通知
             print("\n📬 发送通知...")
-            send_notifications(stats, failed, html_file)
+            with timer.stage("notify"):
+                send_notifications(stats, failed, html_file, fetcher.skipped_ids, timer)
+            
+            # 推送完成后再记录已出现的标题，推送中途失败时下次仍会作为新增处理
+            if incremental:
+                self._get_seen_store().mark_seen(results, now.strftime("%Y%m%d"))
             
             # 记录推送
             if CONFIG["PUSH_WINDOW"]["ENABLED"] and CONFIG["PUSH_WINDOW"]["ONCE_PER_DAY"]:
                 push_mgr = PushRecordManager()
                 push_mgr.record_push("热点分析")
             
-            # 打开浏览器（仅本地环境）
-            if not self.is_github_actions and not self.is_docker:
+            conn_stats = get_http_pool().connection_stats(since=connection_baseline)
+            print(f"\n🔌 HTTP 连接: 请求 {conn_stats['requests']} 次，新建连接 {conn_stats['new_connections']} 个，复用 {conn_stats['reused']} 次")
+            
+            # 打开浏览器（仅本地环境，daemon 模式不打开）
+            if self.open_browser:
                 print(f"\n🌐 正在打开浏览器...")
                 file_url = "file://" + str(Path(html_file).resolve())
                 webbrowser.open(file_url)
             
+            slowest = sorted(timer.stages.items(), key=lambda item: item[1], reverse=True)[:3]
+            print("\n⏱️ 阶段耗时: " + "，".join(f"{name} {seconds:.2f}s" for name, seconds in slowest))
+            
             print(f"\n{'='*60}")
             print(f"✅ TrendRadar 运行完成!")
             print(f"{'='*60}\n")
         
         except Exception as e:
+            timer.status = "error"
             print(f"\n❌ 程序运行错误: {e}")
             import traceback
             traceback.print_exc()
             raise
+        finally:
+            self._write_metrics(timer)
+
+
+def run_daemon():
+    """常驻进程模式：按 CRON_SCHEDULE 定时执行，进程内复用连接池、缓存与状态"""
+    cron_expression = os.environ.get("CRON_SCHEDULE", "").strip() or "*/30 * * * *"
+    schedule = CronSchedule(cron_expression)
+    immediate_run = os.environ.get("IMMEDIATE_RUN", "").strip().lower() in ("true", "1")
+
+    stop_event = threading.Event()
+
+    def handle_signal(signum, frame):
+        if stop_event.is_set():
+            return
+        print(f"\n🛑 收到退出信号 ({signal.Signals(signum).name})，当前任务结束后退出...")
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    print(f"👻 daemon 模式启动，调度: {cron_expression}（北京时间）")
+    analyzer = NewsAnalyzer(daemon=True)
+    run_count = 0
+
+    def run_once():
+        nonlocal run_count
+        run_count += 1
+        start_time = time.time()
+        try:
+            analyzer.run()
+            status = "成功"
+        except Exception:
+            # run() 内部已打印堆栈，daemon 不因单次失败退出
+            status = "失败"
+        print(f"⏱️ 第 {run_count} 次运行{status}，耗时 {time.time() - start_time:.2f} 秒")
+
+    if immediate_run:
+        print("▶️ 立即执行一次")
+        run_once()
+
+    try:
+        while not stop_event.is_set():
+            next_time = schedule.next_run(get_beijing_time())
+            print(f"⏰ 下次执行: {next_time.strftime('%Y-%m-%d %H:%M')}")
+            wait_seconds = (next_time - get_beijing_time()).total_seconds()
+            if stop_event.wait(max(0.0, wait_seconds)):
+                break
+            run_once()
+    finally:
+        if _http_pool is not None:
+            _http_pool.close()
+        print(f"👋 daemon 已退出，共运行 {run_count} 次")
 
 
 def main():
+    if os.environ.get("RUN_MODE", "").strip().lower() == "daemon":
+        run_daemon()
+        return
+
     try:
         analyzer = NewsAnalyzer()
         analyzer.run()
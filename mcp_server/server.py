@@ -6,6 +6,7 @@ TrendRadar MCP Server - FastMCP 2.0 实现
 """
 
 import json
+from datetime import datetime
 from typing import List, Optional, Dict
 
 from fastmcp import FastMCP
@@ -15,6 +16,11 @@ from .tools.analytics import AnalyticsTools
 from .tools.search_tools import SearchTools
 from .tools.config_mgmt import ConfigManagementTools
 from .tools.system import SystemManagementTools
+from .services.cache_service import configure_cache
+from .services.executor_service import ToolExecutor
+from .services.parser_service import configure_txt_snapshot_cache
+from .services.watcher_service import SnapshotWatcher
+from .utils.errors import FileParseError, MCPError
 
 
 # 创建 FastMCP 2.0 应用
@@ -22,26 +28,107 @@ mcp = FastMCP('trendradar-news')
 
 # 全局工具实例（在第一次请求时初始化）
 _tools_instances = {}
+_project_root: Optional[str] = None
+
+# 工具执行器（在第一次请求时按 config.yaml 的 mcp 配置创建）
+_executor: Optional[ToolExecutor] = None
+
+# 新快照监听器（mcp.watch.enabled 为 true 时在启动服务器时创建）
+_watcher: Optional[SnapshotWatcher] = None
 
 
 def _get_tools(project_root: Optional[str] = None):
     """获取或创建工具实例（单例模式）"""
+    global _project_root
     if not _tools_instances:
+        _project_root = project_root
         _tools_instances['data'] = DataQueryTools(project_root)
         _tools_instances['analytics'] = AnalyticsTools(project_root)
         _tools_instances['search'] = SearchTools(project_root)
         _tools_instances['config'] = ConfigManagementTools(project_root)
         _tools_instances['system'] = SystemManagementTools(project_root)
+        cache_config = _get_mcp_config().get('cache') or {}
+        configure_cache(cache_config)
+        configure_txt_snapshot_cache(cache_config.get('txt_snapshot'))
     return _tools_instances
 
 
+def _get_mcp_config() -> Dict:
+    """读取 config.yaml 中的 mcp 配置节，配置文件不可用时返回空字典"""
+    try:
+        config_data = _tools_instances['data'].data_service.parser.parse_yaml_config() or {}
+    except FileParseError:
+        return {}
+    return config_data.get('mcp') or {}
+
+
+def _get_executor() -> ToolExecutor:
+    """获取或创建工具执行器"""
+    global _executor
+    if _executor is None:
+        _get_tools()
+        _executor = ToolExecutor.from_config(
+            _get_mcp_config(),
+            process_initializer=_get_tools,
+            process_initargs=(_project_root,)
+        )
+    return _executor
+
+
+def _warm_caches():
+    """
+    新快照写入后预热缓存：导入数据库（同时更新全文索引与小时分桶），
+    并按工具的默认参数刷新当天合并数据、最新新闻与关注词统计
+
+    只预热当前进程；配置了进程池时，进程池中的分析工具仍在首次调用时读取
+    """
+    tools = _get_tools()
+    parser = tools['data'].data_service.parser
+    parser.ensure_in_store(datetime.now())
+    try:
+        parser.read_all_titles_for_date()
+    except MCPError:
+        # 当天还没有数据（如刚过零点）
+        return
+    tools['data'].get_latest_news()
+    tools['data'].get_trending_topics()
+    tools['data'].get_trending_topics(mode='daily')
+
+
+def _start_watcher() -> Optional[SnapshotWatcher]:
+    """按 mcp.watch 配置启动新快照监听器，未启用时返回 None"""
+    global _watcher
+    watch_config = _get_mcp_config().get('watch') or {}
+    if _watcher is None and watch_config.get('enabled', False):
+        _watcher = SnapshotWatcher(
+            _get_tools()['data'].data_service.parser,
+            _warm_caches,
+            poll_interval=watch_config.get('poll_interval', 30),
+            debounce=watch_config.get('debounce', 2),
+            use_inotify=watch_config.get('inotify', True)
+        ).start()
+    return _watcher
+
+
+def _call_tool(group: str, method: str, kwargs: Dict) -> str:
+    """在工作线程/进程中执行工具方法并序列化结果"""
+    result = getattr(_get_tools()[group], method)(**kwargs)
+    return json.dumps(result, ensure_ascii=False, indent=2)
+
+
+async def _run_tool(tool_name: str, group: str, method: str, **kwargs) -> str:
+    """把同步的工具方法放到执行器中运行，避免阻塞事件循环"""
+    return await _get_executor().run(tool_name, _call_tool, group, method, kwargs)
+
+
 # ==================== 数据查询工具 ====================
 
 @mcp.tool
 async def get_latest_news(
     platforms: Optional[List[str]] = None,
     limit: int = 50,
-    include_url: bool = False
+    include_url: bool = False,
+    hours: Optional[int] = None
 ) -> str:
     """
     获取最新一批爬取的新闻数据，快速了解当前热点
@@ -54,6 +141,8 @@ async def get_latest_news(
         limit: 返回条数限制，默认50，最大1000
                注意：实际返回数量可能少于请求值，取决于当前可用的新闻总数
         include_url: 是否包含URL链接，默认False（节省token）
+        hours: 可选，返回最近 N 小时内（最多72小时）所有批次的新闻，如 hours=3
+               - 不指定时：只返回最新一批（最近一次爬取）的数据
 
     Returns:
         JSON格式的新闻列表
@@ -70,9 +159,7 @@ async def get_latest_news(
 
     **注意**：如果用户询问"为什么只显示了部分"，说明他们需要完整数据
     """
-    tools = _get_tools()
-    result = tools['data'].get_latest_news(platforms=platforms, limit=limit, include_url=include_url)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return await _run_tool('get_latest_news', 'data', 'get_latest_news', platforms=platforms, limit=limit, include_url=include_url, hours=hours)
 
 
 @mcp.tool
@@ -85,6 +172,8 @@ async def get_trending_topics(
 
     注意：本工具不是自动提取新闻热点，而是统计你在 config/frequency_words.txt 中
     设置的个人关注词在新闻中出现的频率。你可以自定义这个关注词列表。
+    统计口径与推送报告一致：按词组统计（必须词 + 与过滤词 ! 规则生效），
+    每条新闻只计入命中的第一个词组，keyword 为词组名称。
 
     Args:
         top_n: 返回TOP N关注词，默认10
@@ -95,9 +184,7 @@ async def get_trending_topics(
     Returns:
         JSON格式的关注词频率统计列表
     """
-    tools = _get_tools()
-    result = tools['data'].get_trending_topics(top_n=top_n, mode=mode)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return await _run_tool('get_trending_topics', 'data', 'get_trending_topics', top_n=top_n, mode=mode)
 
 
 @mcp.tool
@@ -105,7 +192,8 @@ async def get_news_by_date(
     date_query: Optional[str] = None,
     platforms: Optional[List[str]] = None,
     limit: int = 50,
-    include_url: bool = False
+    include_url: bool = False,
+    time_range: Optional[Dict[str, str]] = None
 ) -> str:
     """
     获取指定日期的新闻数据，用于历史数据分析和对比
@@ -122,6 +210,9 @@ async def get_news_by_date(
         limit: 返回条数限制，默认50，最大1000
                注意：实际返回数量可能少于请求值，取决于指定日期的新闻总数
         include_url: 是否包含URL链接，默认False（节省token）
+        time_range: 可选，只统计当天某个时间段内抓取的数据
+            - **格式**: {"start": "HH:MM", "end": "HH:MM"}（可只提供 start 或 end）
+            - **示例**: {"start": "09:00", "end": "12:00"} 表示上午 9 点到 12 点
 
     Returns:
         JSON格式的新闻列表，包含标题、平台、排名等信息
@@ -138,14 +229,14 @@ async def get_news_by_date(
 
     **注意**：如果用户询问"为什么只显示了部分"，说明他们需要完整数据
     """
-    tools = _get_tools()
-    result = tools['data'].get_news_by_date(
+    return await _run_tool(
+        'get_news_by_date', 'data', 'get_news_by_date',
         date_query=date_query,
         platforms=platforms,
         limit=limit,
-        include_url=include_url
+        include_url=include_url,
+        time_range=time_range
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 
@@ -177,7 +268,11 @@ async def analyze_topic_trend(
                     - **示例**: {"start": "2025-10-18", "end": "2025-10-25"}
                     - **说明**: AI需要根据用户的自然语言（如"最近7天"）自动计算日期范围
                     - **默认**: 不指定时默认分析最近7天
-        granularity: 时间粒度（trend模式），默认"day"（仅支持 day，因为底层数据按天聚合）
+        granularity: 时间粒度（trend和lifecycle模式），默认"day"
+                    - **day**: 按天统计
+                    - **hour**: 按小时统计，适合观察当天话题的发酵过程
+                    - **snapshot**: 按每次抓取的快照统计
+                    - **说明**: hour/snapshot 不指定 date_range 时默认只分析今天
         threshold: 热度突增倍数阈值（viral模式），默认3.0
         time_window: 检测时间窗口小时数（viral模式），默认24
         lookahead_hours: 预测未来小时数（predict模式），默认6
@@ -193,11 +288,12 @@ async def analyze_topic_trend(
     Examples:
         - analyze_topic_trend(topic="人工智能", analysis_type="trend", date_range={"start": "2025-10-18", "end": "2025-10-25"})
         - analyze_topic_trend(topic="特斯拉", analysis_type="lifecycle", date_range={"start": "2025-10-18", "end": "2025-10-25"})
+        - analyze_topic_trend(topic="台风", analysis_type="trend", granularity="hour")
         - analyze_topic_trend(topic="比特币", analysis_type="viral", threshold=3.0)
         - analyze_topic_trend(topic="ChatGPT", analysis_type="predict", lookahead_hours=6)
     """
-    tools = _get_tools()
-    result = tools['analytics'].analyze_topic_trend_unified(
+    return await _run_tool(
+        'analyze_topic_trend', 'analytics', 'analyze_topic_trend_unified',
         topic=topic,
         analysis_type=analysis_type,
         date_range=date_range,
@@ -207,7 +303,6 @@ async def analyze_topic_trend(
         lookahead_hours=lookahead_hours,
         confidence_threshold=confidence_threshold
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 @mcp.tool
@@ -242,15 +337,14 @@ async def analyze_data_insights(
         - analyze_data_insights(insight_type="platform_activity", date_range={"start": "2025-01-01", "end": "2025-01-07"})
         - analyze_data_insights(insight_type="keyword_cooccur", min_frequency=5, top_n=15)
     """
-    tools = _get_tools()
-    result = tools['analytics'].analyze_data_insights_unified(
+    return await _run_tool(
+        'analyze_data_insights', 'analytics', 'analyze_data_insights_unified',
         insight_type=insight_type,
         topic=topic,
         date_range=date_range,
         min_frequency=min_frequency,
         top_n=top_n
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 @mcp.tool
@@ -289,8 +383,8 @@ async def analyze_sentiment(
     - **默认展示方式**：展示完整的分析结果（包括所有新闻）
     - 仅在用户明确要求"总结"或"挑重点"时才进行筛选
     """
-    tools = _get_tools()
-    result = tools['analytics'].analyze_sentiment(
+    return await _run_tool(
+        'analyze_sentiment', 'analytics', 'analyze_sentiment',
         topic=topic,
         platforms=platforms,
         date_range=date_range,
@@ -298,7 +392,6 @@ async def analyze_sentiment(
         sort_by_weight=sort_by_weight,
         include_url=include_url
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 @mcp.tool
@@ -327,14 +420,13 @@ async def find_similar_news(
     - **默认展示方式**：展示全部返回的新闻（包括相似度分数）
     - 仅在用户明确要求"总结"或"挑重点"时才进行筛选
     """
-    tools = _get_tools()
-    result = tools['analytics'].find_similar_news(
+    return await _run_tool(
+        'find_similar_news', 'analytics', 'find_similar_news',
         reference_title=reference_title,
         threshold=threshold,
         limit=limit,
         include_url=include_url
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 @mcp.tool
@@ -355,12 +447,11 @@ async def generate_summary_report(
     Returns:
         JSON格式的摘要报告，包含Markdown格式内容
     """
-    tools = _get_tools()
-    result = tools['analytics'].generate_summary_report(
+    return await _run_tool(
+        'generate_summary_report', 'analytics', 'generate_summary_report',
         report_type=report_type,
         date_range=date_range
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 # ==================== 智能检索工具 ====================
@@ -426,8 +517,8 @@ async def search_news(
         - 精确日期: search_news(query="人工智能", date_range={"start": "2025-01-01", "end": "2025-01-07"})
         - 模糊搜索: search_news(query="特斯拉降价", search_mode="fuzzy", threshold=0.4)
     """
-    tools = _get_tools()
-    result = tools['search'].search_news_unified(
+    return await _run_tool(
+        'search_news', 'search', 'search_news_unified',
         query=query,
         search_mode=search_mode,
         date_range=date_range,
@@ -437,7 +528,6 @@ async def search_news(
         threshold=threshold,
         include_url=include_url
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 @mcp.tool
@@ -473,15 +563,14 @@ async def search_related_news_history(
     - **默认展示方式**：展示全部返回的新闻（包括相关性分数）
     - 仅在用户明确要求"总结"或"挑重点"时才进行筛选
     """
-    tools = _get_tools()
-    result = tools['search'].search_related_news_history(
+    return await _run_tool(
+        'search_related_news_history', 'search', 'search_related_news_history',
         reference_text=reference_text,
         time_preset=time_preset,
         threshold=threshold,
         limit=limit,
         include_url=include_url
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
 
 
 # ==================== 配置与系统管理工具 ====================
@@ -504,9 +593,7 @@ async def get_current_config(
     Returns:
         JSON格式的配置信息
     """
-    tools = _get_tools()
-    result = tools['config'].get_current_config(section=section)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return await _run_tool('get_current_config', 'config', 'get_current_config', section=section)
 
 
 @mcp.tool
@@ -519,9 +606,7 @@ async def get_system_status() -> str:
     Returns:
         JSON格式的系统状态信息
     """
-    tools = _get_tools()
-    result = tools['system'].get_system_status()
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return await _run_tool('get_system_status', 'system', 'get_system_status')
 
 
 @mcp.tool
@@ -531,32 +616,59 @@ async def trigger_crawl(
     include_url: bool = False
 ) -> str:
     """
-    手动触发一次爬取任务（可选持久化）
+    手动触发一次后台爬取任务（可选持久化），立即返回 task_id
+
+    爬取在后台执行，不阻塞其他请求；相同参数的任务正在执行时会直接复用该任务。
+    使用 get_crawl_status(task_id) 查询进度和结果。
 
     Args:
         platforms: 指定平台ID列表，如 ['zhihu', 'weibo', 'douyin']
                    - 不指定时：使用 config.yaml 中配置的所有平台
                    - 支持的平台来自 config/config.yaml 的 platforms 配置
                    - 每个平台都有对应的name字段（如"知乎"、"微博"），方便AI识别
-                   - 注意：失败的平台会在返回结果的 failed_platforms 字段中列出
         save_to_local: 是否保存到本地 output 目录，默认 False
-        include_url: 是否包含URL链接，默认False（节省token）
+        include_url: 查询结果时是否默认包含URL链接，默认False（节省token）
 
     Returns:
-        JSON格式的任务状态信息，包含：
-        - platforms: 成功爬取的平台列表
-        - failed_platforms: 失败的平台列表（如有）
-        - total_news: 爬取的新闻总数
-        - data: 新闻数据
+        JSON格式的任务提交信息，包含：
+        - task_id: 任务ID
+        - status: 任务状态（pending/running）
+        - joined_existing: 是否复用了正在执行的相同任务
 
     Examples:
         - 临时爬取: trigger_crawl(platforms=['zhihu'])
         - 爬取并保存: trigger_crawl(platforms=['weibo'], save_to_local=True)
         - 使用默认平台: trigger_crawl()  # 爬取config.yaml中配置的所有平台
     """
-    tools = _get_tools()
-    result = tools['system'].trigger_crawl(platforms=platforms, save_to_local=save_to_local, include_url=include_url)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return await _run_tool('trigger_crawl', 'system', 'trigger_crawl', platforms=platforms, save_to_local=save_to_local, include_url=include_url)
+
+
+@mcp.tool
+async def get_crawl_status(
+    task_id: Optional[str] = None,
+    include_data: bool = True,
+    include_url: Optional[bool] = None
+) -> str:
+    """
+    查询后台爬取任务的状态、各平台进度和结果
+
+    Args:
+        task_id: trigger_crawl 返回的任务ID，不指定时列出最近的任务
+        include_data: 任务完成时是否返回新闻数据，默认True
+        include_url: 是否包含URL链接，不指定时沿用 trigger_crawl 的设置
+
+    Returns:
+        JSON格式的任务状态，包含：
+        - status: pending/running/completed/failed
+        - progress: 总平台数、已完成数、完成百分比及每个平台的状态（success/failed/skipped）
+        - 任务完成后：platforms、failed_platforms、total_news、data 等爬取结果
+
+    Examples:
+        - 查询任务: get_crawl_status(task_id='crawl_20251117_103000_ab12cd34')
+        - 只看进度: get_crawl_status(task_id='...', include_data=False)
+        - 最近任务: get_crawl_status()
+    """
+    return await _run_tool('get_crawl_status', 'system', 'get_crawl_status', task_id=task_id, include_data=include_data, include_url=include_url)
 
 
 # ==================== 启动入口 ====================
@@ -578,6 +690,7 @@ def run_server(
     """
     # 初始化工具实例
     _get_tools(project_root)
+    watcher = _start_watcher()
 
     # 打印启动信息
     print()
@@ -598,6 +711,8 @@ def run_server(
         print(f"  项目目录: {project_root}")
     else:
         print("  项目目录: 当前目录")
+    if watcher:
+        print(f"  快照监听: 已启用（{watcher.mode}），新快照写入后自动预热缓存")
 
     print()
     print("  已注册的工具:")
@@ -620,7 +735,8 @@ def run_server(
     print("    === 配置与系统管理 ===")
     print("    11. get_current_config      - 获取当前系统配置")
     print("    12. get_system_status       - 获取系统运行状态")
-    print("    13. trigger_crawl           - 手动触发爬取任务")
+    print("    13. trigger_crawl           - 手动触发后台爬取任务")
+    print("    14. get_crawl_status        - 查询爬取任务进度与结果")
     print("=" * 60)
     print()
 
@@ -1,56 +1,227 @@
 """
 缓存服务
 
-实现TTL缓存机制，提升数据访问性能。
+实现有容量上限的 LRU + TTL 缓存，提升数据访问性能。
+
+- 缓存键的第一个 ":" 之前的部分为命名空间（如 read_all_titles、latest_news），
+  每个命名空间有独立的默认存活时间与命中/未命中/淘汰统计
+- 每个条目写入时估算占用的字节数，总量或条目数超过上限时淘汰最久未使用的条目
+- 写入时定期清理已过期的条目，过期数据不会一直占用内存
+- 条目可带数据版本（如某天快照清单的版本），读取时版本不一致即视为失效，
+  依赖抓取数据的结果在新快照写入后立即失效，历史日期的结果可以永不过期
 """
 
+import math
+import sys
 import time
-from typing import Any, Optional
+from collections import OrderedDict
+from typing import Any, Dict, Optional
 from threading import Lock
 
 
+# 永不过期（仍受容量上限约束，可能被 LRU 淘汰）
+NEVER_EXPIRE = math.inf
+
+# 各命名空间的默认存活时间（秒），未列出的命名空间使用 default_ttl；
+# 带数据版本的条目在数据变化时失效，这里只约束与当前时间相关的查询（如最近 N 小时）
+DEFAULT_NAMESPACE_TTLS = {
+    "latest_news": 60,
+    "read_window": 60,
+    "config": 3600,
+}
+
+
+def estimate_size(value: Any) -> int:
+    """
+    估算对象占用的字节数（递归计算容器及其元素，同一对象只计算一次）
+
+    Args:
+        value: 任意对象
+
+    Returns:
+        近似字节数
+    """
+    seen = set()
+    total = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        obj_id = id(obj)
+        if obj_id in seen:
+            continue
+        seen.add(obj_id)
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+
+class _CacheEntry:
+    __slots__ = ("value", "size", "created", "expires", "version")
+
+    def __init__(self, value: Any, size: int, created: float, expires: float, version: Any = None):
+        self.value = value
+        self.size = size
+        self.created = created
+        self.expires = expires
+        self.version = version
+
+
 class CacheService:
     """缓存服务类"""
 
-    def __init__(self):
-        """初始化缓存服务"""
-        self._cache = {}
-        self._timestamps = {}
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_entries: int = 10000,
+        default_ttl: int = 900,
+        namespace_ttls: Optional[Dict[str, int]] = None,
+        cleanup_interval: int = 60,
+    ):
+        """
+        初始化缓存服务
+
+        Args:
+            max_bytes: 缓存数据的估算总字节数上限
+            max_entries: 缓存条目数上限
+            default_ttl: 默认存活时间（秒），默认15分钟
+            namespace_ttls: 按命名空间覆盖的存活时间（秒）
+            cleanup_interval: 写入时清理过期条目的最小间隔（秒）
+        """
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
         self._lock = Lock()
+        self._total_bytes = 0
+        self._last_cleanup = time.time()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self.namespace_ttls = dict(DEFAULT_NAMESPACE_TTLS)
+        self.configure(max_bytes, max_entries, default_ttl, namespace_ttls, cleanup_interval)
+
+    def configure(
+        self,
+        max_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        default_ttl: Optional[int] = None,
+        namespace_ttls: Optional[Dict[str, int]] = None,
+        cleanup_interval: Optional[int] = None,
+    ) -> None:
+        """
+        调整缓存上限与存活时间（未传入的参数保持不变），超出新上限的条目立即淘汰
+
+        Args:
+            max_bytes: 缓存数据的估算总字节数上限
+            max_entries: 缓存条目数上限
+            default_ttl: 默认存活时间（秒）
+            namespace_ttls: 按命名空间覆盖的存活时间（秒），与内置默认值合并
+            cleanup_interval: 写入时清理过期条目的最小间隔（秒）
+        """
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max(0, int(max_bytes))
+            if max_entries is not None:
+                self.max_entries = max(1, int(max_entries))
+            if default_ttl is not None:
+                self.default_ttl = int(default_ttl)
+            if namespace_ttls:
+                self.namespace_ttls.update({name: int(ttl) for name, ttl in namespace_ttls.items()})
+            if cleanup_interval is not None:
+                self.cleanup_interval = int(cleanup_interval)
+            self._evict()
 
-    def get(self, key: str, ttl: int = 900) -> Optional[Any]:
+    @staticmethod
+    def namespace(key: str) -> str:
+        """缓存键所属的命名空间"""
+        return key.split(":", 1)[0]
+
+    def _counter(self, namespace: str) -> Dict[str, int]:
+        counter = self._stats.get(namespace)
+        if counter is None:
+            counter = self._stats[namespace] = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidated": 0}
+        return counter
+
+    def _remove(self, key: str) -> _CacheEntry:
+        entry = self._cache.pop(key)
+        self._total_bytes -= entry.size
+        return entry
+
+    def _evict(self) -> None:
+        """淘汰最久未使用的条目直到满足上限（调用方持有锁）"""
+        while self._cache and (len(self._cache) > self.max_entries or self._total_bytes > self.max_bytes):
+            key = next(iter(self._cache))
+            self._remove(key)
+            self._counter(self.namespace(key))["evictions"] += 1
+
+    def _cleanup_locked(self, now: float) -> int:
+        expired_keys = [key for key, entry in self._cache.items() if entry.expires <= now]
+        for key in expired_keys:
+            self._remove(key)
+            self._counter(self.namespace(key))["expired"] += 1
+        self._last_cleanup = now
+        return len(expired_keys)
+
+    def get(self, key: str, ttl: Optional[int] = None, version: Any = None) -> Optional[Any]:
         """
         获取缓存数据
 
         Args:
             key: 缓存键
-            ttl: 存活时间（秒），默认15分钟
+            ttl: 本次读取可接受的最大存活时间（秒），默认使用写入时确定的存活时间
+            version: 当前数据版本，与写入时的版本不一致时视为失效
 
         Returns:
-            缓存的值，如果不存在或已过期则返回None
+            缓存的值，如果不存在、已过期或版本不一致则返回None
         """
+        now = time.time()
         with self._lock:
-            if key in self._cache:
-                # 检查是否过期
-                if time.time() - self._timestamps[key] < ttl:
-                    return self._cache[key]
+            counter = self._counter(self.namespace(key))
+            entry = self._cache.get(key)
+            if entry is not None:
+                if entry.version != version:
+                    # 数据已变化，删除缓存
+                    self._remove(key)
+                    counter["invalidated"] += 1
+                elif now < entry.expires and (ttl is None or now - entry.created < ttl):
+                    self._cache.move_to_end(key)
+                    counter["hits"] += 1
+                    return entry.value
                 else:
                     # 已过期，删除缓存
-                    del self._cache[key]
-                    del self._timestamps[key]
+                    self._remove(key)
+                    counter["expired"] += 1
+            counter["misses"] += 1
         return None
 
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, version: Any = None) -> None:
         """
         设置缓存数据
 
         Args:
             key: 缓存键
             value: 缓存值
+            ttl: 存活时间（秒），默认使用命名空间的存活时间；NEVER_EXPIRE 表示永不过期
+            version: 数据版本，读取时传入的版本不一致则失效
         """
+        namespace = self.namespace(key)
+        if ttl is None:
+            ttl = self.namespace_ttls.get(namespace, self.default_ttl)
+        # 在锁外估算大小，大对象的遍历不阻塞其他读取
+        size = estimate_size(value)
+        now = time.time()
+
         with self._lock:
-            self._cache[key] = value
-            self._timestamps[key] = time.time()
+            if key in self._cache:
+                self._remove(key)
+            if size > self.max_bytes:
+                # 单个条目超过总上限，不缓存
+                self._counter(namespace)["evictions"] += 1
+                return
+            self._cache[key] = _CacheEntry(value, size, now, now + ttl, version)
+            self._total_bytes += size
+            if now - self._last_cleanup >= self.cleanup_interval:
+                self._cleanup_locked(now)
+            self._evict()
 
     def delete(self, key: str) -> bool:
         """
@@ -64,8 +235,7 @@ class CacheService:
         """
         with self._lock:
             if key in self._cache:
-                del self._cache[key]
-                del self._timestamps[key]
+                self._remove(key)
                 return True
         return False
 
@@ -73,49 +243,56 @@ class CacheService:
         """清空所有缓存"""
         with self._lock:
             self._cache.clear()
-            self._timestamps.clear()
+            self._total_bytes = 0
 
-    def cleanup_expired(self, ttl: int = 900) -> int:
+    def cleanup_expired(self) -> int:
         """
         清理过期缓存
 
-        Args:
-            ttl: 存活时间（秒）
-
         Returns:
             清理的条目数量
         """
         with self._lock:
-            current_time = time.time()
-            expired_keys = [
-                key for key, timestamp in self._timestamps.items()
-                if current_time - timestamp >= ttl
-            ]
-
-            for key in expired_keys:
-                del self._cache[key]
-                del self._timestamps[key]
-
-            return len(expired_keys)
+            return self._cleanup_locked(time.time())
 
     def get_stats(self) -> dict:
         """
         获取缓存统计信息
 
         Returns:
-            统计信息字典
+            统计信息字典（总体与按命名空间的条目数、估算内存、命中/未命中/淘汰/过期/失效次数）
         """
+        now = time.time()
         with self._lock:
+            namespaces = {
+                name: dict(counter, entries=0, bytes=0)
+                for name, counter in self._stats.items()
+            }
+            for key, entry in self._cache.items():
+                namespace = namespaces.setdefault(
+                    self.namespace(key),
+                    {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidated": 0, "entries": 0, "bytes": 0}
+                )
+                namespace["entries"] += 1
+                namespace["bytes"] += entry.size
+
+            hits = sum(counter["hits"] for counter in self._stats.values())
+            misses = sum(counter["misses"] for counter in self._stats.values())
+            created = [entry.created for entry in self._cache.values()]
             return {
                 "total_entries": len(self._cache),
-                "oldest_entry_age": (
-                    time.time() - min(self._timestamps.values())
-                    if self._timestamps else 0
-                ),
-                "newest_entry_age": (
-                    time.time() - max(self._timestamps.values())
-                    if self._timestamps else 0
-                )
+                "max_entries": self.max_entries,
+                "memory_mb": round(self._total_bytes / 1024 / 1024, 2),
+                "max_memory_mb": round(self.max_bytes / 1024 / 1024, 2),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                "evictions": sum(counter["evictions"] for counter in self._stats.values()),
+                "expired": sum(counter["expired"] for counter in self._stats.values()),
+                "invalidated": sum(counter["invalidated"] for counter in self._stats.values()),
+                "oldest_entry_age": now - min(created) if created else 0,
+                "newest_entry_age": now - max(created) if created else 0,
+                "namespaces": namespaces,
             }
 
 
@@ -134,3 +311,25 @@ def get_cache() -> CacheService:
     if _global_cache is None:
         _global_cache = CacheService()
     return _global_cache
+
+
+def configure_cache(cache_config: Optional[Dict] = None) -> CacheService:
+    """
+    按 config.yaml 中 mcp.cache 配置节调整全局缓存
+
+    Args:
+        cache_config: 配置节（max_memory_mb / max_entries / default_ttl / ttl）
+
+    Returns:
+        全局缓存服务实例
+    """
+    cache = get_cache()
+    cache_config = cache_config or {}
+    max_memory_mb = cache_config.get("max_memory_mb")
+    cache.configure(
+        max_bytes=int(max_memory_mb * 1024 * 1024) if max_memory_mb is not None else None,
+        max_entries=cache_config.get("max_entries"),
+        default_ttl=cache_config.get("default_ttl"),
+        namespace_ttls=cache_config.get("ttl"),
+    )
+    return cache
@@ -0,0 +1,159 @@
+"""
+爬取任务服务
+
+在后台线程中执行爬取任务，MCP 工具提交后立即返回 task_id，
+相同参数的并发请求复用正在运行的任务。
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# 任务状态
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class CrawlJob:
+    """单个后台爬取任务"""
+
+    def __init__(self, key: Tuple, platforms: List[Tuple[str, str]], options: Dict):
+        self.task_id = f"crawl_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        self.key = key
+        self.options = options
+        self.status = PENDING
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict] = None
+        self.error: Optional[Dict] = None
+        self.joined_requests = 0
+        self.include_url = False  # 查询结果时默认是否包含 URL（沿用首次提交时的设置）
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._platforms = {
+            platform_id: {"name": name, "status": PENDING, "news_count": 0, "seconds": None}
+            for platform_id, name in platforms
+        }
+
+    def update_platform(self, platform_id: str, name: str, status: str, news_count: int, seconds: float):
+        """抓取进度回调：记录单个平台的完成状态"""
+        with self._lock:
+            self._platforms[platform_id] = {
+                "name": name,
+                "status": status,
+                "news_count": news_count,
+                "seconds": round(seconds, 3),
+            }
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (PENDING, RUNNING)
+
+    def to_dict(self) -> Dict:
+        """任务状态快照（不含结果数据）"""
+        with self._lock:
+            platforms = {platform_id: dict(info) for platform_id, info in self._platforms.items()}
+        finished = sum(1 for info in platforms.values() if info["status"] not in (PENDING, RUNNING))
+        end = self.finished_at or time.time()
+        return {
+            "task_id": self.task_id,
+            "status": self.status,
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.created_at)),
+            "elapsed_seconds": round(end - (self.started_at or self.created_at), 2),
+            "progress": {
+                "total": len(platforms),
+                "finished": finished,
+                "percent": round(finished * 100 / len(platforms), 1) if platforms else 100.0,
+                "platforms": platforms,
+            },
+            "joined_requests": self.joined_requests,
+            "options": dict(self.options),
+        }
+
+
+class CrawlJobService:
+    """后台爬取任务管理"""
+
+    def __init__(self, max_concurrent_jobs: int = 2, max_history: int = 50):
+        """
+        初始化任务服务
+
+        Args:
+            max_concurrent_jobs: 同时执行的任务数，超出的任务排队
+            max_history: 保留的已结束任务数量
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_jobs, thread_name_prefix="crawl-job")
+        self._jobs: Dict[str, CrawlJob] = {}
+        self._lock = threading.Lock()
+        self.max_history = max_history
+
+    def submit(
+        self,
+        platforms: List[Tuple[str, str]],
+        options: Dict,
+        runner: Callable[[CrawlJob], Dict],
+    ) -> Tuple[CrawlJob, bool]:
+        """
+        提交爬取任务，相同平台与选项的任务正在执行时直接复用
+
+        Args:
+            platforms: [(平台ID, 名称)] 列表
+            options: 影响任务结果的选项（参与去重），如 save_to_local
+            runner: 任务执行函数，接收 CrawlJob（用于上报进度），返回结果字典
+
+        Returns:
+            (任务, 是否复用了已有任务)
+        """
+        key = (tuple(sorted(platform_id for platform_id, _ in platforms)), tuple(sorted(options.items())))
+        with self._lock:
+            for job in self._jobs.values():
+                if job.key == key and job.is_active:
+                    job.joined_requests += 1
+                    return job, True
+
+            job = CrawlJob(key, platforms, options)
+            self._jobs[job.task_id] = job
+            self._prune()
+
+        self._executor.submit(self._run, job, runner)
+        return job, False
+
+    def get(self, task_id: str) -> Optional[CrawlJob]:
+        with self._lock:
+            return self._jobs.get(task_id)
+
+    def list_jobs(self) -> List[CrawlJob]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def _run(self, job: CrawlJob, runner: Callable[[CrawlJob], Dict]):
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = runner(job)
+            job.status = COMPLETED
+        except Exception as e:
+            to_dict = getattr(e, "to_dict", None)
+            job.error = to_dict() if callable(to_dict) else {"code": "INTERNAL_ERROR", "message": str(e)}
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+            job._done.set()
+
+    def _prune(self):
+        """只保留最近 max_history 个已结束的任务（调用方持有锁）"""
+        finished = [job for job in self._jobs.values() if not job.is_active]
+        if len(finished) <= self.max_history:
+            return
+        finished.sort(key=lambda job: job.created_at)
+        for job in finished[:len(finished) - self.max_history]:
+            del self._jobs[job.task_id]
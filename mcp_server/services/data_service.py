@@ -5,13 +5,19 @@
 """
 
 import re
+import sqlite3
+import time
 from collections import Counter
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from .cache_service import get_cache
+from trendradar.snapshot_store import build_match_query, label_time
+from trendradar.weight import WeightScorer
+
+from .cache_service import NEVER_EXPIRE, get_cache
 from .parser_service import ParserService
-from ..utils.errors import DataNotFoundError
+from ..utils.errors import DataNotFoundError, FileParseError
 
 
 class DataService:
@@ -31,7 +37,8 @@ class DataService:
         self,
         platforms: Optional[List[str]] = None,
         limit: int = 50,
-        include_url: bool = False
+        include_url: bool = False,
+        hours: Optional[int] = None
     ) -> List[Dict]:
         """
         获取最新一批爬取的新闻数据
@@ -40,6 +47,7 @@ class DataService:
             platforms: 平台ID列表,None表示所有平台
             limit: 返回条数限制
             include_url: 是否包含URL链接,默认False(节省token)
+            hours: 返回最近 N 小时内所有快照的新闻,None表示只返回最新一批
 
         Returns:
             新闻列表
@@ -48,16 +56,21 @@ class DataService:
             DataNotFoundError: 数据不存在
         """
         # 尝试从缓存获取
-        cache_key = f"latest_news:{','.join(platforms or [])}:{limit}:{include_url}"
-        cached = self.cache.get(cache_key, ttl=900)  # 15分钟缓存
+        cache_key = f"latest_news:{','.join(platforms or [])}:{limit}:{include_url}:{hours}"
+        version = self.parser.get_data_version()  # 今天有新快照写入后失效
+        cached = self.cache.get(cache_key, version=version)
         if cached:
             return cached
 
-        # 读取今天的数据
-        all_titles, id_to_name, timestamps = self.parser.read_all_titles_for_date(
-            date=None,
-            platform_ids=platforms
-        )
+        # 只读取最新一个快照（或最近 N 小时内的快照），不合并全天数据
+        if hours:
+            all_titles, id_to_name, timestamps = self.read_recent_hours(hours, platforms)
+        else:
+            all_titles, id_to_name, timestamps = self.parser.read_titles_in_window(
+                date=None,
+                platform_ids=platforms,
+                latest_only=True
+            )
 
         # 获取最新的文件时间
         if timestamps:
@@ -96,8 +109,12 @@ class DataService:
         # 限制返回数量
         result = news_list[:limit]
 
-        # 缓存结果
-        self.cache.set(cache_key, result)
+        # 缓存结果：最近 N 小时的结果随时间变化，只做短时缓存
+        self.cache.set(
+            cache_key, result,
+            ttl=None if hours else NEVER_EXPIRE,
+            version=self.parser.settle_data_version(None, version)
+        )
 
         return result
 
@@ -106,7 +123,8 @@ class DataService:
         target_date: datetime,
         platforms: Optional[List[str]] = None,
         limit: int = 50,
-        include_url: bool = False
+        include_url: bool = False,
+        time_range: Optional[Tuple[str, str]] = None
     ) -> List[Dict]:
         """
         按指定日期获取新闻
@@ -116,6 +134,7 @@ class DataService:
             platforms: 平台ID列表,None表示所有平台
             limit: 返回条数限制
             include_url: 是否包含URL链接,默认False(节省token)
+            time_range: 时间段 ("HH:MM", "HH:MM"),只统计该时间段内的快照,None表示全天
 
         Returns:
             新闻列表
@@ -133,16 +152,25 @@ class DataService:
         """
         # 尝试从缓存获取
         date_str = target_date.strftime("%Y-%m-%d")
-        cache_key = f"news_by_date:{date_str}:{','.join(platforms or [])}:{limit}:{include_url}"
-        cached = self.cache.get(cache_key, ttl=1800)  # 30分钟缓存
+        cache_key = f"news_by_date:{date_str}:{','.join(platforms or [])}:{limit}:{include_url}:{time_range}"
+        version = self.parser.get_data_version(target_date)  # 该日期有新快照写入后失效
+        cached = self.cache.get(cache_key, version=version)
         if cached:
             return cached
 
-        # 读取指定日期的数据
-        all_titles, id_to_name, timestamps = self.parser.read_all_titles_for_date(
-            date=target_date,
-            platform_ids=platforms
-        )
+        # 读取指定日期的数据（指定时间段时只读取该时间段内的快照）
+        if time_range:
+            all_titles, id_to_name, timestamps = self.parser.read_titles_in_window(
+                date=target_date,
+                platform_ids=platforms,
+                start_time=time_range[0],
+                end_time=time_range[1]
+            )
+        else:
+            all_titles, id_to_name, timestamps = self.parser.read_all_titles_for_date(
+                date=target_date,
+                platform_ids=platforms
+            )
 
         # 转换为新闻列表
         news_list = []
@@ -176,8 +204,12 @@ class DataService:
         # 限制返回数量
         result = news_list[:limit]
 
-        # 缓存结果(历史数据缓存更久)
-        self.cache.set(cache_key, result)
+        # 缓存结果（按数据版本失效，历史日期的结果不会过期）
+        self.cache.set(
+            cache_key, result,
+            ttl=NEVER_EXPIRE,
+            version=self.parser.settle_data_version(target_date, version)
+        )
 
         return result
 
@@ -213,10 +245,37 @@ class DataService:
         # 收集所有匹配的新闻
         results = []
         platform_distribution = Counter()
+        keyword_lower = keyword.lower()
+
+        def add_result(title, platform_id, platform_name, info, date_str):
+            # 计算平均排名
+            avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
+
+            results.append({
+                "title": title,
+                "platform": platform_id,
+                "platform_name": platform_name,
+                "ranks": info["ranks"],
+                "count": len(info["ranks"]),
+                "avg_rank": round(avg_rank, 2),
+                "url": info.get("url", ""),
+                "mobileUrl": info.get("mobileUrl", ""),
+                "date": date_str
+            })
 
-        # 遍历日期范围
-        current_date = start_date
-        while current_date <= end_date:
+            platform_distribution[platform_id] += 1
+
+        # 已入库的日期走全文索引，其余日期逐条扫描
+        indexed = self.search_titles_in_store([keyword], start_date, end_date, platforms)
+        if indexed is not None:
+            candidates, scan_dates = indexed
+            for item in candidates:
+                if keyword_lower in item["title"].lower():
+                    add_result(item["title"], item["platform_id"], item["platform_name"], item, item["date"])
+        else:
+            scan_dates = self.iter_dates(start_date, end_date)
+
+        for current_date in scan_dates:
             try:
                 all_titles, id_to_name, _ = self.parser.read_all_titles_for_date(
                     date=current_date,
@@ -228,31 +287,13 @@ class DataService:
                     platform_name = id_to_name.get(platform_id, platform_id)
 
                     for title, info in titles.items():
-                        if keyword.lower() in title.lower():
-                            # 计算平均排名
-                            avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
-
-                            results.append({
-                                "title": title,
-                                "platform": platform_id,
-                                "platform_name": platform_name,
-                                "ranks": info["ranks"],
-                                "count": len(info["ranks"]),
-                                "avg_rank": round(avg_rank, 2),
-                                "url": info.get("url", ""),
-                                "mobileUrl": info.get("mobileUrl", ""),
-                                "date": current_date.strftime("%Y-%m-%d")
-                            })
-
-                            platform_distribution[platform_id] += 1
+                        if keyword_lower in title.lower():
+                            add_result(title, platform_id, platform_name, info, current_date.strftime("%Y-%m-%d"))
 
             except DataNotFoundError:
                 # 该日期没有数据,继续下一天
                 pass
 
-            # 下一天
-            current_date += timedelta(days=1)
-
         if not results:
             raise DataNotFoundError(
                 f"未找到包含关键词 '{keyword}' 的新闻",
@@ -282,6 +323,209 @@ class DataService:
             }
         }
 
+    def read_recent_hours(
+        self,
+        hours: int,
+        platforms: Optional[List[str]] = None
+    ) -> Tuple[Dict, Dict, Dict]:
+        """
+        读取最近 N 小时内所有快照的标题（可跨天），同一标题的排名按时间顺序合并
+
+        Returns:
+            (all_titles, id_to_name, timestamps) 元组
+
+        Raises:
+            DataNotFoundError: 时间范围内没有数据
+        """
+        since = time.time() - hours * 3600
+        all_titles = {}
+        id_to_name = {}
+        timestamps = {}
+        first_day = datetime.fromtimestamp(since).replace(hour=0, minute=0, second=0, microsecond=0)
+        for current_date in self.iter_dates(first_day, datetime.now()):
+            try:
+                day_titles, day_names, day_timestamps = self.parser.read_titles_in_window(
+                    date=current_date,
+                    platform_ids=platforms,
+                    since=since
+                )
+            except DataNotFoundError:
+                continue
+
+            id_to_name.update(day_names)
+            date_str = current_date.strftime("%Y-%m-%d")
+            timestamps.update({f"{date_str} {label}": ts for label, ts in day_timestamps.items()})
+            for platform_id, titles in day_titles.items():
+                merged = all_titles.setdefault(platform_id, {})
+                for title, info in titles.items():
+                    if title in merged:
+                        merged[title] = dict(merged[title], ranks=merged[title]["ranks"] + info["ranks"])
+                    else:
+                        merged[title] = info
+
+        if not all_titles:
+            raise DataNotFoundError(
+                f"最近 {hours} 小时内没有新闻数据",
+                suggestion="请扩大时间范围或确认爬虫正在运行"
+            )
+
+        return all_titles, id_to_name, timestamps
+
+    def get_topic_mentions(
+        self,
+        topic: str,
+        start_date: datetime,
+        end_date: datetime,
+        granularity: str = "hour"
+    ) -> List[Dict]:
+        """
+        按小时或快照统计话题（标题包含关键词，不区分大小写）的出现次数
+
+        已入库的日期：全文索引找出匹配的标题，再查小时分桶 / 快照排名表，不逐条扫描标题；
+        其余日期逐个读取 txt 快照。计数口径与按天统计一致：同一标题在不同平台分别计数。
+
+        Args:
+            topic: 话题关键词
+            start_date: 开始日期
+            end_date: 结束日期
+            granularity: 时间粒度 hour / snapshot
+
+        Returns:
+            按时间顺序排列的时间段列表 [{date, time, count, titles}]，
+            有抓取数据的每个时间段一项（没有提及时 count 为 0）；
+            time 为 "HH:00"（hour）或快照时间 "HH:MM"（snapshot），titles 为去重后的匹配标题
+        """
+        topic_lower = topic.lower()
+        buckets: Dict[Tuple[str, str], Dict] = {}
+
+        def add(key: Tuple[str, str], title: Optional[str] = None, mention=None):
+            # mention 标识一次提及（平台 + 标题），同一时间段内只计一次
+            bucket = buckets.setdefault(key, {"mentions": set(), "titles": []})
+            if title is not None:
+                bucket["mentions"].add(mention)
+                if title not in bucket["titles"]:
+                    bucket["titles"].append(title)
+
+        all_dates = self.iter_dates(start_date, end_date)
+        indexed = self.search_titles_in_store([topic], start_date, end_date)
+        scan_dates = all_dates if indexed is None else indexed[1]
+        store = self.parser.get_snapshot_store()
+        if len(scan_dates) < len(all_dates) and store.exists():
+            candidates = indexed[0]
+            scan_keys = {current_date.strftime("%Y-%m-%d") for current_date in scan_dates}
+            try:
+                # 先登记所有抓取过的时间段，没有提及的时间段计数为 0
+                for day, label, _ in store.list_snapshots(start_date, end_date):
+                    if day not in scan_keys:
+                        add((day, self._bucket_time(label, granularity)))
+
+                matched = {
+                    item["title_id"]: item["title"]
+                    for item in candidates
+                    if topic_lower in item["title"].lower()
+                }
+                if granularity == "hour":
+                    mentions = [
+                        (title_id, day, f"{hour:02d}:00")
+                        for title_id, day, hour in store.hourly_mentions(list(matched))
+                    ]
+                else:
+                    mentions = [
+                        (title_id, day, self._bucket_time(label, granularity))
+                        for title_id, day, label in store.snapshot_mentions(list(matched))
+                    ]
+                for title_id, day, bucket_time in sorted(mentions, key=lambda row: (row[1], row[2])):
+                    add((day, bucket_time), matched[title_id], title_id)
+            except sqlite3.Error as e:
+                print(f"Warning: 数据库查询失败，改为逐条扫描: {e}")
+                buckets.clear()
+                scan_dates = all_dates
+
+        for current_date in scan_dates:
+            day = current_date.strftime("%Y-%m-%d")
+            for label, titles_by_id in self.parser.read_txt_snapshots(current_date):
+                key = (day, self._bucket_time(label, granularity))
+                add(key)
+                for platform_id, titles in titles_by_id.items():
+                    for title in titles:
+                        if topic_lower in title.lower():
+                            add(key, title, (platform_id, title))
+
+        return [
+            {"date": day, "time": bucket_time, "count": len(bucket["mentions"]), "titles": bucket["titles"]}
+            for (day, bucket_time), bucket in sorted(buckets.items())
+        ]
+
+    @staticmethod
+    def _bucket_time(label: str, granularity: str) -> str:
+        """快照名称所在时间段："HH:00"（hour）或 "HH:MM"（snapshot）"""
+        snapshot_time = label_time(label) or label
+        if granularity == "hour" and label_time(label):
+            return snapshot_time[:2] + ":00"
+        return snapshot_time
+
+    @staticmethod
+    def iter_dates(start_date: datetime, end_date: datetime) -> List[datetime]:
+        dates = []
+        current_date = start_date
+        while current_date <= end_date:
+            dates.append(current_date)
+            current_date += timedelta(days=1)
+        return dates
+
+    def search_titles_in_store(
+        self,
+        terms: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        platforms: Optional[List[str]] = None
+    ) -> Optional[Tuple[List[Dict], List[datetime]]]:
+        """
+        通过 SQLite 全文索引检索日期范围内包含任一检索词的标题
+
+        Args:
+            terms: 检索词列表（任一命中即为候选）
+            start_date: 开始日期
+            end_date: 结束日期
+            platforms: 平台过滤列表
+
+        Returns:
+            (candidates, scan_dates) 元组，数据库不可用时返回 None
+            - candidates: 候选标题 [{date, platform_id, platform_name, title, url, mobileUrl, ranks}]，
+              按相关度排序，调用方需自行做精确匹配校验
+            - scan_dates: 数据库中没有、需要逐条扫描的日期
+        """
+        store = self.parser.get_snapshot_store()
+        if store is None:
+            return None
+
+        stored_dates = []
+        scan_dates = []
+        for current_date in self.iter_dates(start_date, end_date):
+            if self.parser.ensure_in_store(current_date):
+                stored_dates.append(current_date)
+            else:
+                scan_dates.append(current_date)
+
+        if not stored_dates:
+            return [], scan_dates
+
+        try:
+            # 补齐旧数据库的全文索引（只读时跳过，由写入方补建）
+            store.initialize()
+        except sqlite3.Error:
+            pass
+
+        try:
+            candidates = store.search_titles(
+                build_match_query(terms), stored_dates[0], stored_dates[-1], platforms
+            )
+        except sqlite3.Error as e:
+            print(f"Warning: 全文索引查询失败，改为逐条扫描: {e}")
+            return None
+
+        return candidates, scan_dates
+
     def get_trending_topics(
         self,
         top_n: int = 10,
@@ -305,85 +549,66 @@ class DataService:
         """
         # 尝试从缓存获取
         cache_key = f"trending_topics:{top_n}:{mode}"
-        cached = self.cache.get(cache_key, ttl=1800)  # 30分钟缓存
+        # 今天有新快照写入或关注词文件修改后失效
+        rules = self.parser.get_frequency_rules()
+        version = self.parser.get_data_version()
+        cached = self.cache.get(cache_key, version=(version, rules.path, rules.version))
         if cached:
             return cached
 
-        # 读取今天的数据
-        all_titles, id_to_name, timestamps = self.parser.read_all_titles_for_date()
-
-        if not all_titles:
-            raise DataNotFoundError(
-                "未找到今天的新闻数据",
-                suggestion="请确保爬虫已经运行并生成了数据"
+        if mode not in ("daily", "current"):
+            raise ValueError(
+                f"不支持的模式: {mode}。支持的模式: daily, current"
             )
 
-        # 加载关键词配置
-        word_groups = self.parser.parse_frequency_words()
-
         # 根据mode选择要处理的标题数据
-        titles_to_process = {}
-
         if mode == "daily":
             # daily模式:处理当天所有累计数据
-            titles_to_process = all_titles
-
-        elif mode == "current":
-            # current模式:只处理最新一批数据(最新时间戳的文件)
-            if timestamps:
-                # 找出最新的时间戳
-                latest_timestamp = max(timestamps.values())
-
-                # 重新读取,只获取最新时间的数据
-                # 这里我们通过timestamps字典反查找最新文件对应的平台
-                latest_titles, _, _ = self.parser.read_all_titles_for_date()
-
-                # 由于read_all_titles_for_date返回所有文件的合并数据,
-                # 我们需要通过timestamps来过滤出最新批次
-                # 简化实现:使用当前所有数据作为最新批次
-                # (更精确的实现需要解析服务支持按时间过滤)
-                titles_to_process = latest_titles
-            else:
-                titles_to_process = all_titles
-
+            titles_to_process, _, _ = self.parser.read_all_titles_for_date()
         else:
-            raise ValueError(
-                f"不支持的模式: {mode}。支持的模式: daily, current"
+            # current模式:只处理最新一批数据(最新的一个快照)
+            titles_to_process, _, _ = self.parser.read_titles_in_window(latest_only=True)
+
+        if not titles_to_process:
+            raise DataNotFoundError(
+                "未找到今天的新闻数据",
+                suggestion="请确保爬虫已经运行并生成了数据"
             )
 
-        # 统计词频
+        # 关键词配置与 main.py 的 count_word_frequency 使用同一套规则
+        # 统计词频：每条新闻归入命中的第一个词组，命中过滤词的新闻不计
         word_frequency = Counter()
         keyword_to_news = {}
+        keyword_to_items = {}
 
-        # 遍历要处理的标题
         for platform_id, titles in titles_to_process.items():
-            for title in titles.keys():
-                # 对每个关键词组进行匹配
-                for group in word_groups:
-                    all_words = group.get("required", []) + group.get("normal", [])
-
-                    for word in all_words:
-                        if word and word in title:
-                            word_frequency[word] += 1
-
-                            if word not in keyword_to_news:
-                                keyword_to_news[word] = []
-                            keyword_to_news[word].append(title)
+            for title, info in titles.items():
+                group = rules.match(title)
+                if group is None:
+                    continue
+                word_frequency[group["group_key"]] += 1
+                keyword_to_news.setdefault(group["group_key"], set()).add(title)
+                keyword_to_items.setdefault(group["group_key"], []).append(info)
 
         # 获取TOP N关键词
         top_keywords = word_frequency.most_common(top_n)
 
+        # 权重：命中新闻的平均权重（与 main.py 报告排序同一套算法），一次批量计算
+        items = [info for keyword, _ in top_keywords for info in keyword_to_items[keyword]]
+        scores = self.get_weight_scorer().score(items) if items else []
+
         # 构建话题列表
         topics = []
+        offset = 0
         for keyword, frequency in top_keywords:
-            matched_news = keyword_to_news.get(keyword, [])
-
+            keyword_scores = scores[offset:offset + frequency]
+            offset += frequency
             topics.append({
                 "keyword": keyword,
                 "frequency": frequency,
-                "matched_news": len(set(matched_news)),  # 去重后的新闻数量
+                "matched_news": len(keyword_to_news[keyword]),  # 去重后的新闻数量
                 "trend": "stable",  # TODO: 需要历史数据来计算趋势
-                "weight_score": 0.0  # TODO: 需要实现权重计算
+                "weight_score": round(float(keyword_scores.mean()), 2)
             })
 
         # 构建结果
@@ -396,7 +621,11 @@ class DataService:
         }
 
         # 缓存结果
-        self.cache.set(cache_key, result)
+        self.cache.set(
+            cache_key, result,
+            ttl=NEVER_EXPIRE,
+            version=(self.parser.settle_data_version(None, version), rules.path, rules.version)
+        )
 
         return result
 
@@ -408,6 +637,22 @@ class DataService:
         }
         return descriptions.get(mode, "未知模式")
 
+    def get_weight_scorer(self) -> WeightScorer:
+        """
+        按 config.yaml 的 weight 与 report.rank_threshold 创建新闻权重计算器
+
+        Returns:
+            权重计算器（与 main.py 报告排序使用同一套权重）
+        """
+        try:
+            config_data = self.parser.parse_yaml_config()
+        except FileParseError:
+            return WeightScorer()
+        return WeightScorer.from_config(
+            config_data.get("weight"),
+            config_data.get("report", {}).get("rank_threshold", 5)
+        )
+
     def get_current_config(self, section: str = "all") -> Dict:
         """
         获取当前系统配置
@@ -423,13 +668,14 @@ class DataService:
         """
         # 尝试从缓存获取
         cache_key = f"config:{section}"
-        cached = self.cache.get(cache_key, ttl=3600)  # 1小时缓存
+        cached = self.cache.get(cache_key)  # 1小时缓存
         if cached:
             return cached
 
         # 解析配置文件
         config_data = self.parser.parse_yaml_config()
-        word_groups = self.parser.parse_frequency_words()
+        frequency_rules = self.parser.get_frequency_rules()
+        word_groups = frequency_rules.word_groups
 
         # 根据section返回对应配置
         if section == "all" or section == "crawler":
@@ -461,6 +707,7 @@ class DataService:
         if section == "all" or section == "keywords":
             keywords_config = {
                 "word_groups": word_groups,
+                "filter_words": frequency_rules.filter_words,
                 "total_groups": len(word_groups)
             }
 
@@ -579,6 +826,29 @@ class DataService:
                         if item.is_file():
                             total_storage += item.stat().st_size
 
+        # SQLite 快照存储
+        database = None
+        store = self.parser.get_snapshot_store()
+        if store is not None and store.exists():
+            db_size = sum(
+                path.stat().st_size
+                for path in (store.db_path, Path(f"{store.db_path}-wal"))
+                if path.exists()
+            )
+            stored_dates = store.list_dates()
+            database = {
+                "path": str(store.db_path),
+                "size": f"{db_size / 1024 / 1024:.2f} MB",
+                "dates": len(stored_dates),
+            }
+            total_storage += db_size
+            for date_str in stored_dates[:1] + stored_dates[-1:]:
+                stored_date = datetime.strptime(date_str, "%Y-%m-%d")
+                if oldest_record is None or stored_date < oldest_record:
+                    oldest_record = stored_date
+                if latest_record is None or stored_date > latest_record:
+                    latest_record = stored_date
+
         # 读取版本信息
         version_file = self.parser.project_root / "version"
         version = "unknown"
@@ -598,6 +868,7 @@ class DataService:
                 "total_storage": f"{total_storage / 1024 / 1024:.2f} MB",
                 "oldest_record": oldest_record.strftime("%Y-%m-%d") if oldest_record else None,
                 "latest_record": latest_record.strftime("%Y-%m-%d") if latest_record else None,
+                "database": database,
             },
             "cache": self.cache.get_stats(),
             "health": "healthy"
@@ -0,0 +1,125 @@
+"""
+工具执行服务
+
+MCP 工具的实现都是同步的文件解析与统计代码，直接在 async 工具函数中调用会阻塞事件循环，
+HTTP 模式下一个耗时查询会卡住所有客户端。这里把工具调用放到线程池中执行，
+CPU 密集的分析工具可配置为在进程池中执行以利用多核；每个工具有独立的并发上限。
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+# 默认在进程池中执行的工具（只读、无进程内状态依赖的分析工具）
+DEFAULT_PROCESS_TOOLS = (
+    "analyze_topic_trend",
+    "analyze_data_insights",
+    "analyze_sentiment",
+    "find_similar_news",
+    "generate_summary_report",
+)
+
+
+class ToolExecutor:
+    """MCP 工具执行器"""
+
+    def __init__(
+        self,
+        thread_workers: int = 8,
+        process_workers: int = 0,
+        process_tools: Iterable[str] = DEFAULT_PROCESS_TOOLS,
+        default_concurrency: int = 4,
+        tool_concurrency: Optional[Dict[str, int]] = None,
+        process_initializer: Optional[Callable] = None,
+        process_initargs: Tuple = (),
+    ):
+        """
+        初始化执行器
+
+        Args:
+            thread_workers: 线程池大小
+            process_workers: 进程池大小，0 表示不使用进程池（所有工具都在线程池执行）
+            process_tools: 在进程池中执行的工具名称
+            default_concurrency: 单个工具默认的最大并发数
+            tool_concurrency: 按工具名称覆盖的最大并发数
+            process_initializer: 工作进程初始化函数（如预先创建工具实例）
+            process_initargs: 工作进程初始化函数的参数
+        """
+        self.thread_workers = max(1, int(thread_workers))
+        self.process_workers = max(0, int(process_workers))
+        self.process_tools = frozenset(process_tools or ())
+        self.default_concurrency = max(1, int(default_concurrency))
+        self.tool_concurrency = {name: max(1, int(limit)) for name, limit in (tool_concurrency or {}).items()}
+        self._process_initializer = process_initializer
+        self._process_initargs = process_initargs
+
+        self._thread_pool = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="mcp-tool")
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @classmethod
+    def from_config(cls, mcp_config: Optional[Dict] = None, **kwargs) -> "ToolExecutor":
+        """
+        根据 config.yaml 中 mcp 配置节创建
+
+        Args:
+            mcp_config: mcp 配置节
+            **kwargs: 透传给构造函数的其他参数（如进程初始化函数）
+        """
+        mcp_config = mcp_config or {}
+        process_workers = mcp_config.get("process_workers", 0)
+        if process_workers == "auto":
+            process_workers = os.cpu_count() or 1
+        return cls(
+            thread_workers=mcp_config.get("thread_workers", 8),
+            process_workers=process_workers,
+            process_tools=mcp_config.get("process_tools", DEFAULT_PROCESS_TOOLS),
+            default_concurrency=mcp_config.get("default_concurrency", 4),
+            tool_concurrency=mcp_config.get("tool_concurrency"),
+            **kwargs,
+        )
+
+    def _semaphore(self, tool_name: str) -> asyncio.Semaphore:
+        # 只在事件循环线程中调用，无需加锁
+        semaphore = self._semaphores.get(tool_name)
+        if semaphore is None:
+            limit = self.tool_concurrency.get(tool_name, self.default_concurrency)
+            semaphore = self._semaphores[tool_name] = asyncio.Semaphore(limit)
+        return semaphore
+
+    def _pool_for(self, tool_name: str) -> Executor:
+        if self.process_workers and tool_name in self.process_tools:
+            if self._process_pool is None:
+                # spawn 避免在已有线程的进程中 fork
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self._process_initializer,
+                    initargs=self._process_initargs,
+                )
+            return self._process_pool
+        return self._thread_pool
+
+    async def run(self, tool_name: str, func: Callable, *args) -> Any:
+        """
+        在线程池/进程池中执行工具函数，超过该工具并发上限的调用排队等待
+
+        Args:
+            tool_name: 工具名称（决定并发上限与执行池）
+            func: 工具函数；进程池执行时必须是模块级函数，参数与返回值需可 pickle
+            *args: 传给工具函数的参数
+
+        Returns:
+            工具函数的返回值
+        """
+        async with self._semaphore(tool_name):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool_for(tool_name), func, *args)
+
+    def shutdown(self, wait: bool = True):
+        self._thread_pool.shutdown(wait=wait)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait)
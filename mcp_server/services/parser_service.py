@@ -4,15 +4,216 @@
 提供txt格式新闻数据和YAML配置文件的解析功能。
 """
 
+import os
+import pickle
 import re
+import sqlite3
+import struct
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
 import yaml
 
+from trendradar.crawler import read_snapshot
+from trendradar.frequency_rules import FrequencyRules, load_frequency_rules
+from trendradar.snapshot_store import DEFAULT_DB_PATH, SnapshotStore, label_bounds
+
 from ..utils.errors import FileParseError, DataNotFoundError
-from .cache_service import get_cache
+from .cache_service import NEVER_EXPIRE, estimate_size, get_cache
+
+
+class _TxtSnapshotCache:
+    """
+    txt 快照的解析缓存（进程内共享）：单文件解析结果 + 按日期增量合并的结果
+
+    两类条目共用一个 LRU，按估算字节数与条目数限制，超出时淘汰最久未使用的条目。
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024, max_entries: int = 2000):
+        self._entries: "OrderedDict[Tuple, Tuple[int, Tuple]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+    def configure(self, max_bytes: Optional[int] = None, max_entries: Optional[int] = None) -> None:
+        """调整上限（未传入的参数保持不变），超出新上限的条目立即淘汰"""
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max(0, int(max_bytes))
+            if max_entries is not None:
+                self.max_entries = max(1, int(max_entries))
+            self._evict()
+
+    def _evict(self) -> None:
+        """淘汰最久未使用的条目直到满足上限（调用方持有锁）"""
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            _, (size, _) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+
+    def _get(self, key: Tuple) -> Optional[Tuple]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _put(self, key: Tuple, value: Tuple) -> None:
+        # 在锁外估算大小，大对象的遍历不阻塞其他读取
+        size = estimate_size(value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[0]
+            if size > self.max_bytes:
+                # 单个条目超过总上限，不缓存
+                return
+            self._entries[key] = (size, value)
+            self._total_bytes += size
+            self._evict()
+
+    def parse(self, file_path: Path, mtime: float, size: int, parse_func) -> Tuple[Dict, Dict]:
+        """解析单个文件，(路径, mtime, size) 未变化时直接返回缓存"""
+        key = ("file", str(file_path))
+        entry = self._get(key)
+        if entry and entry[0] == mtime and entry[1] == size:
+            return entry[2]
+
+        parsed = parse_func(file_path)
+        self._put(key, (mtime, size, parsed))
+        return parsed
+
+    def merge_day(
+        self,
+        day_key: Tuple,
+        signatures: List[Tuple[Path, float, int]],
+        platform_ids: Optional[List[str]],
+        parse_func
+    ) -> Tuple[Dict, Dict, Dict]:
+        """
+        合并一天的快照文件
+
+        已合并的文件签名是当前签名的前缀时（通常是只新增了文件），只合并新增部分；
+        否则从头合并（未变化的文件直接使用解析缓存）。
+        """
+        previous = self._get(("day", day_key))
+
+        if previous and signatures[:len(previous[0])] == previous[0]:
+            merged_signatures, all_titles, id_to_name, all_timestamps = previous
+            pending = signatures[len(merged_signatures):]
+            if not pending:
+                return all_titles, id_to_name, all_timestamps
+            # 写时复制：已返回给调用方（或已放入 TTL 缓存）的结果不被修改
+            all_titles = {platform_id: dict(titles) for platform_id, titles in all_titles.items()}
+            id_to_name = dict(id_to_name)
+            all_timestamps = dict(all_timestamps)
+        else:
+            pending = signatures
+            all_titles, id_to_name, all_timestamps = {}, {}, {}
+
+        for txt_file, mtime, size in pending:
+            try:
+                titles_by_id, file_id_to_name = self.parse(txt_file, mtime, size, parse_func)
+
+                # 更新id_to_name
+                id_to_name.update(file_id_to_name)
+
+                # 合并标题数据
+                for platform_id, titles in titles_by_id.items():
+                    # 如果指定了平台过滤
+                    if platform_ids and platform_id not in platform_ids:
+                        continue
+
+                    platform_titles = all_titles.setdefault(platform_id, {})
+                    for title, info in titles.items():
+                        existing = platform_titles.get(title)
+                        if existing:
+                            # 合并排名
+                            platform_titles[title] = dict(existing, ranks=existing["ranks"] + info["ranks"])
+                        else:
+                            platform_titles[title] = dict(info, ranks=list(info["ranks"]))
+
+                # 记录文件时间戳
+                all_timestamps[txt_file.name] = mtime
+
+            except Exception as e:
+                # 忽略单个文件的解析错误，继续处理其他文件
+                print(f"Warning: 解析文件 {txt_file} 失败: {e}")
+                continue
+
+        self._put(("day", day_key), (signatures, all_titles, id_to_name, all_timestamps))
+
+        return all_titles, id_to_name, all_timestamps
+
+
+_txt_snapshot_cache = _TxtSnapshotCache()
+
+
+def configure_txt_snapshot_cache(cache_config: Optional[Dict] = None) -> None:
+    """
+    按 config.yaml 中 mcp.cache.txt_snapshot 配置节调整 txt 快照解析缓存
+
+    Args:
+        cache_config: 配置节（max_memory_mb / max_entries）
+    """
+    cache_config = cache_config or {}
+    max_memory_mb = cache_config.get("max_memory_mb")
+    _txt_snapshot_cache.configure(
+        max_bytes=int(max_memory_mb * 1024 * 1024) if max_memory_mb is not None else None,
+        max_entries=cache_config.get("max_entries"),
+    )
+
+
+class _ClosedDayCache:
+    """已结束日期的完整读取结果的磁盘缓存（pickle，文件头为格式标识与版本号）"""
+
+    MAGIC = b"TRDAY"
+    VERSION = 1
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+
+    def _path(self, date_folder: str) -> Path:
+        return self.cache_dir / f"{date_folder}.pkl"
+
+    def load(self, date_folder: str, signature: Tuple) -> Optional[Tuple[Dict, Dict, Dict]]:
+        """签名一致时返回缓存的 (all_titles, id_to_name, all_timestamps)，否则返回 None"""
+        path = self._path(date_folder)
+        try:
+            with open(path, "rb") as f:
+                header = f.read(len(self.MAGIC) + 2)
+                if header[:len(self.MAGIC)] != self.MAGIC:
+                    return None
+                if struct.unpack(">H", header[len(self.MAGIC):])[0] != self.VERSION:
+                    return None
+                payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Warning: 读取缓存 {path} 失败: {e}")
+            return None
+
+        if payload.get("signature") != signature:
+            return None
+        return payload["result"]
+
+    def save(self, date_folder: str, signature: Tuple, result: Tuple[Dict, Dict, Dict]):
+        path = self._path(date_folder)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(self.MAGIC + struct.pack(">H", self.VERSION))
+                pickle.dump({"signature": signature, "result": result}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # 缓存写入失败（如只读目录）不影响查询
+            print(f"Warning: 写入缓存 {path} 失败: {e}")
+            tmp_path.unlink(missing_ok=True)
 
 
 class ParserService:
@@ -34,6 +235,7 @@ class ParserService:
 
         # 初始化缓存服务
         self.cache = get_cache()
+        self._snapshot_store = None
 
     @staticmethod
     def clean_title(title: str) -> str:
@@ -70,79 +272,30 @@ class ParserService:
         if not file_path.exists():
             raise FileParseError(str(file_path), "文件不存在")
 
-        titles_by_id = {}
-        id_to_name = {}
-
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                sections = content.split("\n\n")
-
-                for section in sections:
-                    if not section.strip() or "==== 以下ID请求失败 ====" in section:
-                        continue
-
-                    lines = section.strip().split("\n")
-                    if len(lines) < 2:
-                        continue
-
-                    # 解析header: id | name 或 id
-                    header_line = lines[0].strip()
-                    if " | " in header_line:
-                        parts = header_line.split(" | ", 1)
-                        source_id = parts[0].strip()
-                        name = parts[1].strip()
-                        id_to_name[source_id] = name
-                    else:
-                        source_id = header_line
-                        id_to_name[source_id] = source_id
-
-                    titles_by_id[source_id] = {}
-
-                    # 解析标题行
-                    for line in lines[1:]:
-                        if line.strip():
-                            try:
-                                title_part = line.strip()
-                                rank = None
-
-                                # 提取排名
-                                if ". " in title_part and title_part.split(". ")[0].isdigit():
-                                    rank_str, title_part = title_part.split(". ", 1)
-                                    rank = int(rank_str)
-
-                                # 提取 MOBILE URL
-                                mobile_url = ""
-                                if " [MOBILE:" in title_part:
-                                    title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
-                                    if mobile_part.endswith("]"):
-                                        mobile_url = mobile_part[:-1]
-
-                                # 提取 URL
-                                url = ""
-                                if " [URL:" in title_part:
-                                    title_part, url_part = title_part.rsplit(" [URL:", 1)
-                                    if url_part.endswith("]"):
-                                        url = url_part[:-1]
-
-                                title = self.clean_title(title_part.strip())
-                                ranks = [rank] if rank is not None else [1]
-
-                                titles_by_id[source_id][title] = {
-                                    "ranks": ranks,
-                                    "url": url,
-                                    "mobileUrl": mobile_url,
-                                }
-
-                            except Exception as e:
-                                # 忽略单行解析错误
-                                continue
-
+            titles_by_id, id_to_name, _ = read_snapshot(str(file_path))
         except Exception as e:
             raise FileParseError(str(file_path), str(e))
 
         return titles_by_id, id_to_name
 
+    def get_snapshot_store(self) -> Optional[SnapshotStore]:
+        """
+        获取 SQLite 快照存储（按 config.yaml 的 storage 配置），未启用时返回 None
+        """
+        if self._snapshot_store is None:
+            try:
+                storage = self.parse_yaml_config().get("storage") or {}
+            except FileParseError:
+                storage = {}
+            if not storage.get("sqlite_enabled", True):
+                self._snapshot_store = False
+            else:
+                self._snapshot_store = SnapshotStore(
+                    str(self.project_root / storage.get("db_path", DEFAULT_DB_PATH))
+                )
+        return self._snapshot_store or None
+
     def get_date_folder_name(self, date: datetime = None) -> str:
         """
         获取日期文件夹名称
@@ -183,81 +336,360 @@ class ParserService:
         platform_key = ','.join(sorted(platform_ids)) if platform_ids else 'all'
         cache_key = f"read_all_titles:{date_str}:{platform_key}"
 
-        # 尝试从缓存获取
-        # 对于历史数据（非今天），使用更长的缓存时间（1小时）
-        # 对于今天的数据，使用较短的缓存时间（15分钟），因为可能有新数据
+        # 尝试从缓存获取：缓存按该日期的数据版本失效，新快照写入后立即重新读取
         is_today = (date is None) or (date.date() == datetime.now().date())
-        ttl = 900 if is_today else 3600  # 15分钟 vs 1小时
+        version = self.get_data_version(date)
 
-        cached = self.cache.get(cache_key, ttl=ttl)
+        cached = self.cache.get(cache_key, version=version)
         if cached:
             return cached
 
-        # 缓存未命中，读取文件
+        # 缓存未命中，优先读取 SQLite，数据库中没有该日期时回退到 txt 快照
         date_folder = self.get_date_folder_name(date)
         txt_dir = self.project_root / "output" / date_folder / "txt"
 
-        if not txt_dir.exists():
+        # 已结束的日期不再变化，完整结果持久化到磁盘，重启或缓存过期后直接加载
+        day_cache = None
+        signature = None
+        if not is_today:
+            day_cache = _ClosedDayCache(self.project_root / "output" / ".cache" / "days")
+            signature = self._day_signature(date, txt_dir)
+            loaded = day_cache.load(date_folder, signature) if signature else None
+            if loaded is not None:
+                result = self._filter_platforms(loaded, platform_ids)
+                self.cache.set(cache_key, result, ttl=NEVER_EXPIRE, version=version)
+                return result
+
+        # 历史日期读取全部平台写入磁盘缓存，返回前再按平台过滤
+        read_platforms = platform_ids if day_cache is None else None
+        stored = self._read_titles_from_store(date or datetime.now(), txt_dir, read_platforms)
+        if stored is not None:
+            all_titles, id_to_name, all_timestamps = stored
+        else:
+            all_titles, id_to_name, all_timestamps = self._read_titles_from_txt(txt_dir, date_folder, read_platforms)
+
+        if day_cache is not None and all_titles:
+            # 导入数据库后签名可能变化（仅有 txt 的日期不受影响），以读取后的状态为准
+            signature = self._day_signature(date, txt_dir)
+            if signature:
+                day_cache.save(date_folder, signature, (all_titles, id_to_name, all_timestamps))
+            all_titles, id_to_name, all_timestamps = self._filter_platforms(
+                (all_titles, id_to_name, all_timestamps), platform_ids
+            )
+
+        if not all_titles:
             raise DataNotFoundError(
-                f"未找到 {date_folder} 的数据目录",
-                suggestion="请先运行爬虫或检查日期是否正确"
+                f"{date_folder} 没有有效的数据",
+                suggestion="请检查数据文件格式或重新运行爬虫"
             )
 
-        all_titles = {}
-        id_to_name = {}
-        all_timestamps = {}
+        # 缓存结果
+        result = (all_titles, id_to_name, all_timestamps)
+        self.cache.set(cache_key, result, ttl=NEVER_EXPIRE, version=self.settle_data_version(date, version))
 
-        # 读取所有txt文件
-        txt_files = sorted(txt_dir.glob("*.txt"))
+        return result
 
-        if not txt_files:
+    def read_titles_in_window(
+        self,
+        date: datetime = None,
+        platform_ids: Optional[List[str]] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        since: Optional[float] = None,
+        latest_only: bool = False
+    ) -> Tuple[Dict, Dict, Dict]:
+        """
+        只读取指定日期中部分快照的标题（最新一批 / 时间段 / 最近 N 小时）
+
+        Args:
+            date: 日期对象，默认为今天
+            platform_ids: 平台ID列表，None表示所有平台
+            start_time: 开始时间 "HH:MM"（包含）
+            end_time: 结束时间 "HH:MM"（包含）
+            since: 只读取抓取时间不早于该 Unix 时间戳的快照
+            latest_only: 只读取最新一批（最新的一个快照）
+
+        Returns:
+            (all_titles, id_to_name, all_timestamps) 元组，格式同 read_all_titles_for_date，
+            ranks 与 all_timestamps 只包含选中的快照
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        date_folder = self.get_date_folder_name(date)
+        platform_key = ','.join(sorted(platform_ids)) if platform_ids else 'all'
+        cache_key = f"read_window:{date_folder}:{platform_key}:{start_time}:{end_time}:{since}:{latest_only}"
+        version = self.get_data_version(date)
+        cached = self.cache.get(cache_key, version=version)
+        if cached:
+            return cached
+
+        txt_dir = self.project_root / "output" / date_folder / "txt"
+        result = None
+        if self.ensure_in_store(date or datetime.now(), txt_dir):
+            try:
+                store = self.get_snapshot_store()
+                snapshots = store.find_snapshots(
+                    date or datetime.now(), start_time, end_time, since, latest_only, platform_ids
+                )
+                result = store.read_titles_for_snapshots(snapshots, platform_ids)
+            except sqlite3.Error as e:
+                print(f"Warning: 读取数据库失败，改为读取 txt 快照: {e}")
+
+        if result is None:
+            result = self._read_txt_window(
+                txt_dir, date_folder, platform_ids, start_time, end_time, since, latest_only
+            )
+
+        if not result[0]:
             raise DataNotFoundError(
-                f"{date_folder} 没有数据文件",
-                suggestion="请等待爬虫任务完成"
+                f"{date_folder} 在指定时间范围内没有数据",
+                suggestion="请扩大时间范围或确认爬虫在该时间段内运行过"
             )
 
-        for txt_file in txt_files:
+        # 按时间戳筛选（最近 N 小时）时每次查询的键都不同，只做短时缓存
+        self.cache.set(
+            cache_key, result,
+            ttl=None if since is not None else NEVER_EXPIRE,
+            version=self.settle_data_version(date, version)
+        )
+        return result
+
+    def get_data_version(self, date: datetime = None) -> Tuple:
+        """
+        指定日期数据的版本，新快照写入（或覆盖）后变化，用于缓存失效
+
+        由 txt 目录的修改时间、最新快照文件的 (文件名, mtime, 大小) 与数据库中该日期的快照清单组成；
+        同一分钟内再次抓取会覆盖最新的快照文件而不改变目录修改时间，因此单独检查最新文件。
+
+        Args:
+            date: 日期对象，默认为今天
+        """
+        txt_dir = self.project_root / "output" / self.get_date_folder_name(date) / "txt"
+        txt_version = None
+        try:
+            with os.scandir(txt_dir) as entries:
+                latest = max((entry for entry in entries if entry.name.endswith(".txt")),
+                             key=lambda entry: entry.name, default=None)
+                latest_stat = latest.stat() if latest is not None else None
+            txt_version = (
+                txt_dir.stat().st_mtime_ns,
+                latest.name if latest is not None else None,
+                latest_stat.st_mtime_ns if latest_stat else None,
+                latest_stat.st_size if latest_stat else None,
+            )
+        except OSError:
+            pass
+
+        db_version = None
+        store = self.get_snapshot_store()
+        if store is not None:
             try:
-                titles_by_id, file_id_to_name = self.parse_txt_file(txt_file)
+                db_version = store.get_date_version(date or datetime.now())
+            except sqlite3.Error:
+                pass
+        return txt_version, db_version
 
-                # 更新id_to_name
-                id_to_name.update(file_id_to_name)
+    def settle_data_version(self, date: Optional[datetime], version: Tuple) -> Tuple:
+        """
+        读取完成后写入缓存时使用的数据版本
 
-                # 合并标题数据
-                for platform_id, titles in titles_by_id.items():
-                    # 如果指定了平台过滤
-                    if platform_ids and platform_id not in platform_ids:
-                        continue
+        读取时把 txt 快照导入数据库会改变版本中数据库的部分：txt 部分未变时以读取后的版本为准，
+        否则（读取期间有新快照写入）保留读取前的版本，下次查询时重新读取。
 
-                    if platform_id not in all_titles:
-                        all_titles[platform_id] = {}
+        Args:
+            date: 日期对象，None 表示今天
+            version: 读取前的 get_data_version 结果
+        """
+        current = self.get_data_version(date)
+        if version[0] is not None and current[0] == version[0]:
+            return current
+        return version
 
-                    for title, info in titles.items():
-                        if title in all_titles[platform_id]:
-                            # 合并排名
-                            all_titles[platform_id][title]["ranks"].extend(info["ranks"])
-                        else:
-                            all_titles[platform_id][title] = info.copy()
+    def read_txt_snapshots(self, date: datetime) -> List[Tuple[str, Dict]]:
+        """
+        逐个读取指定日期的 txt 快照（使用单文件解析缓存）
 
-                # 记录文件时间戳
-                all_timestamps[txt_file.name] = txt_file.stat().st_mtime
+        Returns:
+            [(快照名称, titles_by_id)]，按时间顺序排列；没有数据目录时返回空列表
+        """
+        txt_dir = self.project_root / "output" / self.get_date_folder_name(date) / "txt"
+        if not txt_dir.exists():
+            return []
 
+        snapshots = []
+        for txt_file in sorted(txt_dir.glob("*.txt")):
+            try:
+                stat = txt_file.stat()
+                titles_by_id, _ = _txt_snapshot_cache.parse(txt_file, stat.st_mtime, stat.st_size, self.parse_txt_file)
             except Exception as e:
-                # 忽略单个文件的解析错误，继续处理其他文件
                 print(f"Warning: 解析文件 {txt_file} 失败: {e}")
                 continue
+            snapshots.append((txt_file.name, titles_by_id))
+        return snapshots
 
-        if not all_titles:
+    def _read_txt_window(
+        self,
+        txt_dir: Path,
+        date_folder: str,
+        platform_ids: Optional[List[str]],
+        start_time: Optional[str],
+        end_time: Optional[str],
+        since: Optional[float],
+        latest_only: bool
+    ) -> Tuple[Dict, Dict, Dict]:
+        """按文件名（快照时间）与修改时间选出 txt 快照后合并"""
+        if not txt_dir.exists():
             raise DataNotFoundError(
-                f"{date_folder} 没有有效的数据",
-                suggestion="请检查数据文件格式或重新运行爬虫"
+                f"未找到 {date_folder} 的数据目录",
+                suggestion="请先运行爬虫或检查日期是否正确"
             )
 
-        # 缓存结果
-        result = (all_titles, id_to_name, all_timestamps)
-        self.cache.set(cache_key, result)
+        lower, upper = label_bounds(start_time, end_time)
+        signatures = []
+        for txt_file in sorted(txt_dir.glob("*.txt")):
+            if (lower and txt_file.name < lower) or (upper and txt_file.name >= upper):
+                continue
+            try:
+                stat = txt_file.stat()
+            except OSError:
+                continue
+            if since is not None and stat.st_mtime < since:
+                continue
+            signatures.append((txt_file, stat.st_mtime, stat.st_size))
+
+        if latest_only:
+            # 最新一批：从最新的文件往前找第一个包含所需平台数据的快照
+            for signature in reversed(signatures):
+                titles_by_id, _ = _txt_snapshot_cache.parse(*signature, self.parse_txt_file)
+                if any(not platform_ids or platform_id in platform_ids for platform_id in titles_by_id):
+                    signatures = [signature]
+                    break
+            else:
+                signatures = []
+
+        window_key = (str(txt_dir), ",".join(sorted(platform_ids)) if platform_ids else "all",
+                      start_time, end_time, since, latest_only)
+        return _txt_snapshot_cache.merge_day(window_key, signatures, platform_ids, self.parse_txt_file)
+
+    def _day_signature(self, date: datetime, txt_dir: Path) -> Optional[Tuple]:
+        """
+        日期数据源的签名：txt 快照的 (文件名, mtime, size) 列表；
+        没有 txt 目录时（仅写入数据库）使用数据库中的快照列表
+        """
+        if txt_dir.exists():
+            signature = []
+            for txt_file in sorted(txt_dir.glob("*.txt")):
+                try:
+                    stat = txt_file.stat()
+                except OSError:
+                    continue
+                signature.append((txt_file.name, stat.st_mtime, stat.st_size))
+            return ("txt", tuple(signature)) if signature else None
+
+        store = self.get_snapshot_store()
+        if store is None:
+            return None
+        try:
+            labels = store.get_snapshot_labels(date)
+        except sqlite3.Error:
+            return None
+        return ("db", tuple(sorted(labels.items()))) if labels else None
 
-        return result
+    @staticmethod
+    def _filter_platforms(result: Tuple[Dict, Dict, Dict], platform_ids: Optional[List[str]]) -> Tuple[Dict, Dict, Dict]:
+        all_titles, id_to_name, all_timestamps = result
+        if platform_ids:
+            all_titles = {
+                platform_id: titles
+                for platform_id, titles in all_titles.items()
+                if platform_id in platform_ids
+            }
+        return all_titles, id_to_name, all_timestamps
+
+    def _read_titles_from_store(
+        self,
+        date: datetime,
+        txt_dir: Path,
+        platform_ids: Optional[List[str]]
+    ) -> Optional[Tuple[Dict, Dict, Dict]]:
+        """
+        从 SQLite 读取指定日期的标题，数据库中没有该日期时返回 None
+
+        txt 目录中尚未入库的快照（如旧版本或仅导出 txt 时写入的文件）会先导入数据库。
+        """
+        if not self.ensure_in_store(date, txt_dir):
+            return None
+
+        try:
+            return self.get_snapshot_store().read_titles_for_date(date, platform_ids)
+        except sqlite3.Error as e:
+            print(f"Warning: 读取数据库失败，改为读取 txt 快照: {e}")
+            return None
+
+    def ensure_in_store(self, date: datetime, txt_dir: Optional[Path] = None) -> bool:
+        """
+        把指定日期尚未入库的 txt 快照导入数据库，返回该日期能否从数据库查询
+
+        Args:
+            date: 日期对象
+            txt_dir: txt 快照目录，默认为 output/<日期>/txt
+        """
+        store = self.get_snapshot_store()
+        if store is None:
+            return False
+
+        if txt_dir is None:
+            txt_dir = self.project_root / "output" / self.get_date_folder_name(date) / "txt"
+        try:
+            if txt_dir.exists():
+                store.sync_txt_dir(txt_dir, date)
+        except (sqlite3.Error, OSError) as e:
+            # 数据库只读或被占用时不影响查询，直接读取已入库的数据
+            print(f"Warning: 导入 {txt_dir} 到数据库失败: {e}")
+
+        try:
+            return store.has_date(date)
+        except sqlite3.Error:
+            return False
+
+    def _read_titles_from_txt(
+        self,
+        txt_dir: Path,
+        date_folder: str,
+        platform_ids: Optional[List[str]]
+    ) -> Tuple[Dict, Dict, Dict]:
+        """
+        解析 txt 快照并合并排名
+
+        单个文件的解析结果按 (路径, mtime, size) 缓存；当天的合并结果在上次的基础上
+        只合并新增的文件，已合并的文件有变化时才用文件缓存重新合并。
+        """
+        if not txt_dir.exists():
+            raise DataNotFoundError(
+                f"未找到 {date_folder} 的数据目录",
+                suggestion="请先运行爬虫或检查日期是否正确"
+            )
+
+        # 读取所有txt文件
+        txt_files = sorted(txt_dir.glob("*.txt"))
+
+        if not txt_files:
+            raise DataNotFoundError(
+                f"{date_folder} 没有数据文件",
+                suggestion="请等待爬虫任务完成"
+            )
+
+        signatures = []
+        for txt_file in txt_files:
+            try:
+                stat = txt_file.stat()
+            except OSError:
+                continue
+            signatures.append((txt_file, stat.st_mtime, stat.st_size))
+
+        day_key = (str(txt_dir), ",".join(sorted(platform_ids)) if platform_ids else "all")
+        return _txt_snapshot_cache.merge_day(day_key, signatures, platform_ids, self.parse_txt_file)
 
     def parse_yaml_config(self, config_path: str = None) -> dict:
         """
@@ -287,15 +719,15 @@ class ParserService:
         except Exception as e:
             raise FileParseError(str(config_path), str(e))
 
-    def parse_frequency_words(self, words_file: str = None) -> List[Dict]:
+    def get_frequency_rules(self, words_file: str = None) -> FrequencyRules:
         """
-        解析关键词配置文件
+        读取关键词配置（与 main.py 共用解析与匹配规则，按文件修改时间缓存）
 
         Args:
             words_file: 关键词文件路径，默认为 config/frequency_words.txt
 
         Returns:
-            词组列表
+            编译好的频率词规则；文件不存在时返回空规则
 
         Raises:
             FileParseError: 文件解析错误
@@ -306,50 +738,24 @@ class ParserService:
             words_file = Path(words_file)
 
         if not words_file.exists():
-            return []
-
-        word_groups = []
+            return FrequencyRules([], [])
 
         try:
-            with open(words_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
+            return load_frequency_rules(str(words_file))
+        except Exception as e:
+            raise FileParseError(str(words_file), str(e))
 
-                    # 使用 | 分隔符
-                    parts = [p.strip() for p in line.split("|")]
-                    if not parts:
-                        continue
+    def parse_frequency_words(self, words_file: str = None) -> List[Dict]:
+        """
+        解析关键词配置文件
 
-                    group = {
-                        "required": [],
-                        "normal": [],
-                        "filter_words": []
-                    }
-
-                    for part in parts:
-                        if not part:
-                            continue
-
-                        words = [w.strip() for w in part.split(",")]
-                        for word in words:
-                            if not word:
-                                continue
-                            if word.endswith("+"):
-                                # 必须词
-                                group["required"].append(word[:-1])
-                            elif word.endswith("!"):
-                                # 过滤词
-                                group["filter_words"].append(word[:-1])
-                            else:
-                                # 普通词
-                                group["normal"].append(word)
-
-                    if group["required"] or group["normal"]:
-                        word_groups.append(group)
+        Args:
+            words_file: 关键词文件路径，默认为 config/frequency_words.txt
 
-        except Exception as e:
-            raise FileParseError(str(words_file), str(e))
+        Returns:
+            词组列表，每项包含 required / normal / group_key
 
-        return word_groups
+        Raises:
+            FileParseError: 文件解析错误
+        """
+        return self.get_frequency_rules(words_file).word_groups
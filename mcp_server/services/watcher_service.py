@@ -0,0 +1,217 @@
+"""
+快照监听服务
+
+爬虫（cron 或 trigger_crawl）写入新快照后，当天第一次查询需要重新解析合并数据。
+这里在后台线程中监听 output/<日期>/txt，数据版本变化时调用预热函数，提前导入新快照并刷新缓存。
+Linux 下通过 inotify（ctypes 调用 libc）及时唤醒，其他平台或 inotify 不可用时按固定间隔轮询。
+数据库文件（及 -wal/-shm/-journal）的事件不作为唤醒条件：查询本身打开连接就会触发这些事件；
+只写数据库、不导出 txt 的抓取由定时检查（数据库中的快照清单版本）发现。
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from .parser_service import ParserService
+
+
+# inotify 事件掩码（见 <sys/inotify.h>）
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+_DIR_EVENTS = IN_CREATE | IN_MOVED_TO | IN_CLOSE_WRITE
+
+# struct inotify_event 的固定部分：wd, mask, cookie, len（其后为 len 字节的文件名）
+_EVENT_HEADER = struct.Struct("iIII")
+
+# SQLite 在打开/关闭连接时创建、删除的文件
+_SQLITE_SUFFIXES = ("-wal", "-shm", "-journal")
+
+
+class _Inotify:
+    """最小化的 inotify 封装：只读取事件涉及的文件名"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        # 非 Linux 平台没有这些符号，抛出 AttributeError
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    def add_watch(self, path: Path, mask: int) -> bool:
+        """添加监听（已监听的路径重复添加无副作用），目录不存在时返回 False"""
+        return self._add_watch(self.fd, os.fsencode(str(path)), mask) >= 0
+
+    def wait(self, timeout: float) -> List[str]:
+        """等待事件并读取队列中所有事件的文件名，超时返回空列表"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        return self.drain()
+
+    def drain(self) -> List[str]:
+        """读取队列中已有的事件（不阻塞），返回文件名列表"""
+        names = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return names
+            if not data:
+                return names
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                _, _, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                names.append(os.fsdecode(data[offset:offset + name_len].rstrip(b"\0")))
+                offset += name_len
+
+    def close(self):
+        os.close(self.fd)
+
+
+class SnapshotWatcher:
+    """新快照监听器"""
+
+    def __init__(
+        self,
+        parser: ParserService,
+        on_change: Callable[[], None],
+        poll_interval: float = 30,
+        debounce: float = 2,
+        use_inotify: bool = True,
+    ):
+        """
+        初始化监听器
+
+        Args:
+            parser: 解析服务（提供数据目录与当天的数据版本）
+            on_change: 数据版本变化时调用的预热函数（在监听线程中执行）
+            poll_interval: 轮询间隔（秒）；使用 inotify 时作为兜底检查间隔
+            debounce: 收到事件后等待写入完成的时间（秒），期间的事件合并处理
+            use_inotify: 是否尝试使用 inotify
+        """
+        self.parser = parser
+        self.on_change = on_change
+        self.poll_interval = max(1.0, float(poll_interval))
+        self.debounce = max(0.0, float(debounce))
+        self.use_inotify = use_inotify
+        self.mode: Optional[str] = None
+        self.refresh_count = 0
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[_Inotify] = None
+        self._version = None
+
+    def _watch_paths(self) -> List[Path]:
+        """需要监听的目录：output（新日期目录）、当天目录（txt 目录）与 txt 目录（新快照）"""
+        output_dir = self.parser.project_root / "output"
+        date_dir = output_dir / self.parser.get_date_folder_name(datetime.now())
+        return [output_dir, date_dir, date_dir / "txt"]
+
+    def _add_watches(self):
+        # 日期目录与 txt 目录在当天第一次抓取时才创建，每次等待前重新添加
+        for path in self._watch_paths():
+            self._inotify.add_watch(path, _DIR_EVENTS)
+
+    def _is_relevant(self, names: List[str]) -> bool:
+        """事件中是否有可能是新快照的文件（忽略数据库文件：任何查询都会触发）"""
+        store = self.parser.get_snapshot_store()
+        db_name = store.db_path.name if store is not None else None
+        return any(
+            name and name != db_name and not name.endswith(_SQLITE_SUFFIXES)
+            for name in names
+        )
+
+    def start(self) -> "SnapshotWatcher":
+        """启动后台监听线程"""
+        if self._thread is not None:
+            return self
+        if self.use_inotify:
+            try:
+                self._inotify = _Inotify()
+                self.mode = "inotify"
+            except (OSError, AttributeError) as e:
+                print(f"Warning: inotify 不可用，改为每 {self.poll_interval:g} 秒轮询: {e}")
+        if self._inotify is None:
+            self.mode = "polling"
+
+        self._thread = threading.Thread(target=self._run, name="snapshot-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """停止监听"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _wait(self) -> bool:
+        """等待下一次检查，收到停止信号时返回 False"""
+        if self._inotify is None:
+            return not self._stop.wait(self.poll_interval)
+
+        deadline = time.monotonic() + self.poll_interval
+        while not self._stop.is_set():
+            self._add_watches()
+            # 分段等待，以便及时响应停止信号
+            names = self._inotify.wait(min(1.0, max(0.0, deadline - time.monotonic())))
+            if self._is_relevant(names):
+                # 一次抓取会连续写入多个文件，等写入完成后再检查
+                if self._stop.wait(self.debounce):
+                    return False
+                self._inotify.drain()
+                return True
+            if time.monotonic() >= deadline:
+                return True
+        return False
+
+    def _run(self):
+        if self._inotify is not None:
+            # 先添加监听再做首次检查，检查期间写入的快照不会被漏掉
+            self._add_watches()
+        self.check()
+        while self._wait():
+            self.check()
+
+    def check(self) -> bool:
+        """
+        检查当天的数据版本，变化时调用预热函数
+
+        Returns:
+            是否执行了预热
+        """
+        try:
+            version = self.parser.get_data_version()
+        except Exception as e:
+            print(f"Warning: 检查数据版本失败: {e}")
+            return False
+        if version == self._version:
+            return False
+
+        try:
+            self.on_change()
+        except Exception as e:
+            print(f"Warning: 预热缓存失败: {e}")
+        # 预热时导入 txt 快照会改变数据库部分的版本，以预热后的版本为准，避免重复预热
+        self._version = self.parser.settle_data_version(None, version)
+        self.refresh_count += 1
+        return True
@@ -7,9 +7,11 @@
 import re
 from collections import Counter, defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from difflib import SequenceMatcher
 
+from trendradar.weight import WeightScorer
+
 from ..services.data_service import DataService
 from ..utils.validators import (
     validate_platforms,
@@ -21,57 +23,22 @@ from ..utils.validators import (
 from ..utils.errors import MCPError, InvalidParameterError, DataNotFoundError
 
 
-def calculate_news_weight(news_data: Dict, rank_threshold: int = 5) -> float:
+def calculate_news_weight(news_data: Dict, rank_threshold: int = 5, scorer: Optional[WeightScorer] = None) -> float:
     """
-    计算新闻权重（用于排序）
-
-    基于 main.py 的权重算法实现，综合考虑：
-    - 排名权重 (60%)：新闻在榜单中的排名
-    - 频次权重 (30%)：新闻出现的次数
-    - 热度权重 (10%)：高排名出现的比例
+    计算单条新闻的权重（与 main.py 报告排序使用同一套算法，见 trendradar.weight）
 
     Args:
         news_data: 新闻数据字典，包含 ranks 和 count 字段
-        rank_threshold: 高排名阈值，默认5
+        rank_threshold: 高排名阈值，默认5（传入 scorer 时以 scorer 为准）
+        scorer: 按 config.yaml 创建的权重计算器，默认使用默认权重
 
     Returns:
         权重分数（0-100之间的浮点数）
-    """
-    ranks = news_data.get("ranks", [])
-    if not ranks:
-        return 0.0
-
-    count = news_data.get("count", len(ranks))
-
-    # 权重配置（与 config.yaml 保持一致）
-    RANK_WEIGHT = 0.6
-    FREQUENCY_WEIGHT = 0.3
-    HOTNESS_WEIGHT = 0.1
-
-    # 1. 排名权重：Σ(11 - min(rank, 10)) / 出现次数
-    rank_scores = []
-    for rank in ranks:
-        score = 11 - min(rank, 10)
-        rank_scores.append(score)
-
-    rank_weight = sum(rank_scores) / len(ranks) if ranks else 0
 
-    # 2. 频次权重：min(出现次数, 10) × 10
-    frequency_weight = min(count, 10) * 10
-
-    # 3. 热度加成：高排名次数 / 总出现次数 × 100
-    high_rank_count = sum(1 for rank in ranks if rank <= rank_threshold)
-    hotness_ratio = high_rank_count / len(ranks) if ranks else 0
-    hotness_weight = hotness_ratio * 100
-
-    # 综合权重
-    total_weight = (
-        rank_weight * RANK_WEIGHT
-        + frequency_weight * FREQUENCY_WEIGHT
-        + hotness_weight * HOTNESS_WEIGHT
-    )
-
-    return total_weight
+    批量排序请直接使用 DataService.get_weight_scorer().sort(news_list)。
+    """
+    scorer = scorer or WeightScorer(rank_threshold=rank_threshold)
+    return float(scorer.score([news_data])[0])
 
 
 class AnalyticsTools:
@@ -177,7 +144,7 @@ class AnalyticsTools:
             date_range: 日期范围（trend和lifecycle模式），可选
                        - **格式**: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
                        - **默认**: 不指定时默认分析最近7天
-            granularity: 时间粒度（trend模式），默认"day"（hour/day）
+            granularity: 时间粒度（trend和lifecycle模式），默认"day"（day/hour/snapshot）
             threshold: 热度突增倍数阈值（viral模式），默认3.0
             time_window: 检测时间窗口小时数（viral模式），默认24
             lookahead_hours: 预测未来小时数（predict模式），默认6
@@ -212,7 +179,8 @@ class AnalyticsTools:
             elif analysis_type == "lifecycle":
                 return self.analyze_topic_lifecycle(
                     topic=topic,
-                    date_range=date_range
+                    date_range=date_range,
+                    granularity=granularity
                 )
             elif analysis_type == "viral":
                 # viral模式不需要topic参数，使用通用检测
@@ -255,7 +223,11 @@ class AnalyticsTools:
             date_range: 日期范围（可选）
                        - **格式**: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
                        - **默认**: 不指定时默认分析最近7天
-            granularity: 时间粒度，仅支持 day（天）
+            granularity: 时间粒度，默认 day
+                       - **day**: 按天统计
+                       - **hour**: 按小时统计（有抓取数据的小时）
+                       - **snapshot**: 按每次抓取的快照统计
+                       - hour/snapshot 不指定 date_range 时默认只分析今天
 
         Returns:
             趋势分析结果字典
@@ -282,34 +254,33 @@ class AnalyticsTools:
             ...     date_range={"start": "2024-12-01", "end": "2024-12-31"},
             ...     granularity="day"
             ... )
+            >>> # 观察今天每小时的热度变化
+            >>> result = tools.get_topic_trend_analysis(
+            ...     topic="台风",
+            ...     granularity="hour"
+            ... )
             >>> print(result['trend_data'])
         """
         try:
             # 验证参数
             topic = validate_keyword(topic)
-
-            # 验证粒度参数（只支持day）
-            if granularity != "day":
-                from ..utils.errors import InvalidParameterError
-                raise InvalidParameterError(
-                    f"不支持的粒度参数: {granularity}",
-                    suggestion="当前仅支持 'day' 粒度，因为底层数据按天聚合"
-                )
-
-            # 处理日期范围（不指定时默认最近7天）
-            if date_range:
-                from ..utils.validators import validate_date_range
-                date_range_tuple = validate_date_range(date_range)
-                start_date, end_date = date_range_tuple
-            else:
-                # 默认最近7天
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=6)
+            start_date, end_date = self._resolve_topic_range(date_range, granularity)
 
             # 收集趋势数据
             trend_data = []
             current_date = start_date
 
+            if granularity != "day":
+                # 小时 / 快照粒度：直接查时间分桶索引
+                for bucket in self.data_service.get_topic_mentions(topic, start_date, end_date, granularity):
+                    trend_data.append({
+                        "date": bucket["date"],
+                        "time": bucket["time"],
+                        "count": bucket["count"],
+                        "sample_titles": bucket["titles"][:3]
+                    })
+                current_date = end_date + timedelta(days=1)
+
             while current_date <= end_date:
                 try:
                     all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
@@ -359,7 +330,7 @@ class AnalyticsTools:
                 # 找到峰值时间
                 max_count = max(counts)
                 peak_index = counts.index(max_count)
-                peak_time = trend_data[peak_index]["date"]
+                peak_time = self._period_name(trend_data[peak_index])
             else:
                 change_rate = 0
                 peak_time = None
@@ -755,10 +726,7 @@ class AnalyticsTools:
 
             # 按权重排序（如果启用）
             if sort_by_weight:
-                deduplicated_news.sort(
-                    key=lambda x: calculate_news_weight(x),
-                    reverse=True
-                )
+                self.data_service.get_weight_scorer().sort(deduplicated_news)
 
             # 限制返回数量
             selected_news = deduplicated_news[:limit]
@@ -1116,10 +1084,7 @@ class AnalyticsTools:
 
             # 按权重排序（如果启用）
             if sort_by_weight:
-                related_news.sort(
-                    key=lambda x: calculate_news_weight(x),
-                    reverse=True
-                )
+                self.data_service.get_weight_scorer().sort(related_news)
             else:
                 # 按排名排序
                 related_news.sort(key=lambda x: x["rank"])
@@ -1465,7 +1430,8 @@ class AnalyticsTools:
     def analyze_topic_lifecycle(
         self,
         topic: str,
-        date_range: Optional[Dict[str, str]] = None
+        date_range: Optional[Dict[str, str]] = None,
+        granularity: str = "day"
     ) -> Dict:
         """
         话题生命周期分析 - 追踪话题从出现到消失的完整周期
@@ -1474,7 +1440,10 @@ class AnalyticsTools:
             topic: 话题关键词
             date_range: 日期范围（可选）
                        - **格式**: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
-                       - **默认**: 不指定时默认分析最近7天
+                       - **默认**: 不指定时默认分析最近7天（hour/snapshot 粒度默认今天）
+            granularity: 时间粒度 day / hour / snapshot，默认 day；
+                         非 day 粒度时出现时间、峰值等以 "YYYY-MM-DD HH:MM" 表示，
+                         阶段判断基于最近/最早的 3 个时间段
 
         Returns:
             话题生命周期分析结果
@@ -1496,20 +1465,22 @@ class AnalyticsTools:
         try:
             # 参数验证
             topic = validate_keyword(topic)
-
-            # 处理日期范围（不指定时默认最近7天）
-            if date_range:
-                from ..utils.validators import validate_date_range
-                date_range_tuple = validate_date_range(date_range)
-                start_date, end_date = date_range_tuple
-            else:
-                # 默认最近7天
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=6)
+            start_date, end_date = self._resolve_topic_range(date_range, granularity)
 
             # 收集话题历史数据
             lifecycle_data = []
             current_date = start_date
+
+            if granularity != "day":
+                # 小时 / 快照粒度：直接查时间分桶索引
+                for bucket in self.data_service.get_topic_mentions(topic, start_date, end_date, granularity):
+                    lifecycle_data.append({
+                        "date": bucket["date"],
+                        "time": bucket["time"],
+                        "count": bucket["count"]
+                    })
+                current_date = end_date + timedelta(days=1)
+
             while current_date <= end_date:
                 try:
                     all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
@@ -1550,13 +1521,13 @@ class AnalyticsTools:
                 )
 
             # 找到首次出现和最后出现
-            first_appearance = next((item["date"] for item in lifecycle_data if item["count"] > 0), None)
-            last_appearance = next((item["date"] for item in reversed(lifecycle_data) if item["count"] > 0), None)
+            first_appearance = next((self._period_name(item) for item in lifecycle_data if item["count"] > 0), None)
+            last_appearance = next((self._period_name(item) for item in reversed(lifecycle_data) if item["count"] > 0), None)
 
             # 计算峰值
             max_count = max(counts)
             peak_index = counts.index(max_count)
-            peak_date = lifecycle_data[peak_index]["date"]
+            peak_date = self._period_name(lifecycle_data[peak_index])
 
             # 计算平均值和标准差（简单实现）
             non_zero_counts = [c for c in counts if c > 0]
@@ -1575,12 +1546,12 @@ class AnalyticsTools:
             else:
                 lifecycle_stage = "稳定期"
 
-            # 分类：昙花一现 vs 持续热点
+            # 分类：昙花一现 vs 持续热点（非 day 粒度时按时间段计）
             active_days = sum(1 for c in counts if c > 0)
 
             if active_days <= 2 and max_count > avg_count * 2:
                 topic_type = "昙花一现"
-            elif active_days >= total_days * 0.6:
+            elif active_days >= len(counts) * 0.6:
                 topic_type = "持续热点"
             else:
                 topic_type = "周期性热点"
@@ -1593,6 +1564,7 @@ class AnalyticsTools:
                     "end": end_date.strftime("%Y-%m-%d"),
                     "total_days": total_days
                 },
+                "granularity": granularity,
                 "lifecycle_data": lifecycle_data,
                 "analysis": {
                     "first_appearance": first_appearance,
@@ -1920,6 +1892,35 @@ class AnalyticsTools:
 
     # ==================== 辅助方法 ====================
 
+    def _resolve_topic_range(
+        self,
+        date_range: Optional[Dict[str, str]],
+        granularity: str
+    ) -> Tuple[datetime, datetime]:
+        """
+        校验时间粒度并解析话题分析的日期范围
+
+        不指定 date_range 时，day 粒度默认最近7天，hour/snapshot 粒度默认今天
+        """
+        if granularity not in ("day", "hour", "snapshot"):
+            raise InvalidParameterError(
+                f"不支持的粒度参数: {granularity}",
+                suggestion="支持的粒度: day（天）、hour（小时）、snapshot（每次抓取）"
+            )
+
+        if date_range:
+            return validate_date_range(date_range)
+
+        end_date = datetime.now()
+        if granularity == "day":
+            return end_date - timedelta(days=6), end_date
+        return end_date, end_date
+
+    @staticmethod
+    def _period_name(item: Dict) -> str:
+        """时间段名称：按天为日期，按小时/快照为 "日期 HH:MM" 形式"""
+        return f"{item['date']} {item['time']}" if item.get("time") else item["date"]
+
     def _extract_keywords(self, title: str, min_length: int = 2) -> List[str]:
         """
         从标题中提取关键词（简单实现）
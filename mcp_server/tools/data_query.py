@@ -14,7 +14,9 @@ from ..utils.validators import (
     validate_date_range,
     validate_top_n,
     validate_mode,
-    validate_date_query
+    validate_date_query,
+    validate_time_range,
+    validate_hours
 )
 from ..utils.errors import MCPError
 
@@ -35,7 +37,8 @@ class DataQueryTools:
         self,
         platforms: Optional[List[str]] = None,
         limit: Optional[int] = None,
-        include_url: bool = False
+        include_url: bool = False,
+        hours: Optional[int] = None
     ) -> Dict:
         """
         获取最新一批爬取的新闻数据
@@ -44,6 +47,7 @@ class DataQueryTools:
             platforms: 平台ID列表，如 ['zhihu', 'weibo']
             limit: 返回条数限制，默认20
             include_url: 是否包含URL链接，默认False（节省token）
+            hours: 返回最近 N 小时内所有快照的新闻，默认只返回最新一批
 
         Returns:
             新闻列表字典
@@ -58,20 +62,25 @@ class DataQueryTools:
             # 参数验证
             platforms = validate_platforms(platforms)
             limit = validate_limit(limit, default=50)
+            hours = validate_hours(hours)
 
             # 获取数据
             news_list = self.data_service.get_latest_news(
                 platforms=platforms,
                 limit=limit,
-                include_url=include_url
+                include_url=include_url,
+                hours=hours
             )
 
-            return {
+            result = {
                 "news": news_list,
                 "total": len(news_list),
                 "platforms": platforms,
                 "success": True
             }
+            if hours:
+                result["hours"] = hours
+            return result
 
         except MCPError as e:
             return {
@@ -213,7 +222,8 @@ class DataQueryTools:
         date_query: Optional[str] = None,
         platforms: Optional[List[str]] = None,
         limit: Optional[int] = None,
-        include_url: bool = False
+        include_url: bool = False,
+        time_range: Optional[Dict[str, str]] = None
     ) -> Dict:
         """
         按日期查询新闻，支持自然语言日期
@@ -226,6 +236,7 @@ class DataQueryTools:
             platforms: 平台ID列表，如 ['zhihu', 'weibo']
             limit: 返回条数限制，默认50
             include_url: 是否包含URL链接，默认False（节省token）
+            time_range: 时间段 {"start": "HH:MM", "end": "HH:MM"}，只统计该时间段内抓取的快照，默认全天
 
         Returns:
             新闻列表字典
@@ -250,16 +261,18 @@ class DataQueryTools:
             target_date = validate_date_query(date_query)
             platforms = validate_platforms(platforms)
             limit = validate_limit(limit, default=50)
+            time_range_tuple = validate_time_range(time_range)
 
             # 获取数据
             news_list = self.data_service.get_news_by_date(
                 target_date=target_date,
                 platforms=platforms,
                 limit=limit,
-                include_url=include_url
+                include_url=include_url,
+                time_range=time_range_tuple
             )
 
-            return {
+            result = {
                 "news": news_list,
                 "total": len(news_list),
                 "date": target_date.strftime("%Y-%m-%d"),
@@ -267,6 +280,9 @@ class DataQueryTools:
                 "platforms": platforms,
                 "success": True
             }
+            if time_range_tuple:
+                result["time_range"] = {"start": time_range_tuple[0], "end": time_range_tuple[1]}
+            return result
 
         except MCPError as e:
             return {
@@ -122,9 +122,21 @@ class SearchTools:
 
             # 收集所有匹配的新闻
             all_matches = []
-            current_date = start_date
+            scan_dates = None
 
-            while current_date <= end_date:
+            # keyword / entity 模式在已入库的日期上走全文索引，fuzzy 模式与未入库的日期逐条扫描
+            if search_mode in ("keyword", "entity"):
+                indexed = self.data_service.search_titles_in_store([query], start_date, end_date, platforms)
+                if indexed is not None:
+                    candidates, scan_dates = indexed
+                    all_matches.extend(self._match_indexed_titles(
+                        query, candidates, search_mode == "entity", include_url
+                    ))
+
+            if scan_dates is None:
+                scan_dates = self.data_service.iter_dates(start_date, end_date)
+
+            for current_date in scan_dates:
                 try:
                     all_titles, id_to_name, timestamps = self.data_service.parser.read_all_titles_for_date(
                         date=current_date,
@@ -151,8 +163,6 @@ class SearchTools:
                     # 该日期没有数据，继续下一天
                     pass
 
-                current_date += timedelta(days=1)
-
             if not all_matches:
                 # 获取可用日期范围用于错误提示
                 earliest, latest = self.data_service.get_available_date_range()
@@ -187,8 +197,7 @@ class SearchTools:
             if sort_by == "relevance":
                 all_matches.sort(key=lambda x: x.get("similarity_score", 1.0), reverse=True)
             elif sort_by == "weight":
-                from .analytics import calculate_news_weight
-                all_matches.sort(key=lambda x: calculate_news_weight(x), reverse=True)
+                self.data_service.get_weight_scorer().sort(all_matches)
             elif sort_by == "date":
                 all_matches.sort(key=lambda x: x.get("date", ""), reverse=True)
 
@@ -288,6 +297,54 @@ class SearchTools:
 
         return matches
 
+    def _match_indexed_titles(
+        self,
+        query: str,
+        candidates: List[Dict],
+        case_sensitive: bool,
+        include_url: bool
+    ) -> List[Dict]:
+        """
+        校验全文索引返回的候选标题（与 keyword / entity 模式的包含判断一致）
+
+        Args:
+            query: 搜索关键词
+            candidates: DataService.search_titles_in_store 返回的候选标题
+            case_sensitive: 是否区分大小写（entity 模式区分）
+            include_url: 是否包含URL链接
+
+        Returns:
+            匹配的新闻列表
+        """
+        matches = []
+        query_cmp = query if case_sensitive else query.lower()
+
+        for item in candidates:
+            title = item["title"]
+            if query_cmp not in (title if case_sensitive else title.lower()):
+                continue
+
+            ranks = item["ranks"]
+            news_item = {
+                "title": title,
+                "platform": item["platform_id"],
+                "platform_name": item["platform_name"],
+                "date": item["date"],
+                "similarity_score": 1.0,
+                "ranks": ranks,
+                "count": len(ranks),
+                "rank": ranks[0] if ranks else 999
+            }
+
+            # 条件性添加 URL 字段
+            if include_url:
+                news_item["url"] = item.get("url", "")
+                news_item["mobileUrl"] = item.get("mobileUrl", "")
+
+            matches.append(news_item)
+
+        return matches
+
     def _search_by_fuzzy_mode(
         self,
         query: str,
@@ -574,9 +631,57 @@ class SearchTools:
 
             # 收集所有相关新闻
             all_related_news = []
-            current_date = search_start
 
-            while current_date <= search_end:
+            def score_title(title, platform_id, platform_name, info, date_str):
+                # 计算标题相似度
+                title_similarity = self._calculate_similarity(reference_text, title)
+
+                # 提取标题关键词
+                title_keywords = self._extract_keywords(title)
+
+                # 计算关键词重合度
+                keyword_overlap = self._calculate_keyword_overlap(
+                    reference_keywords,
+                    title_keywords
+                )
+
+                # 综合相似度 (70% 关键词重合 + 30% 文本相似度)
+                combined_score = keyword_overlap * 0.7 + title_similarity * 0.3
+
+                if combined_score >= threshold:
+                    news_item = {
+                        "title": title,
+                        "platform": platform_id,
+                        "platform_name": platform_name,
+                        "date": date_str,
+                        "similarity_score": round(combined_score, 4),
+                        "keyword_overlap": round(keyword_overlap, 4),
+                        "text_similarity": round(title_similarity, 4),
+                        "common_keywords": list(set(reference_keywords) & set(title_keywords)),
+                        "rank": info["ranks"][0] if info["ranks"] else 0
+                    }
+
+                    # 条件性添加 URL 字段
+                    if include_url:
+                        news_item["url"] = info.get("url", "")
+                        news_item["mobileUrl"] = info.get("mobileUrl", "")
+
+                    all_related_news.append(news_item)
+
+            # 没有共同关键词时综合相似度不超过 0.3，阈值更高时只需检查
+            # 包含任一参考关键词的标题，可交给全文索引筛选候选
+            scan_dates = None
+            if threshold > 0.3:
+                indexed = self.data_service.search_titles_in_store(reference_keywords, search_start, search_end)
+                if indexed is not None:
+                    candidates, scan_dates = indexed
+                    for item in candidates:
+                        score_title(item["title"], item["platform_id"], item["platform_name"], item, item["date"])
+
+            if scan_dates is None:
+                scan_dates = self.data_service.iter_dates(search_start, search_end)
+
+            for current_date in scan_dates:
                 try:
                     # 读取该日期的数据
                     all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(current_date)
@@ -586,40 +691,7 @@ class SearchTools:
                         platform_name = id_to_name.get(platform_id, platform_id)
 
                         for title, info in titles.items():
-                            # 计算标题相似度
-                            title_similarity = self._calculate_similarity(reference_text, title)
-
-                            # 提取标题关键词
-                            title_keywords = self._extract_keywords(title)
-
-                            # 计算关键词重合度
-                            keyword_overlap = self._calculate_keyword_overlap(
-                                reference_keywords,
-                                title_keywords
-                            )
-
-                            # 综合相似度 (70% 关键词重合 + 30% 文本相似度)
-                            combined_score = keyword_overlap * 0.7 + title_similarity * 0.3
-
-                            if combined_score >= threshold:
-                                news_item = {
-                                    "title": title,
-                                    "platform": platform_id,
-                                    "platform_name": platform_name,
-                                    "date": current_date.strftime("%Y-%m-%d"),
-                                    "similarity_score": round(combined_score, 4),
-                                    "keyword_overlap": round(keyword_overlap, 4),
-                                    "text_similarity": round(title_similarity, 4),
-                                    "common_keywords": list(set(reference_keywords) & set(title_keywords)),
-                                    "rank": info["ranks"][0] if info["ranks"] else 0
-                                }
-
-                                # 条件性添加 URL 字段
-                                if include_url:
-                                    news_item["url"] = info.get("url", "")
-                                    news_item["mobileUrl"] = info.get("mobileUrl", "")
-
-                                all_related_news.append(news_item)
+                            score_title(title, platform_id, platform_name, info, current_date.strftime("%Y-%m-%d"))
 
                 except DataNotFoundError:
                     # 该日期没有数据，继续下一天
@@ -628,9 +700,6 @@ class SearchTools:
                     # 记录错误但继续处理其他日期
                     print(f"Warning: 处理日期 {current_date.strftime('%Y-%m-%d')} 时出错: {e}")
 
-                # 移动到下一天
-                current_date += timedelta(days=1)
-
             if not all_related_news:
                 return {
                     "success": True,
@@ -4,12 +4,24 @@
 实现系统状态查询和爬虫触发功能。
 """
 
+import sys
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from trendradar.crawler import Crawler, write_snapshot
+from trendradar.http_client import HttpSessionPool
+from trendradar.rate_limiter import HostRateLimiter
+
+from ..services.crawl_job_service import COMPLETED, FAILED, CrawlJob, CrawlJobService
 from ..services.data_service import DataService
 from ..utils.validators import validate_platforms
-from ..utils.errors import MCPError, CrawlTaskError
+from ..utils.errors import MCPError, CrawlTaskError, DataNotFoundError
+
+
+def _log(message: str):
+    """抓取日志输出到 stderr，避免干扰 stdio 模式下的 MCP 协议输出"""
+    print(message, file=sys.stderr)
 
 
 class SystemManagementTools:
@@ -30,6 +42,14 @@ class SystemManagementTools:
             current_file = Path(__file__)
             self.project_root = current_file.parent.parent.parent
 
+        # 按主机限速器和 HTTP 连接池，跨多次 trigger_crawl 调用共享，首次爬取时按配置创建
+        self._rate_limiter = None
+        self._http_pool = None
+        self._init_lock = threading.Lock()
+
+        # 后台爬取任务（trigger_crawl 提交，get_crawl_status 查询）
+        self.job_service = CrawlJobService()
+
     def get_system_status(self) -> Dict:
         """
         获取系统运行状态和健康检查信息
@@ -67,32 +87,25 @@ class SystemManagementTools:
 
     def trigger_crawl(self, platforms: Optional[List[str]] = None, save_to_local: bool = False, include_url: bool = False) -> Dict:
         """
-        手动触发一次临时爬取任务（可选持久化）
+        提交一次后台爬取任务（可选持久化），立即返回 task_id
+
+        相同平台与 save_to_local 的任务正在执行时，直接返回该任务的 task_id，不会重复爬取。
 
         Args:
             platforms: 指定平台列表，为空则爬取所有平台
             save_to_local: 是否保存到本地 output 目录，默认 False
-            include_url: 是否包含URL链接，默认False（节省token）
+            include_url: 查询结果时是否默认包含URL链接，默认False（节省token）
 
         Returns:
-            爬取结果字典，包含新闻数据和保存路径（如果保存）
+            任务提交结果，包含 task_id 和任务状态，结果通过 get_crawl_status 获取
 
         Example:
             >>> tools = SystemManagementTools()
-            >>> # 临时爬取，不保存
             >>> result = tools.trigger_crawl(platforms=['zhihu', 'weibo'])
-            >>> print(result['data'])
-            >>> # 爬取并保存到本地
-            >>> result = tools.trigger_crawl(platforms=['zhihu'], save_to_local=True)
-            >>> print(result['saved_files'])
+            >>> status = tools.get_crawl_status(result['task_id'])
+            >>> print(status['status'], status['progress']['percent'])
         """
         try:
-            import json
-            import time
-            import random
-            import requests
-            from datetime import datetime
-            import pytz
             import yaml
 
             # 参数验证
@@ -129,234 +142,96 @@ class SystemManagementTools:
             else:
                 target_platforms = all_platforms
 
-            # 获取请求间隔
-            request_interval = config_data.get("crawler", {}).get("request_interval", 100)
+            ids = [(p["id"], p.get("name", p["id"])) for p in target_platforms]
+            job, joined = self.job_service.submit(
+                ids,
+                {"save_to_local": save_to_local},
+                lambda job: self._run_crawl(job, ids, config_data, save_to_local),
+            )
+            if not joined:
+                job.include_url = include_url
 
-            # 构建平台ID列表
-            ids = []
-            for platform in target_platforms:
-                if "name" in platform:
-                    ids.append((platform["id"], platform["name"]))
-                else:
-                    ids.append(platform["id"])
-
-            print(f"开始临时爬取，平台: {[p.get('name', p['id']) for p in target_platforms]}")
+            return {
+                "success": True,
+                "task_id": job.task_id,
+                "status": job.status,
+                "joined_existing": joined,
+                "platforms": [platform_id for platform_id, _ in ids],
+                "note": (
+                    "已有相同参数的爬取任务在执行，已复用该任务" if joined
+                    else "爬取任务已在后台执行"
+                ) + "，请使用 get_crawl_status(task_id) 查询进度和结果",
+            }
 
-            # 爬取数据
-            results = {}
-            id_to_name = {}
-            failed_ids = []
+        except MCPError as e:
+            return {
+                "success": False,
+                "error": e.to_dict()
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": {
+                    "code": "INTERNAL_ERROR",
+                    "message": str(e)
+                }
+            }
 
-            for i, id_info in enumerate(ids):
-                if isinstance(id_info, tuple):
-                    id_value, name = id_info
-                else:
-                    id_value = id_info
-                    name = id_value
+    def get_crawl_status(self, task_id: Optional[str] = None, include_data: bool = True, include_url: Optional[bool] = None) -> Dict:
+        """
+        查询后台爬取任务的状态、各平台进度和结果
 
-                id_to_name[id_value] = name
+        Args:
+            task_id: 任务ID，为空时返回最近的任务列表
+            include_data: 任务完成时是否返回新闻数据，默认True
+            include_url: 是否包含URL链接，为空时沿用 trigger_crawl 时的设置
 
-                # 构建请求URL
-                url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
+        Returns:
+            任务状态字典，完成后包含爬取结果
 
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                    "Accept": "application/json, text/plain, */*",
-                    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-                    "Connection": "keep-alive",
-                    "Cache-Control": "no-cache",
+        Example:
+            >>> tools = SystemManagementTools()
+            >>> status = tools.get_crawl_status("crawl_20251117_103000_ab12cd34")
+            >>> print(status['status'])
+        """
+        try:
+            if not task_id:
+                tasks = []
+                for job in self.job_service.list_jobs():
+                    info = job.to_dict()
+                    info["percent"] = info.pop("progress")["percent"]
+                    tasks.append(info)
+                return {
+                    "success": True,
+                    "total": len(tasks),
+                    "tasks": tasks,
                 }
 
-                # 重试机制
-                max_retries = 2
-                retries = 0
-                success = False
-
-                while retries <= max_retries and not success:
-                    try:
-                        response = requests.get(url, headers=headers, timeout=10)
-                        response.raise_for_status()
-
-                        data_text = response.text
-                        data_json = json.loads(data_text)
-
-                        status = data_json.get("status", "未知")
-                        if status not in ["success", "cache"]:
-                            raise ValueError(f"响应状态异常: {status}")
-
-                        status_info = "最新数据" if status == "success" else "缓存数据"
-                        print(f"获取 {id_value} 成功（{status_info}）")
-
-                        # 解析数据
-                        results[id_value] = {}
-                        for index, item in enumerate(data_json.get("items", []), 1):
-                            title = item["title"]
-                            url_link = item.get("url", "")
-                            mobile_url = item.get("mobileUrl", "")
-
-                            if title in results[id_value]:
-                                results[id_value][title]["ranks"].append(index)
-                            else:
-                                results[id_value][title] = {
-                                    "ranks": [index],
-                                    "url": url_link,
-                                    "mobileUrl": mobile_url,
-                                }
-
-                        success = True
-
-                    except Exception as e:
-                        retries += 1
-                        if retries <= max_retries:
-                            wait_time = random.uniform(3, 5)
-                            print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
-                            time.sleep(wait_time)
-                        else:
-                            print(f"请求 {id_value} 失败: {e}")
-                            failed_ids.append(id_value)
-
-                # 请求间隔
-                if i < len(ids) - 1:
-                    actual_interval = request_interval + random.randint(-10, 20)
-                    actual_interval = max(50, actual_interval)
-                    time.sleep(actual_interval / 1000)
-
-            # 格式化返回数据
-            news_data = []
-            for platform_id, titles_data in results.items():
-                platform_name = id_to_name.get(platform_id, platform_id)
-                for title, info in titles_data.items():
-                    news_item = {
-                        "platform_id": platform_id,
-                        "platform_name": platform_name,
-                        "title": title,
-                        "ranks": info["ranks"]
-                    }
-
-                    # 条件性添加 URL 字段
-                    if include_url:
-                        news_item["url"] = info.get("url", "")
-                        news_item["mobile_url"] = info.get("mobileUrl", "")
-
-                    news_data.append(news_item)
-
-            # 获取北京时间
-            beijing_tz = pytz.timezone("Asia/Shanghai")
-            now = datetime.now(beijing_tz)
-
-            # 构建返回结果
-            result = {
-                "success": True,
-                "task_id": f"crawl_{int(time.time())}",
-                "status": "completed",
-                "crawl_time": now.strftime("%Y-%m-%d %H:%M:%S"),
-                "platforms": list(results.keys()),
-                "total_news": len(news_data),
-                "failed_platforms": failed_ids,
-                "data": news_data,
-                "saved_to_local": save_to_local
-            }
+            job = self.job_service.get(task_id)
+            if job is None:
+                raise DataNotFoundError(
+                    f"爬取任务不存在: {task_id}",
+                    suggestion="任务可能已过期被清理，请重新调用 trigger_crawl"
+                )
 
-            # 如果需要持久化，调用保存逻辑
-            if save_to_local:
-                try:
-                    import re
-
-                    # 辅助函数：清理标题
-                    def clean_title(title: str) -> str:
-                        """清理标题中的特殊字符"""
-                        if not isinstance(title, str):
-                            title = str(title)
-                        cleaned_title = title.replace("\n", " ").replace("\r", " ")
-                        cleaned_title = re.sub(r"\s+", " ", cleaned_title)
-                        cleaned_title = cleaned_title.strip()
-                        return cleaned_title
-
-                    # 辅助函数：创建目录
-                    def ensure_directory_exists(directory: str):
-                        """确保目录存在"""
-                        Path(directory).mkdir(parents=True, exist_ok=True)
-
-                    # 格式化日期和时间
-                    date_folder = now.strftime("%Y年%m月%d日")
-                    time_filename = now.strftime("%H时%M分")
-
-                    # 创建 txt 文件路径
-                    txt_dir = self.project_root / "output" / date_folder / "txt"
-                    ensure_directory_exists(str(txt_dir))
-                    txt_file_path = txt_dir / f"{time_filename}.txt"
-
-                    # 创建 html 文件路径
-                    html_dir = self.project_root / "output" / date_folder / "html"
-                    ensure_directory_exists(str(html_dir))
-                    html_file_path = html_dir / f"{time_filename}.html"
-
-                    # 保存 txt 文件（按照 main.py 的格式）
-                    with open(txt_file_path, "w", encoding="utf-8") as f:
-                        for id_value, title_data in results.items():
-                            # id | name 或 id
-                            name = id_to_name.get(id_value)
-                            if name and name != id_value:
-                                f.write(f"{id_value} | {name}\n")
-                            else:
-                                f.write(f"{id_value}\n")
-
-                            # 按排名排序标题
-                            sorted_titles = []
-                            for title, info in title_data.items():
-                                cleaned = clean_title(title)
-                                if isinstance(info, dict):
-                                    ranks = info.get("ranks", [])
-                                    url = info.get("url", "")
-                                    mobile_url = info.get("mobileUrl", "")
-                                else:
-                                    ranks = info if isinstance(info, list) else []
-                                    url = ""
-                                    mobile_url = ""
-
-                                rank = ranks[0] if ranks else 1
-                                sorted_titles.append((rank, cleaned, url, mobile_url))
-
-                            sorted_titles.sort(key=lambda x: x[0])
-
-                            for rank, cleaned, url, mobile_url in sorted_titles:
-                                line = f"{rank}. {cleaned}"
-                                if url:
-                                    line += f" [URL:{url}]"
-                                if mobile_url:
-                                    line += f" [MOBILE:{mobile_url}]"
-                                f.write(line + "\n")
-
-                            f.write("\n")
-
-                        if failed_ids:
-                            f.write("==== 以下ID请求失败 ====\n")
-                            for id_value in failed_ids:
-                                f.write(f"{id_value}\n")
-
-                    # 保存 html 文件（简化版）
-                    html_content = self._generate_simple_html(results, id_to_name, failed_ids, now)
-                    with open(html_file_path, "w", encoding="utf-8") as f:
-                        f.write(html_content)
-
-                    print(f"数据已保存到:")
-                    print(f"  TXT: {txt_file_path}")
-                    print(f"  HTML: {html_file_path}")
-
-                    result["saved_files"] = {
-                        "txt": str(txt_file_path),
-                        "html": str(html_file_path)
-                    }
-                    result["note"] = "数据已持久化到 output 文件夹"
-
-                except Exception as e:
-                    print(f"保存文件失败: {e}")
-                    result["save_error"] = str(e)
-                    result["note"] = "爬取成功但保存失败，数据仅在内存中"
-            else:
-                result["note"] = "临时爬取结果，未持久化到output文件夹"
+            status = job.to_dict()
+            status["success"] = True
+
+            if job.status == FAILED:
+                status["error"] = job.error
+            elif job.status == COMPLETED and job.result is not None:
+                with_url = job.include_url if include_url is None else include_url
+                result = dict(job.result)
+                if include_data:
+                    result["data"] = [
+                        item if with_url else {k: v for k, v in item.items() if k not in ("url", "mobile_url")}
+                        for item in job.result["data"]
+                    ]
+                else:
+                    result.pop("data", None)
+                status.update(result)
 
-            return result
+            return status
 
         except MCPError as e:
             return {
@@ -364,16 +239,125 @@ class SystemManagementTools:
                 "error": e.to_dict()
             }
         except Exception as e:
-            import traceback
             return {
                 "success": False,
                 "error": {
                     "code": "INTERNAL_ERROR",
-                    "message": str(e),
-                    "traceback": traceback.format_exc()
+                    "message": str(e)
                 }
             }
 
+    def _run_crawl(self, job: CrawlJob, ids: List, config_data: Dict, save_to_local: bool) -> Dict:
+        """在后台线程中执行爬取（由 CrawlJobService 调用），返回爬取结果"""
+        from datetime import datetime
+        import pytz
+
+        # 按主机限速器与连接池跨任务共享，抓取逻辑与 main.py 共用 trendradar.crawler
+        crawler_config = config_data.get("crawler", {})
+        with self._init_lock:
+            if self._rate_limiter is None:
+                self._rate_limiter = HostRateLimiter.from_config(
+                    crawler_config.get("rate_limit"),
+                    crawler_config.get("request_interval", 1000)
+                )
+            if self._http_pool is None:
+                self._http_pool = HttpSessionPool.from_config(crawler_config.get("http_pool"))
+        connection_baseline = self._http_pool.connection_stats()
+
+        state_dir = self.project_root / crawler_config.get("state_dir", "output/.crawler_state")
+        crawler = Crawler.from_config(
+            crawler_config,
+            state_dir=str(state_dir),
+            http_pool=self._http_pool,
+            rate_limiter=self._rate_limiter,
+            log=_log,
+        )
+
+        _log(f"开始后台爬取 [{job.task_id}]，平台: {[name for _, name in ids]}")
+
+        results, id_to_name, failed_ids = crawler.crawl_websites(
+            ids,
+            crawler_config.get("request_interval", 1000),
+            progress_callback=job.update_platform,
+        )
+
+        # 格式化返回数据（保留 URL，查询时按 include_url 裁剪）
+        news_data = []
+        for platform_id, titles_data in results.items():
+            platform_name = id_to_name.get(platform_id, platform_id)
+            for title, info in titles_data.items():
+                news_data.append({
+                    "platform_id": platform_id,
+                    "platform_name": platform_name,
+                    "title": title,
+                    "ranks": info["ranks"],
+                    "url": info.get("url", ""),
+                    "mobile_url": info.get("mobileUrl", ""),
+                })
+
+        # 获取北京时间
+        beijing_tz = pytz.timezone("Asia/Shanghai")
+        now = datetime.now(beijing_tz)
+
+        # 构建返回结果
+        result = {
+            "crawl_time": now.strftime("%Y-%m-%d %H:%M:%S"),
+            "platforms": list(results.keys()),
+            "total_news": len(news_data),
+            "failed_platforms": failed_ids,
+            "skipped_platforms": crawler.skipped_ids,
+            "data": news_data,
+            "saved_to_local": save_to_local,
+            "connection_stats": self._http_pool.connection_stats(since=connection_baseline)
+        }
+
+        # 如果需要持久化，调用保存逻辑
+        if save_to_local:
+            try:
+                # 格式化日期和时间
+                date_folder = now.strftime("%Y年%m月%d日")
+                time_filename = now.strftime("%H时%M分")
+
+                # 写入 SQLite，按 storage.txt_export 导出 txt 快照（与 main.py 一致：未启用数据库时总是导出）
+                store = self.data_service.parser.get_snapshot_store()
+                if store is not None:
+                    store.save_snapshot(results, id_to_name, failed_ids, now, source="mcp")
+                txt_file_path = None
+                if config_data.get("storage", {}).get("txt_export", True) or store is None:
+                    txt_file_path = self.project_root / "output" / date_folder / "txt" / f"{time_filename}.txt"
+                    write_snapshot(str(txt_file_path), results, id_to_name, failed_ids)
+
+                # 创建 html 文件路径
+                html_dir = self.project_root / "output" / date_folder / "html"
+                html_dir.mkdir(parents=True, exist_ok=True)
+                html_file_path = html_dir / f"{time_filename}.html"
+
+                # 保存 html 文件（简化版）
+                html_content = self._generate_simple_html(results, id_to_name, failed_ids, now)
+                with open(html_file_path, "w", encoding="utf-8") as f:
+                    f.write(html_content)
+
+                _log("数据已保存到:")
+                if txt_file_path:
+                    _log(f"  TXT: {txt_file_path}")
+                _log(f"  HTML: {html_file_path}")
+
+                result["saved_files"] = {"html": str(html_file_path)}
+                if txt_file_path:
+                    result["saved_files"]["txt"] = str(txt_file_path)
+                if store is not None:
+                    result["saved_files"]["database"] = str(store.db_path)
+                result["note"] = "数据已持久化到 output 文件夹"
+
+            except Exception as e:
+                _log(f"保存文件失败: {e}")
+                result["save_error"] = str(e)
+                result["note"] = "爬取成功但保存失败，数据仅在内存中"
+        else:
+            result["note"] = "临时爬取结果，未持久化到output文件夹"
+
+        return result
+
     def _generate_simple_html(self, results: Dict, id_to_name: Dict, failed_ids: List, now) -> str:
         """生成简化的 HTML 报告"""
         html = """<!DOCTYPE html>
@@ -209,6 +209,83 @@ def validate_date_range(date_range: Optional[dict]) -> Optional[tuple]:
     return (start_date, end_date)
 
 
+def validate_time_range(time_range: Optional[dict]) -> Optional[tuple]:
+    """
+    验证一天内的时间段
+
+    Args:
+        time_range: 时间段字典 {"start": "HH:MM", "end": "HH:MM"}，可只提供其中一个
+
+    Returns:
+        (start_time, end_time) 元组（缺省的一端为 None），或 None
+
+    Raises:
+        InvalidParameterError: 时间段无效
+    """
+    if time_range is None:
+        return None
+
+    if not isinstance(time_range, dict):
+        raise InvalidParameterError("time_range 必须是字典类型")
+
+    parsed = []
+    for field in ("start", "end"):
+        value = time_range.get(field)
+        if not value:
+            parsed.append(None)
+            continue
+        try:
+            parsed.append(datetime.strptime(str(value).strip(), "%H:%M").strftime("%H:%M"))
+        except ValueError:
+            raise InvalidParameterError(
+                f"时间格式错误: {value}",
+                suggestion='请使用 HH:MM 格式，例如: {"start": "09:00", "end": "12:00"}'
+            )
+
+    start_time, end_time = parsed
+    if not start_time and not end_time:
+        raise InvalidParameterError(
+            "time_range 至少需要包含 start 或 end 字段",
+            suggestion='例如: {"start": "09:00", "end": "12:00"}'
+        )
+    if start_time and end_time and start_time > end_time:
+        raise InvalidParameterError(
+            "开始时间不能晚于结束时间",
+            suggestion=f"start: {start_time}, end: {end_time}"
+        )
+
+    return (start_time, end_time)
+
+
+def validate_hours(hours: Optional[int], max_hours: int = 72) -> Optional[int]:
+    """
+    验证小时数
+
+    Args:
+        hours: 小时数
+        max_hours: 最大允许值
+
+    Returns:
+        验证后的小时数，或 None
+
+    Raises:
+        InvalidParameterError: 参数无效
+    """
+    if hours is None:
+        return None
+
+    if not isinstance(hours, int) or hours <= 0:
+        raise InvalidParameterError("hours 必须是正整数")
+
+    if hours > max_hours:
+        raise InvalidParameterError(
+            f"hours 不能超过 {max_hours}",
+            suggestion="更长的时间范围请使用 get_news_by_date 或 search_news 的 date_range 参数"
+        )
+
+    return hours
+
+
 def validate_keyword(keyword: str) -> str:
     """
     验证关键词
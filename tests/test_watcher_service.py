@@ -0,0 +1,74 @@
+"""
+快照监听服务测试
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from mcp_server.services.data_service import DataService
+from mcp_server.services.parser_service import ParserService
+from mcp_server.services.watcher_service import SnapshotWatcher
+from trendradar.crawler import write_snapshot
+
+
+def _write_snapshot(project_root, label):
+    txt_dir = project_root / "output" / datetime.now().strftime("%Y年%m月%d日") / "txt"
+    write_snapshot(
+        str(txt_dir / f"{label}.txt"),
+        {"zhihu": {f"测试标题 {label}": {"ranks": [1], "url": "", "mobileUrl": ""}}},
+        {"zhihu": "知乎"},
+        [],
+    )
+
+
+class _CountingWatcher(SnapshotWatcher):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checks = 0
+        self.checked = threading.Event()
+
+    def check(self) -> bool:
+        self.checks += 1
+        try:
+            return super().check()
+        finally:
+            self.checked.set()
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    _write_snapshot(tmp_path, "08时00分")
+    parser = ParserService(str(tmp_path))
+    watcher = _CountingWatcher(
+        parser,
+        lambda: parser.ensure_in_store(datetime.now()),
+        poll_interval=30,
+        debounce=0.2,
+    ).start()
+    assert watcher.checked.wait(10)
+    yield watcher
+    watcher.stop(5)
+
+
+def test_idle_watcher_ignores_queries(watcher, tmp_path):
+    """查询打开、关闭数据库连接（-wal/-shm 的创建与删除）不会唤醒监听器"""
+    checks = watcher.checks
+    for _ in range(3):
+        DataService(str(tmp_path)).get_latest_news()
+        time.sleep(0.5)
+    time.sleep(1)
+    assert watcher.checks == checks
+    assert watcher.refresh_count == 1
+
+
+def test_new_snapshot_triggers_refresh(watcher, tmp_path):
+    if watcher.mode != "inotify":
+        pytest.skip("inotify 不可用，新快照要等到下一次轮询")
+    _write_snapshot(tmp_path, "08时30分")
+    deadline = time.monotonic() + 10
+    while watcher.refresh_count < 2 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert watcher.refresh_count == 2
@@ -0,0 +1,5 @@
+"""
+TrendRadar 公共组件
+
+main.py 与 MCP Server 共用的抓取基础模块。
+"""
@@ -0,0 +1,473 @@
+# coding=utf-8
+"""
+数据源抓取
+
+main.py 与 MCP Server 共用的抓取实现：newsnow 接口与 RSS 源、按主机限速、
+连接池复用、RSS 条件请求缓存、数据源熔断与可选的并发抓取，
+以及统一的 txt 快照写入。
+"""
+
+import json
+import os
+import random
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import feedparser
+
+from .feed_cache import FeedStateStore
+from .http_client import HttpSessionPool
+from .rate_limiter import HostRateLimiter
+from .source_health import SourceHealthStore
+from .timing import StageTimer
+
+
+DEFAULT_API_BASE_URL = "https://newsnow.busiyi.world"
+
+
+def clean_title(title: str) -> str:
+    if not isinstance(title, str):
+        title = str(title)
+    cleaned_title = title.replace("\n", " ").replace("\r", " ")
+    cleaned_title = re.sub(r"\s+", " ", cleaned_title)
+    return cleaned_title.strip()
+
+
+def write_snapshot(file_path: str, results: Dict, id_to_name: Dict, failed_ids: List) -> str:
+    """将一次抓取结果写入 txt 快照（main.py 与 MCP 共用的格式）"""
+    Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as f:
+        for id_val, titles in results.items():
+            name = id_to_name.get(id_val, id_val)
+            if name != id_val:
+                f.write(f"{id_val} | {name}\n")
+            else:
+                f.write(f"{id_val}\n")
+            
+            # 按排名排序
+            sorted_titles = []
+            for title, info in titles.items():
+                cleaned_title = clean_title(title)
+                ranks = info.get("ranks", [])
+                url = info.get("url", "")
+                mobile_url = info.get("mobileUrl", "")
+                rank = ranks[0] if ranks else 1
+                sorted_titles.append((rank, cleaned_title, url, mobile_url))
+            
+            sorted_titles.sort(key=lambda x: x[0])
+            
+            for rank, cleaned_title, url, mobile_url in sorted_titles:
+                line = f"{rank}. {cleaned_title}"
+                if url:
+                    line += f" [URL:{url}]"
+                if mobile_url:
+                    line += f" [MOBILE:{mobile_url}]"
+                f.write(line + "\n")
+            
+            f.write("\n")
+        
+        if failed_ids:
+            f.write("==== 以下ID请求失败 ====\n")
+            for id_value in failed_ids:
+                f.write(f"{id_value}\n")
+    
+    return file_path
+
+
+def read_snapshot(file_path: str) -> Tuple[Dict, Dict, List[str]]:
+    """
+    解析 write_snapshot 写出的 txt 快照
+
+    Returns:
+        (titles_by_id, id_to_name, failed_ids)
+        - titles_by_id: {platform_id: {title: {ranks, url, mobileUrl}}}
+        - id_to_name: {platform_id: platform_name}
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    titles_by_id = {}
+    id_to_name = {}
+    failed_ids = []
+
+    for section in content.split("\n\n"):
+        if not section.strip():
+            continue
+
+        lines = section.strip().split("\n")
+        if "==== 以下ID请求失败 ====" in section:
+            failed_ids.extend(
+                line.strip() for line in lines
+                if line.strip() and "==== 以下ID请求失败 ====" not in line
+            )
+            continue
+        if len(lines) < 2:
+            continue
+
+        # 解析header: id | name 或 id
+        header_line = lines[0].strip()
+        if " | " in header_line:
+            source_id, name = (part.strip() for part in header_line.split(" | ", 1))
+        else:
+            source_id = name = header_line
+        id_to_name[source_id] = name
+        titles_by_id[source_id] = {}
+
+        # 解析标题行: "rank. title [URL:...] [MOBILE:...]"
+        for line in lines[1:]:
+            title_part = line.strip()
+            if not title_part:
+                continue
+
+            rank = None
+            if ". " in title_part and title_part.split(". ")[0].isdigit():
+                rank_str, title_part = title_part.split(". ", 1)
+                rank = int(rank_str)
+
+            mobile_url = ""
+            if " [MOBILE:" in title_part:
+                title_part, mobile_part = title_part.rsplit(" [MOBILE:", 1)
+                if mobile_part.endswith("]"):
+                    mobile_url = mobile_part[:-1]
+
+            url = ""
+            if " [URL:" in title_part:
+                title_part, url_part = title_part.rsplit(" [URL:", 1)
+                if url_part.endswith("]"):
+                    url = url_part[:-1]
+
+            title = clean_title(title_part)
+            titles_by_id[source_id][title] = {
+                "ranks": [rank] if rank is not None else [1],
+                "url": url,
+                "mobileUrl": mobile_url,
+            }
+
+    return titles_by_id, id_to_name, failed_ids
+
+
+class Crawler:
+    """抓取器：按平台 ID 抓取 newsnow 接口，ID 为 http(s) 地址时按 RSS 源抓取"""
+
+    def __init__(
+        self,
+        proxy_url: Optional[str] = None,
+        max_workers: int = 1,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        http_pool: Optional[HttpSessionPool] = None,
+        feed_store: Optional[FeedStateStore] = None,
+        health_store: Optional[SourceHealthStore] = None,
+        api_base_url: Optional[str] = None,
+        log: Callable[[str], None] = print,
+    ):
+        """
+        Args:
+            proxy_url: 代理地址
+            max_workers: 并发线程数，1 为顺序抓取
+            rate_limiter: 按主机限速器，为空时在 crawl_websites 中按 request_interval 创建
+            http_pool: 共享连接池，为空时创建独立连接池
+            feed_store: RSS 条件请求缓存，为空时不启用
+            health_store: 数据源健康状态（熔断），为空时不启用
+            api_base_url: newsnow 接口地址
+            log: 日志输出函数（MCP stdio 模式下应输出到 stderr）
+        """
+        self.proxy_url = proxy_url
+        self.api_base_url = (api_base_url or DEFAULT_API_BASE_URL).rstrip("/")
+        self.max_workers = max(1, int(max_workers or 1))
+        self.rate_limiter = rate_limiter
+        self.http_pool = http_pool or HttpSessionPool()
+        self.feed_store = feed_store
+        self.health_store = health_store
+        self.log = log
+        self.skipped_ids = []  # 本次因熔断跳过的平台
+        self.stage_timer = None  # 本次运行的耗时记录，由 crawl_websites 注入
+        self.progress_callback = None  # 单个数据源完成时的回调，由 crawl_websites 注入
+
+    @classmethod
+    def from_config(
+        cls,
+        crawler_config: Optional[Dict] = None,
+        state_dir: Optional[str] = None,
+        http_pool: Optional[HttpSessionPool] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        log: Callable[[str], None] = print,
+    ) -> "Crawler":
+        """
+        按 config.yaml 的 crawler 配置创建抓取器（环境变量覆盖规则与 main.py 一致）
+
+        Args:
+            crawler_config: config.yaml 中的 crawler 配置
+            state_dir: 抓取状态目录，为空时使用配置中的 state_dir
+            http_pool: 共享连接池，为空时按 http_pool 配置创建
+            rate_limiter: 共享限速器，为空时按 rate_limit 配置创建
+            log: 日志输出函数
+        """
+        crawler_config = crawler_config or {}
+        state_dir = state_dir or crawler_config.get("state_dir", "output/.crawler_state")
+        max_workers = int(os.environ.get("CRAWLER_MAX_WORKERS", "").strip() or "0") \
+            or crawler_config.get("max_workers", 1)
+        api_base_url = os.environ.get("NEWSNOW_API_URL", "").strip() \
+            or crawler_config.get("api_base_url", DEFAULT_API_BASE_URL)
+        proxy_url = crawler_config.get("default_proxy") if crawler_config.get("use_proxy") else None
+
+        return cls(
+            proxy_url,
+            max_workers,
+            rate_limiter or HostRateLimiter.from_config(
+                crawler_config.get("rate_limit"), crawler_config.get("request_interval", 1000)
+            ),
+            http_pool=http_pool or HttpSessionPool.from_config(crawler_config.get("http_pool")),
+            feed_store=FeedStateStore(state_dir, log=log) if crawler_config.get("rss_conditional_get", True) else None,
+            health_store=SourceHealthStore.from_config(state_dir, crawler_config.get("circuit_breaker"), log=log),
+            api_base_url=api_base_url,
+            log=log,
+        )
+
+    def _throttle(self, url: str):
+        if self.rate_limiter:
+            self.rate_limiter.acquire(url)
+
+    def fetch_data(self, id_info, max_retries=2):
+        id_value = id_info[0] if isinstance(id_info, tuple) else id_info
+        alias = id_info[1] if isinstance(id_info, tuple) else id_value
+        url = f"{self.api_base_url}/api/s?id={id_value}&latest"
+        
+        proxies = {"http": self.proxy_url, "https": self.proxy_url} if self.proxy_url else None
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            "Accept": "application/json, text/plain, */*",
+            "Cache-Control": "no-cache",
+        }
+        
+        for i in range(max_retries + 1):
+            try:
+                self._throttle(url)
+                resp = self.http_pool.get(url, proxies=proxies, headers=headers, timeout=10)
+                resp.raise_for_status()
+                data = resp.json()
+                if data.get("status") in ["success", "cache"]:
+                    self.log(f"✅ 获取 {alias} 成功")
+                    return resp.text, id_value, alias
+            except Exception as e:
+                if i < max_retries:
+                    wait_time = random.uniform(3, 5) + i
+                    self.log(f"⚠️ 请求 {alias} 失败: {e}. {wait_time:.1f}秒后重试...")
+                    time.sleep(wait_time)
+                else:
+                    self.log(f"❌ 请求 {alias} 最终失败")
+        
+        return None, id_value, alias
+
+    def fetch_rss(self, id_value: str, name: str) -> Optional[Dict]:
+        """抓取 RSS 源，返回 {title: {ranks, url, mobileUrl}}，失败返回 None"""
+        self.log(f"📡 正在抓取 RSS: {name}")
+        proxies = {"http": self.proxy_url, "https": self.proxy_url} if self.proxy_url else None
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            "Accept": "application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8",
+        }
+        if self.feed_store:
+            headers.update(self.feed_store.conditional_headers(id_value))
+        try:
+            self._throttle(id_value)
+            resp = self.http_pool.get(id_value, proxies=proxies, headers=headers, timeout=15)
+            
+            # 条件请求命中：源站未更新，复用上次解析结果
+            if resp.status_code == 304 and self.feed_store:
+                titles = self.feed_store.reuse(id_value, "not_modified")
+                if titles is not None:
+                    self.log(f"✅ RSS [{name}] 未更新(304)，复用缓存 {len(titles)} 条")
+                    return titles
+            
+            resp.raise_for_status()
+            content_hash = FeedStateStore.content_hash(resp.content)
+            if self.feed_store:
+                titles = self.feed_store.reuse(id_value, "same_hash", content_hash)
+                if titles is not None:
+                    self.log(f"✅ RSS [{name}] 内容未变化，复用缓存 {len(titles)} 条")
+                    return titles
+            
+            parse_start = time.perf_counter()
+            feed = feedparser.parse(resp.content)
+            if feed.bozo:  # RSS 解析错误
+                self.log(f"⚠️ RSS 解析警告 [{name}]: {feed.bozo_exception}")
+            
+            titles = {}
+            for index, entry in enumerate(feed.entries[:15], 1):  # 取前15条
+                title = entry.get("title", "无标题")
+                url = entry.get("link", "")
+                
+                if title in titles:
+                    titles[title]["ranks"].append(index)
+                else:
+                    titles[title] = {
+                        "ranks": [index],
+                        "url": url,
+                        "mobileUrl": url
+                    }
+            
+            if self.feed_store:
+                self.feed_store.update(
+                    id_value,
+                    titles,
+                    content_hash,
+                    len(resp.content),
+                    time.perf_counter() - parse_start,
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                )
+            
+            self.log(f"✅ RSS [{name}] 抓取成功，获取 {len(titles)} 条")
+            return titles
+        except Exception as e:
+            self.log(f"❌ RSS 抓取失败 [{name}]: {e}")
+            return None
+
+    def parse_api_response(self, response: str) -> Dict:
+        """解析 newsnow API 响应为 {title: {ranks, url, mobileUrl}}"""
+        data = json.loads(response)
+        titles = {}
+        for index, item in enumerate(data.get("items", []), 1):
+            title = item.get("title")
+            if not title or not str(title).strip():
+                continue
+            
+            title = str(title).strip()
+            url = item.get("url", "")
+            mobile_url = item.get("mobileUrl", "")
+            
+            if title in titles:
+                titles[title]["ranks"].append(index)
+            else:
+                titles[title] = {
+                    "ranks": [index],
+                    "url": url,
+                    "mobileUrl": mobile_url
+                }
+        return titles
+
+    def crawl_source(self, id_info) -> Tuple[str, str, Optional[Dict]]:
+        """抓取单个平台，返回 (id, name, titles)，titles 为 None 表示失败或熔断跳过"""
+        id_value = id_info[0] if isinstance(id_info, tuple) else id_info
+        name = id_info[1] if isinstance(id_info, tuple) else id_value
+
+        max_retries = 2
+        if self.health_store:
+            # 熔断检查：冷却期内直接跳过，冷却结束后的探测请求不重试
+            if not self.health_store.allow_request(id_value):
+                self.log(f"⛔ {name} 连续失败处于熔断冷却期，本次跳过")
+                self.skipped_ids.append(id_value)
+                if self.stage_timer:
+                    self.stage_timer.record_source(id_value, 0.0, ok=False, skipped=True)
+                self._report_progress(id_value, name, "skipped", None, 0.0)
+                return id_value, name, None
+            if self.health_store.is_probing(id_value):
+                max_retries = 0
+
+        start = time.perf_counter()
+        titles = self._fetch_source(id_info, id_value, name, max_retries)
+        latency = time.perf_counter() - start
+        if self.health_store:
+            if titles is None:
+                self.health_store.record_failure(id_value, latency, "抓取失败")
+            else:
+                self.health_store.record_success(id_value, latency)
+        if self.stage_timer:
+            self.stage_timer.record_source(id_value, latency, ok=titles is not None)
+        self._report_progress(id_value, name, "failed" if titles is None else "success", titles, latency)
+        return id_value, name, titles
+
+    def _fetch_source(self, id_info, id_value: str, name: str, max_retries: int = 2) -> Optional[Dict]:
+        # === RSS 抓取逻辑 ===
+        if id_value.startswith("http://") or id_value.startswith("https://"):
+            return self.fetch_rss(id_value, name)
+
+        # 普通 API 抓取
+        response, _, _ = self.fetch_data(id_info, max_retries)
+        if not response:
+            return None
+        try:
+            return self.parse_api_response(response)
+        except Exception as e:
+            self.log(f"❌ 解析 {name} 数据失败: {e}")
+            return None
+
+    def _report_progress(self, id_value: str, name: str, status: str, titles: Optional[Dict], latency: float):
+        if not self.progress_callback:
+            return
+        try:
+            self.progress_callback(id_value, name, status, len(titles) if titles else 0, latency)
+        except Exception as e:
+            self.log(f"⚠️ 抓取进度回调出错: {e}")
+
+    def crawl_websites(
+        self,
+        ids_list,
+        request_interval,
+        stage_timer: Optional[StageTimer] = None,
+        progress_callback: Optional[Callable[[str, str, str, int, float], None]] = None,
+    ):
+        """
+        抓取全部数据源
+
+        Args:
+            ids_list: [(id, name)] 或 [id] 列表
+            request_interval: 未配置限速器时 newsnow 接口的请求间隔（毫秒）
+            stage_timer: 耗时记录，记录每个数据源的抓取耗时
+            progress_callback: 每个数据源完成时回调 (id, name, status, 标题数, 耗时秒)，
+                status 为 success / failed / skipped
+
+        Returns:
+            (results, id_to_name, failed_ids)
+        """
+        # 未注入限速器时沿用 request_interval，仅对 newsnow 接口限速
+        if self.rate_limiter is None:
+            self.rate_limiter = HostRateLimiter.from_config(None, request_interval)
+        self.stage_timer = stage_timer
+        self.progress_callback = progress_callback
+
+        if self.feed_store:
+            self.feed_store.reset_stats()
+        self.skipped_ids = []
+
+        start_time = time.time()
+        concurrent = self.max_workers > 1 and len(ids_list) > 1
+
+        if concurrent:
+            self.log(f"⚡ 并发抓取模式: {min(self.max_workers, len(ids_list))} 个线程")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # map 按提交顺序返回结果，保证输出文件中平台顺序与配置一致
+                outcomes = list(executor.map(self.crawl_source, ids_list))
+        else:
+            outcomes = [self.crawl_source(id_info) for id_info in ids_list]
+
+        results, id_to_name, failed_ids = {}, {}, []
+        for id_value, name, titles in outcomes:
+            id_to_name[id_value] = name
+            if titles is None:
+                failed_ids.append(id_value)
+            else:
+                results[id_value] = titles
+        
+        elapsed = time.time() - start_time
+        mode = "并发" if concurrent else "顺序"
+        self.log(f"\n📊 抓取完成: 成功 {len(results)} 个，失败 {len(failed_ids) - len(self.skipped_ids)} 个，熔断跳过 {len(self.skipped_ids)} 个")
+        self.log(f"⏱️ 抓取总耗时: {elapsed:.2f} 秒（{mode}模式）")
+
+        if self.health_store:
+            self.health_store.save()
+
+        if self.feed_store:
+            self.feed_store.save()
+            feed_stats = self.feed_store.get_stats()
+            self.log(
+                f"🗞️ RSS 缓存: 下载解析 {feed_stats['downloaded']} 个，304 未更新 {feed_stats['not_modified']} 个，"
+                f"内容未变 {feed_stats['same_hash']} 个，节省下载 {feed_stats['bytes_saved'] / 1024:.1f} KB，"
+                f"节省解析 {feed_stats['parse_seconds_saved'] * 1000:.0f} ms"
+            )
+        return results, id_to_name, failed_ids
+
+
@@ -0,0 +1,225 @@
+# coding=utf-8
+"""
+当日累计数据
+
+daily 报告模式需要当天所有匹配新闻的出现次数与排名历史。这里按天维护一份累计状态：
+每个 (数据源, 标题) 记录首次/最后出现时间、出现过的排名、出现次数、链接与命中的词组。
+
+持久化为 daily_YYYYMMDD.json（完整状态）+ daily_YYYYMMDD.jsonl（之后每次运行追加一行本次抓取结果）。
+每次运行只追加一行、只合并本次抓取的标题；日志累计 COMPACT_EVERY 行后把状态整体写回并清空日志。
+daemon 模式下状态常驻内存，只回放其他进程新追加的日志。
+回放、分配序号、追加日志与整理在文件锁内完成，多个进程同时运行时序号不会重复。
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from trendradar.frequency_rules import FrequencyRules
+from trendradar.state_file import locked, write_json
+
+
+def rules_fingerprint(rules: FrequencyRules) -> str:
+    """频率词规则指纹，规则变化时需要重新计算已记录标题的命中词组"""
+    payload = json.dumps([rules.word_groups, rules.filter_words], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class DailyAggregateStore:
+    """按天累计的标题统计"""
+
+    FILE_PREFIX = "daily_"
+    COMPACT_EVERY = 12
+
+    def __init__(self, state_dir: str = "output/.crawler_state"):
+        """
+        初始化当日累计数据
+
+        Args:
+            state_dir: 状态文件所在目录
+        """
+        self.state_dir = Path(state_dir)
+        self._lock = threading.Lock()
+        self._day: Optional[str] = None
+        self._state: Dict = {}
+        self._snapshot_mtime: Optional[int] = None
+        self._journal_offset = 0
+
+    def _paths(self, day: str) -> Tuple[Path, Path]:
+        base = self.state_dir / f"{self.FILE_PREFIX}{day}"
+        return base.with_suffix(".json"), base.with_suffix(".jsonl")
+
+    @staticmethod
+    def _empty_state() -> Dict:
+        return {"version": 1, "seq": 0, "rules": None, "sources": {}, "titles": {}}
+
+    def _refresh(self, day: str, rules: FrequencyRules):
+        """加载指定日期的状态，只回放尚未应用的日志（调用方持有锁）"""
+        snapshot_path, journal_path = self._paths(day)
+        try:
+            snapshot_mtime = snapshot_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            snapshot_mtime = None
+
+        if day != self._day or snapshot_mtime != self._snapshot_mtime:
+            if day != self._day:
+                self._cleanup(day)
+            self._day = day
+            self._state = self._empty_state()
+            self._journal_offset = 0
+            if snapshot_mtime is not None:
+                try:
+                    with open(snapshot_path, "r", encoding="utf-8") as f:
+                        self._state = json.load(f)
+                except Exception as e:
+                    print(f"⚠️ 读取当日累计数据失败，将从日志重建: {e}")
+            self._snapshot_mtime = snapshot_mtime
+
+        fingerprint = rules_fingerprint(rules)
+        if self._state.get("rules") != fingerprint:
+            self._regroup(rules, fingerprint)
+
+        if not journal_path.exists():
+            return
+        with open(journal_path, "rb") as f:
+            f.seek(self._journal_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # 另一个进程正在写入的半行，下次再读
+                self._journal_offset += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("seq", 0) > self._state["seq"]:
+                    self._apply(entry, rules)
+
+    def _cleanup(self, day: str):
+        """删除其他日期的累计文件"""
+        snapshot_path, journal_path = self._paths(day)
+        keep = {snapshot_path.name, journal_path.name, f"{snapshot_path.name}.lock"}
+        for old_file in self.state_dir.glob(f"{self.FILE_PREFIX}*.json*"):
+            if old_file.name not in keep:
+                try:
+                    old_file.unlink()
+                except OSError:
+                    pass
+
+    def _regroup(self, rules: FrequencyRules, fingerprint: str):
+        """频率词规则变化后重新计算所有标题的命中词组"""
+        for titles in self._state["titles"].values():
+            for title, info in titles.items():
+                group = rules.match(title)
+                info["group"] = group["group_key"] if group else None
+        self._state["rules"] = fingerprint
+
+    def _apply(self, entry: Dict, rules: FrequencyRules):
+        """合并一次抓取结果，开销只与这次抓取的标题数有关"""
+        crawl_time = entry["time"]
+        self._state["seq"] = entry["seq"]
+        self._state["sources"].update(entry.get("sources", {}))
+        all_titles = self._state["titles"]
+        for source_id, items in entry["titles"].items():
+            titles = all_titles.setdefault(source_id, {})
+            for title, rank, url, mobile_url in items:
+                info = titles.get(title)
+                if info is None:
+                    group = rules.match(title)
+                    titles[title] = {
+                        "first_time": crawl_time,
+                        "last_time": crawl_time,
+                        "ranks": [rank] if rank is not None else [],
+                        "count": 1,
+                        "url": url,
+                        "mobileUrl": mobile_url,
+                        "group": group["group_key"] if group else None,
+                    }
+                    continue
+                info["last_time"] = crawl_time
+                info["count"] += 1
+                if rank is not None and rank not in info["ranks"]:
+                    info["ranks"].append(rank)
+                info["url"] = url or info["url"]
+                info["mobileUrl"] = mobile_url or info["mobileUrl"]
+
+    def _compact(self, day: str):
+        """把当前状态写回完整快照并清空日志（先写临时文件再替换）"""
+        snapshot_path, journal_path = self._paths(day)
+        write_json(snapshot_path, self._state)
+        # 快照中记录了 seq，替换后、清空日志前中断时重放会跳过已合并的行
+        journal_path.unlink(missing_ok=True)
+        self._snapshot_mtime = snapshot_path.stat().st_mtime_ns
+        self._journal_offset = 0
+
+    def update(
+        self,
+        results: Dict,
+        id_to_name: Dict,
+        crawl_time: str,
+        day: str,
+        rules: FrequencyRules,
+    ) -> Tuple[Dict, Dict]:
+        """
+        合并本次抓取结果并返回当日累计数据
+
+        Args:
+            results: 本次抓取结果 {数据源ID: {标题: {ranks, url, mobileUrl}}}
+            id_to_name: 数据源ID → 名称
+            crawl_time: 本次抓取时间（HH:MM）
+            day: 日期（YYYYMMDD）
+            rules: 频率词规则，用于记录每个标题命中的词组
+
+        Returns:
+            (累计结果, 数据源名称)：累计结果结构与 results 相同，
+            每个标题另含 count / first_time / last_time / group
+        """
+        with self._lock:
+            entry = None
+            try:
+                with locked(self._paths(day)[0]):
+                    entry = self._merge(results, id_to_name, crawl_time, day, rules)
+                    self._save(entry, day)
+            except Exception as e:
+                print(f"⚠️ 保存当日累计数据失败: {e}")
+                if entry is None:
+                    # 无法加锁时仍合并到内存状态，本次报告不受影响
+                    self._merge(results, id_to_name, crawl_time, day, rules)
+
+            return self._state["titles"], dict(self._state["sources"])
+
+    def _merge(
+        self,
+        results: Dict,
+        id_to_name: Dict,
+        crawl_time: str,
+        day: str,
+        rules: FrequencyRules,
+    ) -> Dict:
+        """回放其他进程的日志后合并本次抓取结果，返回本次的日志条目"""
+        self._refresh(day, rules)
+        entry = {
+            "seq": self._state["seq"] + 1,
+            "time": crawl_time,
+            "sources": dict(id_to_name),
+            "titles": {
+                source_id: [
+                    [title, (data.get("ranks") or [None])[0], data.get("url", ""), data.get("mobileUrl", "")]
+                    for title, data in titles.items()
+                ]
+                for source_id, titles in results.items()
+            },
+        }
+        self._apply(entry, rules)
+        return entry
+
+    def _save(self, entry: Dict, day: str):
+        """追加本次的日志，累计 COMPACT_EVERY 行后整理（调用方持有文件锁）"""
+        _, journal_path = self._paths(day)
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        # 不移动已读位置：下次刷新读到这一行时 seq 已应用，会直接跳过
+        with open(journal_path, "a", encoding="utf-8") as f:
+            f.write(line)
+        if self._state["seq"] % self.COMPACT_EVERY == 0:
+            self._compact(day)
@@ -0,0 +1,151 @@
+"""
+RSS 条件请求缓存
+
+持久化记录每个 RSS 源的 ETag、Last-Modified、内容哈希和上次解析结果。
+请求时携带条件头，源站返回 304 或内容哈希未变时直接复用上次的解析结果，
+省去下载和 feedparser 解析的开销。
+"""
+
+import copy
+import hashlib
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from .state_file import locked, read_json, write_json
+
+
+class FeedStateStore:
+    """RSS 源状态存储"""
+
+    STATE_FILE = "feed_state.json"
+
+    def __init__(self, state_dir: str = "output/.crawler_state", log: Callable[[str], None] = print):
+        """
+        初始化状态存储
+
+        Args:
+            state_dir: 状态文件所在目录
+            log: 日志输出函数（MCP stdio 模式下应输出到 stderr）
+        """
+        self.state_dir = Path(state_dir)
+        self.state_file = self.state_dir / self.STATE_FILE
+        self.log = log
+        self._lock = threading.Lock()
+        self._dirty = set()  # 本进程更新过、尚未写回的 RSS 地址
+        self._feeds: Dict[str, Dict] = self._load()
+        self.reset_stats()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            return (read_json(self.state_file) or {}).get("feeds", {})
+        except Exception as e:
+            self.log(f"⚠️ 读取 RSS 缓存失败，将重新抓取: {e}")
+            return {}
+
+    def save(self):
+        """
+        写回磁盘：持有文件锁重新读取最新状态，只覆盖本进程更新过的 RSS 源，
+        其他进程同时写入的记录不会丢失
+        """
+        try:
+            with locked(self.state_file):
+                feeds = self._load()
+                with self._lock:
+                    feeds.update({url: self._feeds[url] for url in self._dirty})
+                    write_json(self.state_file, {"version": 1, "feeds": feeds})
+                    self._feeds = feeds
+                    self._dirty.clear()
+        except Exception as e:
+            self.log(f"⚠️ 保存 RSS 缓存失败: {e}")
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        生成条件请求头
+
+        Args:
+            url: RSS 地址
+
+        Returns:
+            If-None-Match / If-Modified-Since 请求头，无缓存时为空
+        """
+        with self._lock:
+            state = self._feeds.get(url)
+        headers = {}
+        if state and state.get("titles") is not None:
+            if state.get("etag"):
+                headers["If-None-Match"] = state["etag"]
+            if state.get("last_modified"):
+                headers["If-Modified-Since"] = state["last_modified"]
+        return headers
+
+    def reuse(self, url: str, reason: str, content_hash: Optional[str] = None) -> Optional[Dict]:
+        """
+        复用上次的解析结果
+
+        Args:
+            url: RSS 地址
+            reason: "not_modified"（源站返回 304）或 "same_hash"（内容哈希未变）
+            content_hash: 本次下载内容的哈希，reason 为 same_hash 时用于校验
+
+        Returns:
+            上次解析得到的标题字典，缓存不可用时返回 None
+        """
+        with self._lock:
+            state = self._feeds.get(url)
+            if not state or state.get("titles") is None:
+                return None
+            if reason == "same_hash" and state.get("content_hash") != content_hash:
+                return None
+
+            if reason == "not_modified":
+                self._stats["not_modified"] += 1
+                self._stats["bytes_saved"] += state.get("content_length", 0)
+            else:
+                self._stats["same_hash"] += 1
+            self._stats["parse_seconds_saved"] += state.get("parse_seconds", 0)
+            return copy.deepcopy(state["titles"])
+
+    def update(self, url: str, titles: Dict, content_hash: str, content_length: int, parse_seconds: float,
+               etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        记录一次完整下载与解析的结果
+
+        Args:
+            url: RSS 地址
+            titles: 解析得到的标题字典
+            content_hash: 内容哈希
+            content_length: 内容字节数
+            parse_seconds: 解析耗时（秒）
+            etag: 响应头 ETag
+            last_modified: 响应头 Last-Modified
+        """
+        with self._lock:
+            self._feeds[url] = {
+                "etag": etag or "",
+                "last_modified": last_modified or "",
+                "content_hash": content_hash,
+                "content_length": content_length,
+                "parse_seconds": round(parse_seconds, 4),
+                "titles": copy.deepcopy(titles),
+            }
+            self._dirty.add(url)
+            self._stats["downloaded"] += 1
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {
+                "downloaded": 0,
+                "not_modified": 0,
+                "same_hash": 0,
+                "bytes_saved": 0,
+                "parse_seconds_saved": 0.0,
+            }
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,112 @@
+# coding=utf-8
+"""
+频率词规则
+
+解析 config/frequency_words.txt 并编译为 KeywordMatcher，main.py 与 MCP Server 共用。
+文件格式：空行分隔词组，每行一个词；"+" 前缀为必须词，"!" 前缀为过滤词（对所有词组生效），
+其余为普通词。解析结果按 (路径, mtime, 大小) 缓存，文件未修改时直接复用编译好的匹配器。
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from trendradar.keyword_matcher import KeywordMatcher
+
+DEFAULT_FREQUENCY_FILE = "config/frequency_words.txt"
+
+
+def parse_frequency_words(content: str) -> Tuple[List[Dict], List[str]]:
+    """
+    解析频率词文件内容
+
+    Returns:
+        (词组列表, 过滤词列表)，词组包含 required / normal / group_key
+    """
+    word_groups = [group.strip() for group in content.split("\n\n") if group.strip()]
+    processed_groups = []
+    filter_words = []
+
+    for group in word_groups:
+        words = [word.strip() for word in group.split("\n") if word.strip()]
+        group_required_words = []
+        group_normal_words = []
+
+        for word in words:
+            if word.startswith("!"):
+                filter_words.append(word[1:])
+            elif word.startswith("+"):
+                group_required_words.append(word[1:])
+            else:
+                group_normal_words.append(word)
+
+        if group_required_words or group_normal_words:
+            group_key = " ".join(group_normal_words) if group_normal_words else " ".join(group_required_words)
+            processed_groups.append({
+                "required": group_required_words,
+                "normal": group_normal_words,
+                "group_key": group_key
+            })
+
+    return processed_groups, filter_words
+
+
+class FrequencyRules:
+    """解析并编译好的频率词规则（只读，可跨线程共享）"""
+
+    def __init__(
+        self,
+        word_groups: List[Dict],
+        filter_words: List[str],
+        path: Optional[str] = None,
+        version: Optional[Tuple] = None,
+    ):
+        self.word_groups = word_groups
+        self.filter_words = filter_words
+        self.path = path
+        self.version = version  # 读取时文件的 (mtime, 大小)，文件修改后变化
+        self.matcher = KeywordMatcher(word_groups, filter_words)
+
+    def match(self, title) -> Optional[Dict]:
+        """标题命中的第一个词组，被过滤或未命中时返回 None"""
+        return self.matcher.match(title)
+
+
+_rules_cache: Dict[str, Tuple[Tuple[float, int], FrequencyRules]] = {}
+_rules_lock = threading.Lock()
+
+
+def load_frequency_rules(frequency_file: Optional[str] = None) -> FrequencyRules:
+    """
+    读取频率词规则，文件未修改时返回缓存的同一个对象
+
+    Args:
+        frequency_file: 频率词文件路径，默认取环境变量 FREQUENCY_WORDS_PATH 或 config/frequency_words.txt
+
+    Raises:
+        FileNotFoundError: 文件不存在
+    """
+    if frequency_file is None:
+        frequency_file = os.environ.get("FREQUENCY_WORDS_PATH", DEFAULT_FREQUENCY_FILE)
+
+    path = Path(frequency_file)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"频率词文件 {frequency_file} 不存在")
+
+    key = str(path.resolve())
+    signature = (stat.st_mtime, stat.st_size)
+    with _rules_lock:
+        cached = _rules_cache.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+    with open(path, "r", encoding="utf-8") as f:
+        word_groups, filter_words = parse_frequency_words(f.read())
+    rules = FrequencyRules(word_groups, filter_words, str(path), signature)
+
+    with _rules_lock:
+        _rules_cache[key] = (signature, rules)
+    return rules
@@ -0,0 +1,102 @@
+"""
+HTTP 连接池
+
+基于 requests.Session 的共享连接池，抓取、版本检查和 webhook 推送共用，
+同一主机的请求复用 TCP/TLS 连接，并统计连接复用情况。
+"""
+
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HttpSessionPool:
+    """带连接池的共享 HTTP 会话"""
+
+    def __init__(self, pool_connections: int = 32, pool_maxsize: int = 8, keep_alive: bool = True):
+        """
+        初始化连接池
+
+        Args:
+            pool_connections: 缓存连接池的主机数量，超出后最久未用的主机连接会被关闭
+            pool_maxsize: 每个主机最多同时保持的连接数，超出时请求排队等待空闲连接
+            keep_alive: 是否复用连接，False 时每次请求后关闭连接
+        """
+        self.keep_alive = keep_alive
+        self.session = requests.Session()
+        # 重试由调用方控制，连接池层不做自动重试
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+            max_retries=0,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._adapters = [adapter]
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    @classmethod
+    def from_config(cls, http_pool: Optional[Dict] = None) -> "HttpSessionPool":
+        """
+        根据 config.yaml 中 crawler.http_pool 配置创建连接池
+
+        Args:
+            http_pool: crawler.http_pool 配置节，None 时使用默认值
+
+        Returns:
+            连接池实例
+        """
+        http_pool = http_pool or {}
+        return cls(
+            pool_connections=int(http_pool.get("pool_connections", 32)),
+            pool_maxsize=int(http_pool.get("pool_maxsize", 8)),
+            keep_alive=bool(http_pool.get("keep_alive", True)),
+        )
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.session.post(url, **kwargs)
+
+    def connection_stats(self, since: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """
+        统计连接池的请求数与新建连接数（近似值，服务端主动断开后的重连不计入新建）
+
+        Args:
+            since: 之前调用本方法得到的快照，传入时返回两次之间的增量
+
+        Returns:
+            {"requests": 请求数, "new_connections": 新建连接数, "reused": 复用连接的请求数}
+        """
+        total_requests = 0
+        new_connections = 0
+        for adapter in self._adapters:
+            managers = [adapter.poolmanager, *adapter.proxy_manager.values()]
+            for manager in managers:
+                for key in manager.pools.keys():
+                    pool = manager.pools.get(key)
+                    if pool is None:
+                        continue
+                    total_requests += pool.num_requests
+                    new_connections += pool.num_connections
+
+        # 关闭 keep-alive 时 urllib3 会在原连接对象上重新建连，按每次请求新建连接计
+        if not self.keep_alive:
+            new_connections = total_requests
+
+        if since:
+            total_requests -= since.get("requests", 0)
+            new_connections -= since.get("new_connections", 0)
+
+        return {
+            "requests": total_requests,
+            "new_connections": new_connections,
+            "reused": max(0, total_requests - new_connections),
+        }
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,148 @@
+# coding=utf-8
+"""
+频率词多模式匹配
+
+把频率词组（必须词 + / 普通词）和过滤词（!）编译成一个 Aho-Corasick 自动机，
+每个标题只扫描一遍即可得到命中的全部词语，再据此判断是否被过滤以及命中的第一个词组。
+匹配语义与逐词 `word in title` 判断一致（均先转小写）：
+  - 命中任一过滤词的标题直接排除
+  - 词组要求所有必须词都出现，且有普通词时至少出现一个普通词
+  - 多个词组同时满足时取配置中靠前的词组
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+
+class KeywordMatcher:
+    """编译后的频率词匹配器（构建后只读，可跨线程共享）"""
+
+    def __init__(self, word_groups: List[Dict], filter_words: List[str]):
+        """
+        编译频率词
+
+        Args:
+            word_groups: 词组列表，每项包含 required / normal / group_key
+            filter_words: 过滤词列表
+        """
+        self.word_groups = word_groups
+        self._word_ids: Dict[str, int] = {}
+        self._filter_ids: Set[int] = {self._word_id(word) for word in filter_words}
+        self._group_required: List[Set[int]] = []
+        self._group_normal: List[Set[int]] = []
+        # 词语 → 引用它的词组序号，只需检查命中词语所在的词组
+        self._word_groups_index: Dict[int, List[int]] = {}
+        # 没有任何词语的词组（如"全部新闻"）对所有标题都成立
+        self._catch_all_group: Optional[int] = None
+
+        for index, group in enumerate(word_groups):
+            required = {self._word_id(word) for word in group["required"]}
+            normal = {self._word_id(word) for word in group["normal"]}
+            self._group_required.append(required)
+            self._group_normal.append(normal)
+            if not required and not normal and self._catch_all_group is None:
+                self._catch_all_group = index
+            for word_id in required | normal:
+                self._word_groups_index.setdefault(word_id, []).append(index)
+
+        self._build_automaton()
+
+    def _word_id(self, word: str) -> int:
+        word = word.lower()
+        if word not in self._word_ids:
+            self._word_ids[word] = len(self._word_ids)
+        return self._word_ids[word]
+
+    def _build_automaton(self):
+        # 状态 0 为根；goto[state] 为字符 → 下一状态，outputs[state] 为到达该状态时命中的词语
+        self._goto: List[Dict[str, int]] = [{}]
+        outputs: List[Set[int]] = [set()]
+        # 空字符串在任何标题中都"出现"
+        self._always_hit: Set[int] = set()
+
+        for word, word_id in self._word_ids.items():
+            if not word:
+                self._always_hit.add(word_id)
+                continue
+            state = 0
+            for char in word:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    outputs.append(set())
+                state = next_state
+            outputs[state].add(word_id)
+
+        # 广度优先计算失败指针，并把失败链上的输出合并到当前状态
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                outputs[next_state] |= outputs[self._fail[next_state]]
+
+        self._outputs = [frozenset(words) for words in outputs]
+
+    def find_words(self, text: str) -> Set[int]:
+        """扫描一遍文本，返回出现的词语编号（文本需已转小写）"""
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        hits = set(self._always_hit)
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                hits |= outputs[state]
+        return hits
+
+    def match(self, title) -> Optional[Dict]:
+        """
+        返回标题命中的第一个词组
+
+        Returns:
+            命中的词组；标题为空、命中过滤词或不满足任何词组时返回 None
+        """
+        if not isinstance(title, str):
+            title = str(title) if title is not None else ""
+        if not title.strip():
+            return None
+
+        hits = self.find_words(title.lower())
+        if hits & self._filter_ids:
+            return None
+
+        best = self._catch_all_group
+        candidates = set()
+        for word_id in hits:
+            candidates.update(self._word_groups_index.get(word_id, ()))
+        for index in sorted(candidates):
+            if best is not None and index > best:
+                break
+            if not self._group_required[index] <= hits:
+                continue
+            normal = self._group_normal[index]
+            if normal and normal.isdisjoint(hits):
+                continue
+            best = index
+            break
+
+        return self.word_groups[best] if best is not None else None
+
+    def matches(self, title) -> bool:
+        """标题是否通过过滤并命中任一词组（没有词组时所有非空标题都算命中）"""
+        if not self.word_groups:
+            if not isinstance(title, str):
+                title = str(title) if title is not None else ""
+            return bool(title.strip())
+        return self.match(title) is not None
@@ -0,0 +1,123 @@
+# coding=utf-8
+"""
+Cron 表达式调度
+
+解析标准 5 段 cron 表达式（分 时 日 月 周），供 daemon 模式在单个进程内
+按 CRON_SCHEDULE 定时执行，不再依赖 supercronic 每次拉起新进程。
+"""
+
+from datetime import datetime, timedelta
+from typing import Set
+
+
+# 每段的取值范围 (最小值, 最大值)
+_FIELD_RANGES = [
+    (0, 59),  # 分钟
+    (0, 23),  # 小时
+    (1, 31),  # 日
+    (1, 12),  # 月
+    (0, 6),   # 星期（0 = 周日，7 也视为周日）
+]
+
+_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+# 最多向后搜索的天数，防止 "0 0 31 2 *" 这类永远不会触发的表达式死循环
+_MAX_SEARCH_DAYS = 366 * 5
+
+
+def _parse_field(field: str, min_value: int, max_value: int) -> Set[int]:
+    """解析单个字段，支持 *、*/n、a-b、a-b/n、a/n 以及逗号列表"""
+    values = set()
+    for part in field.split(","):
+        if not part:
+            raise ValueError(f"cron 字段为空: {field!r}")
+
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/", 1)
+            step = int(step_str)
+            if step <= 0:
+                raise ValueError(f"cron 步长必须大于 0: {field!r}")
+
+        if part == "*":
+            start, end = min_value, max_value
+        elif "-" in part:
+            start_str, end_str = part.split("-", 1)
+            start, end = int(start_str), int(end_str)
+        else:
+            start = int(part)
+            end = max_value if step > 1 else start
+
+        if start < min_value or end > max_value or start > end:
+            raise ValueError(f"cron 字段超出范围 [{min_value}-{max_value}]: {field!r}")
+
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """5 段 cron 表达式，按传入时间的时区计算下一次触发时间"""
+
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        expanded = _ALIASES.get(self.expression.lower(), self.expression)
+        fields = expanded.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 表达式需要 5 个字段: {expression!r}")
+
+        # 星期字段允许 7 表示周日
+        weekday_field = fields[4]
+        self.minutes = _parse_field(fields[0], *_FIELD_RANGES[0])
+        self.hours = _parse_field(fields[1], *_FIELD_RANGES[1])
+        self.days = _parse_field(fields[2], *_FIELD_RANGES[2])
+        self.months = _parse_field(fields[3], *_FIELD_RANGES[3])
+        self.weekdays = {
+            value % 7 for value in _parse_field(weekday_field, 0, 7)
+        }
+
+        # 与 cron 语义一致：日和星期都被限制时，两者满足其一即可
+        self._day_restricted = fields[2] != "*"
+        self._weekday_restricted = weekday_field != "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        # Python weekday(): 周一 = 0；cron: 周日 = 0
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_run(self, after: datetime) -> datetime:
+        """返回严格晚于 after 的下一次触发时间（精确到分钟）"""
+        candidate = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        deadline = candidate + timedelta(days=_MAX_SEARCH_DAYS)
+
+        while candidate < deadline:
+            if candidate.month not in self.months:
+                # 跳到下个月 1 日 00:00
+                year = candidate.year + candidate.month // 12
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(
+                    year=year, month=month, day=1, hour=0, minute=0
+                )
+                continue
+            if not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+
+        raise ValueError(f"cron 表达式在 {_MAX_SEARCH_DAYS} 天内不会触发: {self.expression!r}")
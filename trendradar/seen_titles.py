@@ -0,0 +1,129 @@
+# coding=utf-8
+"""
+当日已出现标题记录
+
+incremental 报告模式用它判断哪些标题是本次新出现的。每个 (数据源, 标题) 取 8 字节哈希，
+按天追加写入 seen_YYYYMMDD.bin。每次运行只读取文件中上次之后追加的部分、只追加本次的新标题，
+开销与本次抓取量成正比，不需要重新解析当天之前的 txt 快照。
+追加前在文件锁内重新读取其他进程追加的部分，同一标题不会被多个进程重复记录。
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Set
+
+from trendradar.state_file import locked
+
+HASH_SIZE = 8
+
+
+def title_hash(source_id: str, title: str) -> bytes:
+    return hashlib.blake2b(f"{source_id}\n{title}".encode("utf-8"), digest_size=HASH_SIZE).digest()
+
+
+class SeenTitleStore:
+    """按天持久化的已出现标题哈希集合"""
+
+    FILE_PREFIX = "seen_"
+
+    def __init__(self, state_dir: str = "output/.crawler_state"):
+        """
+        初始化已出现标题记录
+
+        Args:
+            state_dir: 状态文件所在目录
+        """
+        self.state_dir = Path(state_dir)
+        self._lock = threading.Lock()
+        self._day = None
+        self._hashes: Set[bytes] = set()
+        self._offset = 0  # 已读入内存的文件长度
+
+    def _path(self, day: str) -> Path:
+        return self.state_dir / f"{self.FILE_PREFIX}{day}.bin"
+
+    def _refresh(self, day: str):
+        """切换到指定日期，并读入文件中尚未加载的部分（调用方持有锁）"""
+        if day != self._day:
+            self._day = day
+            self._hashes = set()
+            self._offset = 0
+            self._cleanup(day)
+
+        path = self._path(day)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size < self._offset:
+            # 文件被截断或替换，整体重新加载
+            self._hashes = set()
+            self._offset = 0
+        if size == self._offset:
+            return
+
+        with open(path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+        usable = len(data) - len(data) % HASH_SIZE
+        self._hashes.update(data[i:i + HASH_SIZE] for i in range(0, usable, HASH_SIZE))
+        self._offset += usable
+
+    def _cleanup(self, day: str):
+        """删除其他日期的记录文件（及其锁文件）"""
+        path = self._path(day)
+        keep = {path.name, f"{path.name}.lock"}
+        for old_file in self.state_dir.glob(f"{self.FILE_PREFIX}*.bin*"):
+            if old_file.name not in keep:
+                try:
+                    old_file.unlink()
+                except OSError:
+                    pass
+
+    def filter_new(self, results: Dict, day: str) -> Dict:
+        """
+        返回当天之前的运行中没有出现过的标题
+
+        Args:
+            results: {数据源ID: {标题: 标题数据}}
+            day: 日期（YYYYMMDD）
+
+        Returns:
+            与 results 结构相同，只包含新标题
+        """
+        with self._lock:
+            self._refresh(day)
+            new_results = {}
+            for source_id, titles in results.items():
+                new_titles = {
+                    title: data for title, data in titles.items()
+                    if title_hash(source_id, title) not in self._hashes
+                }
+                if new_titles:
+                    new_results[source_id] = new_titles
+            return new_results
+
+    def mark_seen(self, results: Dict, day: str) -> int:
+        """
+        记录本次出现的标题（只追加尚未记录的部分）
+
+        Returns:
+            新记录的标题数量
+        """
+        with self._lock, locked(self._path(day)):
+            self._refresh(day)
+            pending = []
+            for source_id, titles in results.items():
+                for title in titles:
+                    digest = title_hash(source_id, title)
+                    if digest not in self._hashes:
+                        self._hashes.add(digest)
+                        pending.append(digest)
+            if not pending:
+                return 0
+
+            # 不移动已读位置：下次刷新时会重新读到这些哈希（集合去重）
+            with open(self._path(day), "ab") as f:
+                f.write(b"".join(pending))
+            return len(pending)
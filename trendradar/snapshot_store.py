@@ -0,0 +1,661 @@
+# coding=utf-8
+"""
+SQLite 快照存储
+
+每次抓取写入一个快照：snapshots（抓取批次）、platforms（平台）、
+titles（按 日期+平台+标题 去重）和 rank_observations（每个快照中标题的排名）。
+查询按日期/平台走索引，耗时只与命中的行数相关，与当天抓取次数无关。
+titles_fts 为标题的全文索引（字符二元组），随每次写入增量更新，供 MCP 新闻检索使用。
+
+txt 快照迁移:
+    python -m trendradar.snapshot_store import [output目录] [--db 数据库路径]
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .crawler import clean_title, read_snapshot
+
+
+DEFAULT_DB_PATH = "output/trendradar.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,                 -- YYYY-MM-DD（北京时间）
+    label TEXT NOT NULL,                -- 与 txt 快照同名，如 "09时30分.txt"
+    crawled_at REAL NOT NULL,           -- Unix 时间戳
+    source TEXT NOT NULL DEFAULT 'crawler',
+    failed_ids TEXT NOT NULL DEFAULT '[]',
+    UNIQUE (date, label)
+);
+
+CREATE TABLE IF NOT EXISTS platforms (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS titles (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    platform_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL DEFAULT '',
+    mobile_url TEXT NOT NULL DEFAULT '',
+    UNIQUE (date, platform_id, title)
+);
+
+CREATE TABLE IF NOT EXISTS rank_observations (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    title_id INTEGER NOT NULL REFERENCES titles (id),
+    rank INTEGER NOT NULL,
+    PRIMARY KEY (snapshot_id, title_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_snapshots_date ON snapshots (date, crawled_at);
+CREATE INDEX IF NOT EXISTS idx_observations_title ON rank_observations (title_id);
+
+-- 标题全文索引：rowid 对应 titles.id，内容为标题的字符二元组（见 search_tokens）
+CREATE VIRTUAL TABLE IF NOT EXISTS titles_fts USING fts5 (tokens, content = '', tokenize = 'unicode61');
+
+-- 按小时分桶的出现记录：标题在该小时内出现的快照数与最好排名，供小时级趋势分析直接查表
+CREATE TABLE IF NOT EXISTS mention_buckets (
+    title_id INTEGER NOT NULL REFERENCES titles (id),
+    hour INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    snapshots INTEGER NOT NULL,
+    best_rank INTEGER NOT NULL,
+    PRIMARY KEY (title_id, hour)
+) WITHOUT ROWID;
+"""
+
+# 把 titles 中尚未建立全文索引的标题补入 titles_fts（titles.id 单调递增，只需处理最大 rowid 之后的行）
+_INDEX_NEW_TITLES = """
+INSERT INTO titles_fts (rowid, tokens)
+SELECT id, search_tokens(title) FROM titles
+WHERE id > IFNULL((SELECT rowid FROM titles_fts ORDER BY rowid DESC LIMIT 1), 0)
+"""
+
+# 由快照排名汇总小时分桶（快照名称以 "HH时" 开头，小时取自名称，与日期目录同为北京时间）
+_BUILD_BUCKETS = """
+INSERT OR REPLACE INTO mention_buckets (title_id, hour, date, snapshots, best_rank)
+SELECT o.title_id, CAST(substr(s.label, 1, 2) AS INTEGER), s.date, COUNT(*), MIN(o.rank)
+FROM snapshots s JOIN rank_observations o ON o.snapshot_id = s.id
+WHERE s.label GLOB '[0-2][0-9]时*' {condition}
+GROUP BY o.title_id, CAST(substr(s.label, 1, 2) AS INTEGER)
+"""
+
+_DATE_FOLDER = re.compile(r"^(\d{4})年(\d{2})月(\d{2})日$")
+_LABEL_TIME = re.compile(r"^(\d{2})时(\d{2})分")
+
+
+def _bigrams(text: str) -> List[str]:
+    """文本（小写）中相邻两个字母/数字字符组成的二元组，去重并保持出现顺序"""
+    text = text.lower()
+    grams = []
+    for first, second in zip(text, text[1:]):
+        if first.isalnum() and second.isalnum():
+            gram = first + second
+            if gram not in grams:
+                grams.append(gram)
+    return grams
+
+
+def search_tokens(title: str) -> str:
+    """
+    标题的全文索引内容
+
+    中文没有空格分词，这里对中英文统一按字符二元组建索引：
+    任何长度不小于 2 的子串，其二元组都包含在标题的二元组中，
+    因此用二元组检索得到的候选集合覆盖所有子串匹配，再由调用方做精确的子串校验。
+    """
+    return " ".join(_bigrams(title))
+
+
+def build_match_query(terms: List[str]) -> Optional[str]:
+    """
+    构造 FTS5 查询：同一检索词的二元组取交集，多个检索词之间取并集
+
+    Returns:
+        MATCH 表达式；任一检索词无法生成二元组（如单个汉字）时返回 None，调用方应改为逐条匹配
+    """
+    clauses = []
+    for term in terms:
+        grams = _bigrams(term)
+        if not grams:
+            return None
+        clauses.append("(" + " AND ".join(f'"{gram}"' for gram in grams) + ")")
+    return " OR ".join(clauses) if clauses else None
+
+
+def date_key(date: datetime) -> str:
+    return date.strftime("%Y-%m-%d")
+
+
+def snapshot_label(moment: datetime) -> str:
+    """快照名称，与 txt 快照文件名一致"""
+    return moment.strftime("%H时%M分") + ".txt"
+
+
+def label_bounds(start_time: Optional[str] = None, end_time: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    把 "HH:MM" 时间范围转换为快照名称的比较边界 [lower, upper)
+
+    快照名称以 "HH时MM分" 开头，按字符串比较即按时间顺序；end_time 包含当分钟的快照。
+    """
+    lower = upper = None
+    if start_time:
+        hour, minute = (int(part) for part in start_time.split(":"))
+        lower = f"{hour:02d}时{minute:02d}分"
+    if end_time:
+        hour, minute = (int(part) for part in end_time.split(":"))
+        hour, minute = divmod(hour * 60 + minute + 1, 60)
+        upper = f"{hour:02d}时{minute:02d}分"
+    return lower, upper
+
+
+def label_time(label: str) -> Optional[str]:
+    """快照名称对应的 "HH:MM"，名称不是标准格式时返回 None"""
+    match = _LABEL_TIME.match(label)
+    return f"{match.group(1)}:{match.group(2)}" if match else None
+
+
+class SnapshotStore:
+    """抓取快照的 SQLite 存储（WAL 模式，支持抓取进程写入、MCP 进程并发读取）"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return self.db_path.exists()
+
+    @contextmanager
+    def _connect(self, readonly: bool = False) -> Iterator[sqlite3.Connection]:
+        if readonly:
+            uri = f"file:{self.db_path.resolve().as_posix()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=30)
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            conn.execute("PRAGMA foreign_keys = ON")
+            if not readonly:
+                self._ensure_schema(conn)
+            yield conn
+        finally:
+            conn.close()
+
+    def _ensure_schema(self, conn: sqlite3.Connection):
+        if self._initialized:
+            return
+        with self._init_lock:
+            if self._initialized:
+                return
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(_SCHEMA)
+            # 旧版本创建的数据库没有全文索引，首次打开时补建
+            conn.create_function("search_tokens", 1, search_tokens, deterministic=True)
+            conn.execute(_INDEX_NEW_TITLES)
+            # 旧版本数据库没有小时分桶，首次打开时全量生成
+            if not conn.execute("SELECT 1 FROM mention_buckets LIMIT 1").fetchone():
+                conn.execute(_BUILD_BUCKETS.format(condition=""))
+            conn.commit()
+            self._initialized = True
+
+    def initialize(self):
+        """创建表结构并补齐全文索引（只读查询前调用，数据库不可写时抛出 sqlite3.Error）"""
+        with self._connect():
+            pass
+
+    def save_snapshot(
+        self,
+        results: Dict,
+        id_to_name: Dict,
+        failed_ids: List,
+        crawled_at: datetime,
+        source: str = "crawler",
+        label: Optional[str] = None,
+        day: Optional[datetime] = None,
+    ) -> int:
+        """
+        写入一次抓取结果，同一天同名快照再次写入时覆盖（与 txt 快照按分钟覆盖一致）
+
+        Args:
+            results: {platform_id: {title: {ranks, url, mobileUrl}}}
+            id_to_name: {platform_id: platform_name}
+            failed_ids: 失败的平台ID列表
+            crawled_at: 抓取时间（北京时间）
+            source: 数据来源，crawler / mcp / import
+            label: 快照名称，默认按抓取时间生成 "HH时MM分.txt"
+            day: 快照所属日期，默认取抓取时间的日期
+
+        Returns:
+            快照ID
+        """
+        day = date_key(day or crawled_at)
+        label = label or snapshot_label(crawled_at)
+
+        with self._connect() as conn:
+            with conn:
+                row = conn.execute(
+                    "SELECT id FROM snapshots WHERE date = ? AND label = ?", (day, label)
+                ).fetchone()
+                if row:
+                    snapshot_id = row[0]
+                    conn.execute("DELETE FROM rank_observations WHERE snapshot_id = ?", (snapshot_id,))
+                    conn.execute(
+                        "UPDATE snapshots SET crawled_at = ?, source = ?, failed_ids = ? WHERE id = ?",
+                        (crawled_at.timestamp(), source, json.dumps(list(failed_ids), ensure_ascii=False), snapshot_id),
+                    )
+                else:
+                    snapshot_id = conn.execute(
+                        "INSERT INTO snapshots (date, label, crawled_at, source, failed_ids) VALUES (?, ?, ?, ?, ?)",
+                        (day, label, crawled_at.timestamp(), source, json.dumps(list(failed_ids), ensure_ascii=False)),
+                    ).lastrowid
+
+                conn.executemany(
+                    "INSERT INTO platforms (id, name) VALUES (?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET name = excluded.name",
+                    [(platform_id, id_to_name.get(platform_id, platform_id)) for platform_id in results],
+                )
+
+                for platform_id, titles in results.items():
+                    rows = []
+                    for title, info in titles.items():
+                        # 与 txt 快照一致：清理标题空白，排名取本次抓取的首个排名
+                        rank = (info.get("ranks") or [1])[0]
+                        rows.append((day, platform_id, clean_title(title), info.get("url", ""), info.get("mobileUrl", ""), rank))
+
+                    # 标题首次出现时写入（保留首次的链接），再取回 ID 写入本次排名
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO titles (date, platform_id, title, url, mobile_url) VALUES (?, ?, ?, ?, ?)",
+                        [row[:5] for row in rows],
+                    )
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO rank_observations (snapshot_id, title_id, rank) "
+                        "SELECT ?, id, ? FROM titles WHERE date = ? AND platform_id = ? AND title = ?",
+                        [(snapshot_id, row[5], day, platform_id, row[2]) for row in rows],
+                    )
+
+                # 增量更新全文索引：只处理本次新增的标题
+                conn.create_function("search_tokens", 1, search_tokens, deterministic=True)
+                conn.execute(_INDEX_NEW_TITLES)
+
+                # 重新汇总本快照所在小时的分桶（覆盖同名快照时旧排名已删除，重新汇总保证计数正确）
+                match = _LABEL_TIME.match(label)
+                if match:
+                    hour = int(match.group(1))
+                    conn.execute(
+                        "DELETE FROM mention_buckets WHERE title_id IN (SELECT id FROM titles WHERE date = ?) AND hour = ?",
+                        (day, hour),
+                    )
+                    conn.execute(
+                        _BUILD_BUCKETS.format(condition="AND s.date = ? AND s.label >= ? AND s.label < ?"),
+                        (day, f"{hour:02d}时", f"{hour + 1:02d}时"),
+                    )
+        return snapshot_id
+
+    def has_date(self, date: datetime) -> bool:
+        if not self.exists():
+            return False
+        with self._connect(readonly=True) as conn:
+            try:
+                row = conn.execute("SELECT 1 FROM snapshots WHERE date = ? LIMIT 1", (date_key(date),)).fetchone()
+            except sqlite3.OperationalError:
+                return False
+        return row is not None
+
+    def get_snapshot_labels(self, date: datetime) -> Dict[str, float]:
+        """指定日期的快照 {label: crawled_at}"""
+        if not self.exists():
+            return {}
+        with self._connect(readonly=True) as conn:
+            rows = conn.execute(
+                "SELECT label, crawled_at FROM snapshots WHERE date = ? ORDER BY label, id", (date_key(date),)
+            ).fetchall()
+        return {label: crawled_at for label, crawled_at in rows}
+
+    def get_date_version(self, date: datetime) -> Optional[Tuple[int, int, float]]:
+        """
+        指定日期快照清单的版本：(快照数, 最大快照ID, 抓取时间之和)，新增或覆盖快照后都会变化；
+        没有该日期的数据时返回 None
+        """
+        if not self.exists():
+            return None
+        with self._connect(readonly=True) as conn:
+            try:
+                row = conn.execute(
+                    "SELECT COUNT(*), MAX(id), TOTAL(crawled_at) FROM snapshots WHERE date = ?", (date_key(date),)
+                ).fetchone()
+            except sqlite3.OperationalError:
+                return None
+        return tuple(row) if row and row[0] else None
+
+    def list_dates(self) -> List[str]:
+        if not self.exists():
+            return []
+        with self._connect(readonly=True) as conn:
+            rows = conn.execute("SELECT DISTINCT date FROM snapshots ORDER BY date").fetchall()
+        return [row[0] for row in rows]
+
+    def read_titles_for_date(
+        self,
+        date: datetime,
+        platform_ids: Optional[List[str]] = None,
+    ) -> Tuple[Dict, Dict, Dict]:
+        """
+        读取指定日期的标题（与 ParserService.read_all_titles_for_date 返回格式一致）
+
+        Returns:
+            (all_titles, id_to_name, timestamps)
+            - all_titles: {platform_id: {title: {ranks, url, mobileUrl}}}，ranks 按快照时间顺序排列
+            - id_to_name: {platform_id: platform_name}
+            - timestamps: {快照名称: 抓取时间戳}
+        """
+        day = date_key(date)
+        with self._connect(readonly=True) as conn:
+            all_titles = self._collect_titles(conn, "t.date = ?", [day], platform_ids)
+            id_to_name = {
+                platform_id: name
+                for platform_id, name in conn.execute(
+                    "SELECT DISTINCT p.id, p.name FROM titles t JOIN platforms p ON p.id = t.platform_id WHERE t.date = ?",
+                    (day,),
+                )
+            }
+            timestamps = {
+                label: crawled_at
+                for label, crawled_at in conn.execute(
+                    "SELECT label, crawled_at FROM snapshots WHERE date = ? ORDER BY label, id", (day,)
+                )
+            }
+        return all_titles, id_to_name, timestamps
+
+    def find_snapshots(
+        self,
+        date: datetime,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        since: Optional[float] = None,
+        latest: bool = False,
+        platform_ids: Optional[List[str]] = None,
+    ) -> List[Tuple[int, str, float]]:
+        """
+        按时间查找指定日期的快照（走 date+label / date+crawled_at 索引）
+
+        Args:
+            date: 日期
+            start_time: 开始时间 "HH:MM"（包含）
+            end_time: 结束时间 "HH:MM"（包含）
+            since: 只返回抓取时间不早于该 Unix 时间戳的快照
+            latest: 只返回最新的一个快照
+            platform_ids: 只考虑包含这些平台数据的快照
+
+        Returns:
+            [(快照ID, 快照名称, 抓取时间戳)]，按时间顺序排列
+        """
+        query = "SELECT s.id, s.label, s.crawled_at FROM snapshots s WHERE s.date = ?"
+        params: List = [date_key(date)]
+        lower, upper = label_bounds(start_time, end_time)
+        if lower:
+            query += " AND s.label >= ?"
+            params.append(lower)
+        if upper:
+            query += " AND s.label < ?"
+            params.append(upper)
+        if since is not None:
+            query += " AND s.crawled_at >= ?"
+            params.append(since)
+        if platform_ids:
+            query += (
+                " AND EXISTS (SELECT 1 FROM rank_observations o JOIN titles t ON t.id = o.title_id "
+                f"WHERE o.snapshot_id = s.id AND t.platform_id IN ({','.join('?' * len(platform_ids))}))"
+            )
+            params.extend(platform_ids)
+        query += " ORDER BY s.label DESC, s.id DESC LIMIT 1" if latest else " ORDER BY s.label, s.id"
+
+        with self._connect(readonly=True) as conn:
+            return conn.execute(query, params).fetchall()
+
+    def read_titles_for_snapshots(
+        self,
+        snapshots: List[Tuple[int, str, float]],
+        platform_ids: Optional[List[str]] = None,
+    ) -> Tuple[Dict, Dict, Dict]:
+        """
+        只读取指定快照中的标题（返回格式同 read_titles_for_date），ranks 只包含这些快照中的排名
+
+        Args:
+            snapshots: find_snapshots 的返回值
+            platform_ids: 平台过滤列表
+        """
+        all_titles: Dict[str, Dict] = {}
+        id_to_name: Dict[str, str] = {}
+        snapshot_ids = [snapshot[0] for snapshot in snapshots]
+        with self._connect(readonly=True) as conn:
+            for offset in range(0, len(snapshot_ids), 500):
+                chunk = snapshot_ids[offset:offset + 500]
+                where = f"o.snapshot_id IN ({','.join('?' * len(chunk))})"
+                for platform_id, titles in self._collect_titles(conn, where, chunk, platform_ids).items():
+                    merged = all_titles.setdefault(platform_id, {})
+                    for title, info in titles.items():
+                        if title in merged:
+                            merged[title]["ranks"].extend(info["ranks"])
+                        else:
+                            merged[title] = info
+            if all_titles:
+                platform_list = list(all_titles)
+                id_to_name = {
+                    platform_id: name
+                    for platform_id, name in conn.execute(
+                        f"SELECT id, name FROM platforms WHERE id IN ({','.join('?' * len(platform_list))})",
+                        platform_list,
+                    )
+                }
+        timestamps = {label: crawled_at for _, label, crawled_at in snapshots}
+        return all_titles, id_to_name, timestamps
+
+    @staticmethod
+    def _collect_titles(
+        conn: sqlite3.Connection,
+        where: str,
+        params: List,
+        platform_ids: Optional[List[str]],
+    ) -> Dict[str, Dict]:
+        """按条件读取标题及其各次排名（按快照时间顺序），合并为 {platform_id: {title: info}}"""
+        query = (
+            "SELECT t.platform_id, t.title, t.url, t.mobile_url, o.rank "
+            "FROM titles t "
+            "JOIN rank_observations o ON o.title_id = t.id "
+            "JOIN snapshots s ON s.id = o.snapshot_id "
+            f"WHERE {where}"
+        )
+        params = list(params)
+        if platform_ids:
+            query += f" AND t.platform_id IN ({','.join('?' * len(platform_ids))})"
+            params.extend(platform_ids)
+        query += " ORDER BY s.date, s.label, s.id"
+
+        all_titles: Dict[str, Dict] = {}
+        for platform_id, title, url, mobile_url, rank in conn.execute(query, params):
+            platform_titles = all_titles.setdefault(platform_id, {})
+            info = platform_titles.get(title)
+            if info is None:
+                platform_titles[title] = {"ranks": [rank], "url": url, "mobileUrl": mobile_url}
+            else:
+                info["ranks"].append(rank)
+        return all_titles
+
+    def search_titles(
+        self,
+        match_query: Optional[str],
+        start_date: datetime,
+        end_date: datetime,
+        platform_ids: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """
+        在日期范围内检索标题，日期与平台过滤在索引查询中完成，结果按 bm25 相关度排序
+
+        Args:
+            match_query: build_match_query 生成的 FTS5 表达式，None 时返回范围内全部标题
+            start_date: 开始日期
+            end_date: 结束日期（包含）
+            platform_ids: 平台过滤列表
+
+        Returns:
+            [{title_id, date, platform_id, platform_name, title, url, mobileUrl, ranks}]，ranks 按快照时间顺序排列。
+            结果是候选集合，子串是否匹配由调用方校验。
+        """
+        if match_query:
+            query = (
+                "SELECT t.id, t.date, t.platform_id, IFNULL(p.name, t.platform_id), t.title, t.url, t.mobile_url "
+                "FROM titles_fts f JOIN titles t ON t.id = f.rowid "
+                "LEFT JOIN platforms p ON p.id = t.platform_id "
+                "WHERE titles_fts MATCH ? AND t.date BETWEEN ? AND ?"
+            )
+            params: List = [match_query, date_key(start_date), date_key(end_date)]
+        else:
+            query = (
+                "SELECT t.id, t.date, t.platform_id, IFNULL(p.name, t.platform_id), t.title, t.url, t.mobile_url "
+                "FROM titles t LEFT JOIN platforms p ON p.id = t.platform_id "
+                "WHERE t.date BETWEEN ? AND ?"
+            )
+            params = [date_key(start_date), date_key(end_date)]
+        if platform_ids:
+            query += f" AND t.platform_id IN ({','.join('?' * len(platform_ids))})"
+            params.extend(platform_ids)
+        query += " ORDER BY bm25(titles_fts)" if match_query else " ORDER BY t.date, t.id"
+
+        with self._connect(readonly=True) as conn:
+            rows = conn.execute(query, params).fetchall()
+            ranks = self._ranks_for_titles(conn, [row[0] for row in rows])
+
+        return [
+            {
+                "title_id": title_id,
+                "date": day,
+                "platform_id": platform_id,
+                "platform_name": platform_name,
+                "title": title,
+                "url": url,
+                "mobileUrl": mobile_url,
+                "ranks": ranks[title_id],
+            }
+            for title_id, day, platform_id, platform_name, title, url, mobile_url in rows
+            if title_id in ranks  # 快照被覆盖后不再出现的标题
+        ]
+
+    @staticmethod
+    def _ranks_for_titles(conn: sqlite3.Connection, title_ids: List[int], chunk_size: int = 500) -> Dict[int, List[int]]:
+        """按快照时间顺序读取标题的排名 {title_id: [rank, ...]}"""
+        ranks: Dict[int, List[int]] = {}
+        for offset in range(0, len(title_ids), chunk_size):
+            chunk = title_ids[offset:offset + chunk_size]
+            for title_id, rank in conn.execute(
+                "SELECT o.title_id, o.rank FROM rank_observations o JOIN snapshots s ON s.id = o.snapshot_id "
+                f"WHERE o.title_id IN ({','.join('?' * len(chunk))}) ORDER BY s.label, s.id",
+                chunk,
+            ):
+                ranks.setdefault(title_id, []).append(rank)
+        return ranks
+
+    def list_snapshots(self, start_date: datetime, end_date: datetime) -> List[Tuple[str, str, float]]:
+        """日期范围内的全部快照 [(日期, 快照名称, 抓取时间戳)]，按时间顺序排列"""
+        with self._connect(readonly=True) as conn:
+            return conn.execute(
+                "SELECT date, label, crawled_at FROM snapshots WHERE date BETWEEN ? AND ? ORDER BY date, label, id",
+                (date_key(start_date), date_key(end_date)),
+            ).fetchall()
+
+    def hourly_mentions(self, title_ids: List[int]) -> List[Tuple[int, str, int]]:
+        """标题出现过的小时分桶 [(title_id, 日期, 小时)]"""
+        rows = []
+        with self._connect(readonly=True) as conn:
+            for offset in range(0, len(title_ids), 500):
+                chunk = title_ids[offset:offset + 500]
+                rows.extend(conn.execute(
+                    "SELECT title_id, date, hour FROM mention_buckets "
+                    f"WHERE title_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ))
+        return rows
+
+    def snapshot_mentions(self, title_ids: List[int]) -> List[Tuple[int, str, str]]:
+        """标题出现过的快照 [(title_id, 日期, 快照名称)]"""
+        rows = []
+        with self._connect(readonly=True) as conn:
+            for offset in range(0, len(title_ids), 500):
+                chunk = title_ids[offset:offset + 500]
+                rows.extend(conn.execute(
+                    "SELECT o.title_id, s.date, s.label FROM rank_observations o "
+                    "JOIN snapshots s ON s.id = o.snapshot_id "
+                    f"WHERE o.title_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ))
+        return rows
+
+    def import_txt_file(self, file_path: Path, day: datetime) -> Optional[int]:
+        """导入单个 txt 快照（同名快照已存在时覆盖），文件为空时返回 None"""
+        results, id_to_name, failed_ids = read_snapshot(str(file_path))
+        if not results and not failed_ids:
+            return None
+
+        # 抓取时间取文件修改时间，与按 txt 读取时返回的时间戳一致；日期以所在目录为准
+        crawled_at = datetime.fromtimestamp(file_path.stat().st_mtime)
+        return self.save_snapshot(
+            results, id_to_name, failed_ids, crawled_at, source="import", label=file_path.name, day=day
+        )
+
+    def sync_txt_dir(self, txt_dir: Path, day: datetime) -> int:
+        """把目录中尚未入库的 txt 快照导入数据库，返回导入的文件数"""
+        if not txt_dir.exists():
+            return 0
+        known = set(self.get_snapshot_labels(day))
+        imported = 0
+        for file_path in sorted(txt_dir.glob("*.txt")):
+            if file_path.name in known:
+                continue
+            if self.import_txt_file(file_path, day) is not None:
+                imported += 1
+        return imported
+
+    def import_output_dir(self, output_dir: str = "output") -> Dict[str, int]:
+        """导入 output 目录下所有日期的 txt 快照，返回 {日期: 导入文件数}"""
+        summary = {}
+        for date_dir in sorted(Path(output_dir).iterdir()):
+            match = _DATE_FOLDER.match(date_dir.name)
+            if not date_dir.is_dir() or not match:
+                continue
+            day = datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+            summary[date_key(day)] = self.sync_txt_dir(date_dir / "txt", day)
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TrendRadar SQLite 快照存储工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="将 output 目录下的 txt 快照导入数据库")
+    import_parser.add_argument("output_dir", nargs="?", default="output")
+    import_parser.add_argument("--db", default=os.environ.get("SNAPSHOT_DB_PATH", DEFAULT_DB_PATH))
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.db)
+    summary = store.import_output_dir(args.output_dir)
+    total = sum(summary.values())
+    for day, count in summary.items():
+        if count:
+            print(f"  {day}: 导入 {count} 个快照")
+    print(f"✅ 共导入 {total} 个快照到 {args.db}")
+
+
+if __name__ == "__main__":
+    main()
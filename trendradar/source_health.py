@@ -0,0 +1,207 @@
+"""
+数据源健康度与熔断
+
+持久化记录每个数据源的成功率、连续失败次数和最近一次耗时。
+连续失败达到阈值后熔断该源，冷却期内直接跳过；冷却期结束后放行一次
+探测请求，成功则恢复，失败则重新进入冷却期。
+"""
+
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from .state_file import locked, read_json, write_json
+
+
+class SourceHealthStore:
+    """数据源健康度存储与熔断器"""
+
+    STATE_FILE = "source_health.json"
+
+    def __init__(self, state_dir: str = "output/.crawler_state", enabled: bool = True,
+                 failure_threshold: int = 3, cooldown_minutes: float = 60,
+                 log: Callable[[str], None] = print):
+        """
+        初始化健康度存储
+
+        Args:
+            state_dir: 状态文件所在目录
+            enabled: 是否启用熔断，关闭时仍记录健康度但不跳过任何源
+            failure_threshold: 连续失败多少次后熔断
+            cooldown_minutes: 熔断后跳过该源的时长（分钟）
+            log: 日志输出函数（MCP stdio 模式下应输出到 stderr）
+        """
+        self.state_dir = Path(state_dir)
+        self.state_file = self.state_dir / self.STATE_FILE
+        self.enabled = enabled
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_seconds = float(cooldown_minutes) * 60
+        self.log = log
+        self._lock = threading.Lock()
+        # 本进程尚未写回的变化：{source_id: {attempts, successes, recent_failures, had_success}}，
+        # recent_failures 为最近一次成功之后的失败次数
+        self._pending: Dict[str, Dict] = {}
+        self._sources: Dict[str, Dict] = self._load()
+
+    @classmethod
+    def from_config(cls, state_dir: str, circuit_breaker: Optional[Dict] = None,
+                    log: Callable[[str], None] = print) -> "SourceHealthStore":
+        """
+        根据 config.yaml 中 crawler.circuit_breaker 配置创建
+
+        Args:
+            state_dir: crawler.state_dir
+            circuit_breaker: crawler.circuit_breaker 配置节
+            log: 日志输出函数
+
+        Returns:
+            健康度存储实例
+        """
+        circuit_breaker = circuit_breaker or {}
+        return cls(
+            state_dir,
+            enabled=circuit_breaker.get("enabled", True),
+            failure_threshold=circuit_breaker.get("failure_threshold", 3),
+            cooldown_minutes=circuit_breaker.get("cooldown_minutes", 60),
+            log=log,
+        )
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            return (read_json(self.state_file) or {}).get("sources", {})
+        except Exception as e:
+            self.log(f"⚠️ 读取数据源健康记录失败，将重新统计: {e}")
+            return {}
+
+    def save(self):
+        """
+        写回磁盘：持有文件锁重新读取最新记录，把本进程的计数增量合并进去，
+        其他进程同时写入的记录与计数不会丢失
+        """
+        try:
+            with locked(self.state_file):
+                sources = self._load()
+                with self._lock:
+                    for source_id, pending in self._pending.items():
+                        sources[source_id] = self._merge(sources.get(source_id), self._sources[source_id], pending)
+                    write_json(self.state_file, {"version": 1, "sources": sources}, indent=2)
+                    self._sources = sources
+                    self._pending.clear()
+        except Exception as e:
+            self.log(f"⚠️ 保存数据源健康记录失败: {e}")
+
+    def _merge(self, stored: Optional[Dict], record: Dict, pending: Dict) -> Dict:
+        """把本进程的变化合并到磁盘上的最新记录"""
+        if not stored:
+            return record
+        merged = dict(stored)
+        merged["attempts"] = stored.get("attempts", 0) + pending["attempts"]
+        merged["successes"] = stored.get("successes", 0) + pending["successes"]
+        if pending["had_success"]:
+            merged["consecutive_failures"] = pending["recent_failures"]
+        else:
+            merged["consecutive_failures"] = stored.get("consecutive_failures", 0) + pending["recent_failures"]
+        merged["last_latency"] = record["last_latency"]
+        for key in ("last_success", "last_failure"):
+            times = [value for value in (stored.get(key), record.get(key)) if value]
+            merged[key] = max(times) if times else None
+        if pending["recent_failures"]:
+            merged["last_error"] = record["last_error"]
+
+        if merged["consecutive_failures"] >= self.failure_threshold:
+            open_until = max(stored.get("open_until", 0), record.get("open_until", 0))
+            merged["open_until"] = open_until or time.time() + self.cooldown_seconds
+        else:
+            merged["open_until"] = 0
+        return merged
+
+    def _pending_for(self, source_id: str) -> Dict:
+        return self._pending.setdefault(source_id, {
+            "attempts": 0,
+            "successes": 0,
+            "recent_failures": 0,
+            "had_success": False,
+        })
+
+    def _record(self, source_id: str) -> Dict:
+        return self._sources.setdefault(source_id, {
+            "attempts": 0,
+            "successes": 0,
+            "consecutive_failures": 0,
+            "last_latency": None,
+            "last_success": None,
+            "last_failure": None,
+            "last_error": "",
+            "open_until": 0,
+        })
+
+    def allow_request(self, source_id: str) -> bool:
+        """
+        判断本次是否抓取该源
+
+        Args:
+            source_id: 数据源 ID
+
+        Returns:
+            False 表示熔断中、应跳过；冷却期已过时返回 True 作为探测
+        """
+        if not self.enabled:
+            return True
+        with self._lock:
+            record = self._sources.get(source_id)
+            if not record:
+                return True
+            return time.time() >= record.get("open_until", 0)
+
+    def is_probing(self, source_id: str) -> bool:
+        """是否为熔断冷却期结束后的探测请求（探测时不做重试）"""
+        with self._lock:
+            record = self._sources.get(source_id)
+            return bool(self.enabled and record and record.get("open_until", 0) > 0)
+
+    def record_success(self, source_id: str, latency: float):
+        with self._lock:
+            record = self._record(source_id)
+            record["attempts"] += 1
+            record["successes"] += 1
+            record["consecutive_failures"] = 0
+            record["last_latency"] = round(latency, 3)
+            record["last_success"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            record["open_until"] = 0
+            pending = self._pending_for(source_id)
+            pending["attempts"] += 1
+            pending["successes"] += 1
+            pending["recent_failures"] = 0
+            pending["had_success"] = True
+
+    def record_failure(self, source_id: str, latency: float, error: str = ""):
+        with self._lock:
+            record = self._record(source_id)
+            record["attempts"] += 1
+            record["consecutive_failures"] += 1
+            record["last_latency"] = round(latency, 3)
+            record["last_failure"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            record["last_error"] = error[:200]
+            if record["consecutive_failures"] >= self.failure_threshold:
+                record["open_until"] = time.time() + self.cooldown_seconds
+            pending = self._pending_for(source_id)
+            pending["attempts"] += 1
+            pending["recent_failures"] += 1
+
+    def get_summary(self, source_id: str) -> Optional[Dict]:
+        """
+        获取某个源的健康度摘要
+
+        Returns:
+            含 success_rate 的记录副本，没有记录时返回 None
+        """
+        with self._lock:
+            record = self._sources.get(source_id)
+            if not record:
+                return None
+            summary = dict(record)
+        summary["success_rate"] = round(summary["successes"] / summary["attempts"], 3) if summary["attempts"] else None
+        summary["circuit_open"] = self.enabled and time.time() < summary.get("open_until", 0)
+        return summary
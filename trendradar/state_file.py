@@ -0,0 +1,56 @@
+# coding=utf-8
+"""
+状态文件读写
+
+crawler.state_dir 下的 JSON 状态文件可能被多个进程同时更新（cron / daemon 运行的 main.py
+与 MCP Server 的后台抓取任务）。写入方持有文件锁，先重新读取磁盘上的最新内容与本进程的修改合并，
+再写入唯一命名的临时文件后替换，避免互相截断临时文件或覆盖对方的更新。
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows：不加锁，单次写入仍是原子替换
+    fcntl = None
+
+
+@contextmanager
+def locked(path: Path) -> Iterator[None]:
+    """持有状态文件的排他锁（锁文件为 <文件名>.lock）"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(path.with_name(f"{path.name}.lock"), "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def read_json(path: Path) -> Optional[Dict]:
+    """读取 JSON 状态文件，文件不存在时返回 None（内容损坏时抛出异常）"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_json(path: Path, data: Dict, indent: Optional[int] = None):
+    """先写入本进程/线程唯一的临时文件再替换，中断或并发写入时不会留下半个文件"""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
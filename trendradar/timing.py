@@ -0,0 +1,123 @@
+# coding=utf-8
+"""
+运行耗时统计
+
+StageTimer 记录一次运行中各阶段、各数据源、各通知渠道的耗时，
+RunMetricsLog 将每次运行的记录以 JSON 行追加到滚动文件中，供 manage.py metrics 汇总。
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+class StageTimer:
+    """单次运行的耗时记录（线程安全，数据源耗时可在抓取线程中写入）"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.status = "success"
+        self.stages: Dict[str, float] = {}
+        self.sources: Dict[str, Dict] = {}
+        self.channels: Dict[str, Dict] = {}
+        self.counts: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """记录一个阶段的耗时，同名阶段多次进入时累加"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    @contextmanager
+    def channel(self, name: str) -> Iterator[Dict]:
+        """记录一个通知渠道的耗时，调用方可把返回的 dict 中 ok 置为 False 标记失败"""
+        entry = {"ok": True}
+        start = time.perf_counter()
+        try:
+            yield entry
+        except Exception:
+            entry["ok"] = False
+            raise
+        finally:
+            entry["seconds"] = round(time.perf_counter() - start, 4)
+            with self._lock:
+                self.channels[name] = entry
+
+    def record_source(self, source_id: str, seconds: float, ok: bool, skipped: bool = False):
+        with self._lock:
+            self.sources[source_id] = {"seconds": round(seconds, 4), "ok": ok, "skipped": skipped}
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def to_record(self, **extra) -> Dict:
+        with self._lock:
+            record = {
+                "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self.started_at)),
+                "status": self.status,
+                "total_seconds": round(self.elapsed(), 4),
+                "stages": {name: round(seconds, 4) for name, seconds in self.stages.items()},
+                "sources": dict(self.sources),
+                "channels": dict(self.channels),
+                "counts": dict(self.counts),
+            }
+        record.update(extra)
+        return record
+
+
+class RunMetricsLog:
+    """按行追加的运行记录文件，超过 max_records 条时只保留最近的记录"""
+
+    FILE_NAME = "run_metrics.jsonl"
+
+    def __init__(self, metrics_dir: str = "output/.metrics", max_records: int = 2000):
+        self.path = Path(metrics_dir) / self.FILE_NAME
+        self.max_records = max(1, int(max_records))
+        self._lock = threading.Lock()
+
+    def append(self, record: Dict):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._trim()
+
+    def _trim(self):
+        # 文件较小时不读取，避免每次追加都全量扫描
+        if self.path.stat().st_size < self.max_records * 256:
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        if len(lines) <= self.max_records:
+            return
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines[-self.max_records:])
+        os.replace(tmp_path, self.path)
+
+    def read_recent(self, limit: Optional[int] = None) -> List[Dict]:
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return records[-limit:] if limit else records
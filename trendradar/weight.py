@@ -0,0 +1,95 @@
+# coding=utf-8
+"""
+新闻权重
+
+按 config.yaml 的 weight 配置为新闻打分，main.py 的报告排序与 MCP Server 的按权重排序共用。
+权重由三部分组成（均为 0-100 分）：
+  - 排名分：Σ(11 - min(rank, 10)) / 排名数量
+  - 频次分：min(出现次数, 10) × 10
+  - 热度分：排名 ≤ rank_threshold 的比例 × 100
+所有新闻的排名拼成一个数组，一次向量化计算完成打分。
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_WEIGHTS = {
+    "rank_weight": 0.6,
+    "frequency_weight": 0.3,
+    "hotness_weight": 0.1,
+}
+
+
+class WeightScorer:
+    """新闻权重计算器"""
+
+    def __init__(
+        self,
+        rank_weight: float = DEFAULT_WEIGHTS["rank_weight"],
+        frequency_weight: float = DEFAULT_WEIGHTS["frequency_weight"],
+        hotness_weight: float = DEFAULT_WEIGHTS["hotness_weight"],
+        rank_threshold: int = 5,
+    ):
+        self.rank_weight = float(rank_weight)
+        self.frequency_weight = float(frequency_weight)
+        self.hotness_weight = float(hotness_weight)
+        self.rank_threshold = int(rank_threshold)
+
+    @classmethod
+    def from_config(cls, weight_config: Optional[Dict] = None, rank_threshold: int = 5) -> "WeightScorer":
+        """
+        根据 config.yaml 创建
+
+        Args:
+            weight_config: weight 配置节（rank_weight / frequency_weight / hotness_weight）
+            rank_threshold: report.rank_threshold，排名不高于该值计为高排名
+        """
+        weights = dict(DEFAULT_WEIGHTS)
+        weights.update({key: value for key, value in (weight_config or {}).items() if key in DEFAULT_WEIGHTS})
+        return cls(rank_threshold=rank_threshold, **weights)
+
+    def score(self, items: Sequence[Dict]) -> np.ndarray:
+        """
+        批量计算权重
+
+        Args:
+            items: 新闻列表，每项包含 ranks（排名列表），可选 count（出现次数，默认为排名数量）
+
+        Returns:
+            与 items 等长的权重数组；没有排名的新闻权重为 0
+        """
+        rank_lists = [item.get("ranks") or [] for item in items]
+        lengths = np.fromiter((len(ranks) for ranks in rank_lists), dtype=np.int64, count=len(rank_lists))
+        if not lengths.any():
+            return np.zeros(len(rank_lists))
+
+        ranks = np.fromiter(
+            (rank for rank_list in rank_lists for rank in rank_list),
+            dtype=np.float64,
+            count=int(lengths.sum()),
+        )
+        owners = np.repeat(np.arange(len(rank_lists)), lengths)
+        counts = np.fromiter(
+            (item.get("count", length) for item, length in zip(items, lengths.tolist())),
+            dtype=np.float64,
+            count=len(rank_lists),
+        )
+
+        rank_sum = np.bincount(owners, weights=11 - np.minimum(ranks, 10), minlength=len(rank_lists))
+        hot_sum = np.bincount(owners, weights=ranks <= self.rank_threshold, minlength=len(rank_lists))
+        divisor = np.maximum(lengths, 1)
+
+        scores = (
+            rank_sum / divisor * self.rank_weight
+            + np.minimum(counts, 10) * 10 * self.frequency_weight
+            + hot_sum / divisor * 100 * self.hotness_weight
+        )
+        return np.where(lengths > 0, scores, 0.0)
+
+    def sort(self, items: List[Dict]) -> List[Dict]:
+        """按权重从高到低排序（原地排序并返回，权重相同时保持原有顺序）"""
+        if len(items) > 1:
+            order = np.argsort(-self.score(items), kind="stable")
+            items[:] = [items[index] for index in order]
+        return items